@@ -0,0 +1,57 @@
+"""adiciona saldos mensais
+
+Revision ID: 7d2a91c4e5f3
+Revises: 6b1568755da9
+Create Date: 2026-01-05 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '7d2a91c4e5f3'
+down_revision = '6b1568755da9'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table('saldos_mensais',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('conta_id', sa.Integer(), nullable=False),
+        sa.Column('centro_custo_id', sa.Integer(), nullable=True),
+        sa.Column('ano_mes', sa.Integer(), nullable=False),
+        sa.Column('debitos', sa.Numeric(precision=15, scale=2), nullable=False),
+        sa.Column('creditos', sa.Numeric(precision=15, scale=2), nullable=False),
+        sa.ForeignKeyConstraint(['conta_id'], ['plano_contas.id'], ),
+        sa.ForeignKeyConstraint(['centro_custo_id'], ['centros_custo.id'], ),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_saldos_mensais_id'), 'saldos_mensais', ['id'], unique=False)
+    op.create_index(op.f('ix_saldos_mensais_ano_mes'), 'saldos_mensais', ['ano_mes'], unique=False)
+    op.execute(
+        "CREATE UNIQUE INDEX uq_saldo_mensal_chave "
+        "ON saldos_mensais (conta_id, coalesce(centro_custo_id, 0), ano_mes)"
+    )
+
+    # Backfill a partir das partidas existentes
+    op.execute("""
+        INSERT INTO saldos_mensais (conta_id, centro_custo_id, ano_mes, debitos, creditos)
+        SELECT p.conta_id,
+               p.centro_custo_id,
+               EXTRACT(YEAR FROM l.data_lancamento) * 100 + EXTRACT(MONTH FROM l.data_lancamento),
+               COALESCE(SUM(CASE WHEN p.tipo = 'DEBITO' THEN p.valor ELSE 0 END), 0),
+               COALESCE(SUM(CASE WHEN p.tipo = 'CREDITO' THEN p.valor ELSE 0 END), 0)
+        FROM partidas p
+        JOIN lancamentos l ON l.id = p.lancamento_id
+        GROUP BY p.conta_id, p.centro_custo_id,
+                 EXTRACT(YEAR FROM l.data_lancamento) * 100 + EXTRACT(MONTH FROM l.data_lancamento)
+    """)
+
+
+def downgrade() -> None:
+    op.drop_index('uq_saldo_mensal_chave', table_name='saldos_mensais')
+    op.drop_index(op.f('ix_saldos_mensais_ano_mes'), table_name='saldos_mensais')
+    op.drop_index(op.f('ix_saldos_mensais_id'), table_name='saldos_mensais')
+    op.drop_table('saldos_mensais')
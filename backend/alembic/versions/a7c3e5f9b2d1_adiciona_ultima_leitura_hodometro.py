@@ -0,0 +1,32 @@
+"""adiciona ultima leitura hodometro
+
+Revision ID: a7c3e5f9b2d1
+Revises: f5b1d9e3a7c4
+Create Date: 2026-01-22 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a7c3e5f9b2d1'
+down_revision = 'f5b1d9e3a7c4'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # hodometro_atual/data_ultima_leitura do histórico: python recalcular_hodometros.py
+    op.add_column('equipamentos', sa.Column('data_ultima_leitura', sa.Date(), nullable=True))
+    # Leituras por equipamento (recálculo do hodômetro e consumo de combustível)
+    op.create_index('idx_viagem_equipamento_data', 'viagens', ['equipamento_id', 'data_viagem'])
+    op.create_index(
+        'idx_abastecimento_equipamento_data', 'abastecimentos', ['equipamento_id', 'data_abastecimento']
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('idx_abastecimento_equipamento_data', 'abastecimentos')
+    op.drop_index('idx_viagem_equipamento_data', 'viagens')
+    op.drop_column('equipamentos', 'data_ultima_leitura')
@@ -0,0 +1,33 @@
+"""adiciona indices paginacao cursor
+
+Revision ID: b83f0c2d6a17
+Revises: 7d2a91c4e5f3
+Create Date: 2026-01-06 09:30:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b83f0c2d6a17'
+down_revision = '7d2a91c4e5f3'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Índices compostos (data, id) para paginação por cursor (keyset)
+    op.create_index('idx_lancamento_data_id', 'lancamentos', ['data_lancamento', 'id'])
+    op.create_index('idx_viagem_data_id', 'viagens', ['data_viagem', 'id'])
+    op.create_index('idx_abastecimento_data_id', 'abastecimentos', ['data_abastecimento', 'id'])
+    op.create_index('idx_conta_pagar_vencimento_id', 'contas_pagar', ['data_vencimento', 'id'])
+    op.create_index('idx_conta_receber_vencimento_id', 'contas_receber', ['data_vencimento', 'id'])
+
+
+def downgrade() -> None:
+    op.drop_index('idx_conta_receber_vencimento_id', 'contas_receber')
+    op.drop_index('idx_conta_pagar_vencimento_id', 'contas_pagar')
+    op.drop_index('idx_abastecimento_data_id', 'abastecimentos')
+    op.drop_index('idx_viagem_data_id', 'viagens')
+    op.drop_index('idx_lancamento_data_id', 'lancamentos')
@@ -0,0 +1,60 @@
+"""adiciona planos manutencao
+
+Revision ID: b9d4f2a6c8e3
+Revises: a7c3e5f9b2d1
+Create Date: 2026-01-26 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = 'b9d4f2a6c8e3'
+down_revision = 'a7c3e5f9b2d1'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    tipo_equipamento = postgresql.ENUM(
+        'CAMINHAO', 'RETROESCAVADEIRA', 'TRATOR', 'ESCAVADEIRA', 'PA_CARREGADEIRA', 'ROLO_COMPACTADOR', 'OUTRO',
+        name='tipoequipamento', create_type=False
+    )
+    op.create_table('planos_manutencao',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('tipo_equipamento', tipo_equipamento, nullable=False),
+        sa.Column('descricao', sa.String(length=255), nullable=False),
+        sa.Column('intervalo_km', sa.Numeric(precision=10, scale=2), nullable=True),
+        sa.Column('intervalo_dias', sa.Integer(), nullable=True),
+        sa.Column('antecedencia_km', sa.Numeric(precision=10, scale=2), nullable=False),
+        sa.Column('antecedencia_dias', sa.Integer(), nullable=False),
+        sa.Column('ativo', sa.Boolean(), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_planos_manutencao_id'), 'planos_manutencao', ['id'], unique=False)
+    op.create_index(
+        op.f('ix_planos_manutencao_tipo_equipamento'), 'planos_manutencao', ['tipo_equipamento'], unique=False
+    )
+
+    op.add_column('manutencoes', sa.Column('plano_manutencao_id', sa.Integer(), nullable=True))
+    op.create_foreign_key(
+        'fk_manutencoes_plano_manutencao', 'manutencoes', 'planos_manutencao', ['plano_manutencao_id'], ['id']
+    )
+    # Uma manutenção em aberto por equipamento e plano: torna o agendamento idempotente
+    op.create_index(
+        'uq_manutencao_plano_aberta', 'manutencoes', ['equipamento_id', 'plano_manutencao_id'],
+        unique=True, postgresql_where=sa.text("status IN ('AGENDADA', 'EM_ANDAMENTO')")
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('uq_manutencao_plano_aberta', 'manutencoes')
+    op.drop_constraint('fk_manutencoes_plano_manutencao', 'manutencoes', type_='foreignkey')
+    op.drop_column('manutencoes', 'plano_manutencao_id')
+    op.drop_index(op.f('ix_planos_manutencao_tipo_equipamento'), table_name='planos_manutencao')
+    op.drop_index(op.f('ix_planos_manutencao_id'), table_name='planos_manutencao')
+    op.drop_table('planos_manutencao')
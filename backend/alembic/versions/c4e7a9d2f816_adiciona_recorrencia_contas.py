@@ -0,0 +1,47 @@
+"""adiciona recorrencia contas
+
+Revision ID: c4e7a9d2f816
+Revises: b83f0c2d6a17
+Create Date: 2026-01-08 14:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c4e7a9d2f816'
+down_revision = 'b83f0c2d6a17'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Recorrência em contas a receber (contas a pagar já tinham as colunas)
+    op.add_column('contas_receber', sa.Column('recorrente', sa.Boolean(), nullable=True, server_default=sa.false()))
+    op.add_column('contas_receber', sa.Column('dia_vencimento_recorrente', sa.Integer(), nullable=True))
+
+    # Recorrentes antigas não têm grupo: cada uma vira a parcela 1 da sua série,
+    # para que o materializador passe a gerar as contas seguintes
+    op.execute("""
+        UPDATE contas_pagar
+        SET grupo_parcelamento = 'legado-' || id, parcela_numero = COALESCE(parcela_numero, 1)
+        WHERE recorrente AND grupo_parcelamento IS NULL
+    """)
+
+    # Uma parcela por número dentro do grupo: torna a geração de séries idempotente
+    op.create_index(
+        'uq_conta_pagar_grupo_parcela', 'contas_pagar', ['grupo_parcelamento', 'parcela_numero'],
+        unique=True, postgresql_where=sa.text('grupo_parcelamento IS NOT NULL')
+    )
+    op.create_index(
+        'uq_conta_receber_grupo_parcela', 'contas_receber', ['grupo_parcelamento', 'parcela_numero'],
+        unique=True, postgresql_where=sa.text('grupo_parcelamento IS NOT NULL')
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('uq_conta_receber_grupo_parcela', 'contas_receber')
+    op.drop_index('uq_conta_pagar_grupo_parcela', 'contas_pagar')
+    op.drop_column('contas_receber', 'dia_vencimento_recorrente')
+    op.drop_column('contas_receber', 'recorrente')
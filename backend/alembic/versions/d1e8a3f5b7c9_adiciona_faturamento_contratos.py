@@ -0,0 +1,37 @@
+"""adiciona faturamento contratos
+
+Revision ID: d1e8a3f5b7c9
+Revises: b9d4f2a6c8e3
+Create Date: 2026-01-29 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd1e8a3f5b7c9'
+down_revision = 'b9d4f2a6c8e3'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Contas a receber geradas pelo faturamento dos contratos de locação
+    op.add_column('contas_receber', sa.Column('contrato_id', sa.Integer(), nullable=True))
+    op.add_column('contas_receber', sa.Column('competencia', sa.Integer(), nullable=True))
+    op.create_foreign_key(
+        'fk_contas_receber_contrato', 'contas_receber', 'contratos_locacao', ['contrato_id'], ['id']
+    )
+    # Uma conta por contrato e competência: torna o faturamento idempotente
+    op.create_index(
+        'uq_conta_receber_contrato_competencia', 'contas_receber', ['contrato_id', 'competencia'],
+        unique=True, postgresql_where=sa.text('contrato_id IS NOT NULL')
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('uq_conta_receber_contrato_competencia', 'contas_receber')
+    op.drop_constraint('fk_contas_receber_contrato', 'contas_receber', type_='foreignkey')
+    op.drop_column('contas_receber', 'competencia')
+    op.drop_column('contas_receber', 'contrato_id')
@@ -0,0 +1,27 @@
+"""adiciona chave origem lancamentos
+
+Revision ID: e2a6c8d4f1b3
+Revises: c4e7a9d2f816
+Create Date: 2026-01-15 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e2a6c8d4f1b3'
+down_revision = 'c4e7a9d2f816'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Chave natural dos lançamentos importados de outros sistemas (XTDC)
+    op.add_column('lancamentos', sa.Column('chave_origem', sa.String(length=30), nullable=True))
+    op.create_index('uq_lancamento_chave_origem', 'lancamentos', ['chave_origem'], unique=True)
+
+
+def downgrade() -> None:
+    op.drop_index('uq_lancamento_chave_origem', 'lancamentos')
+    op.drop_column('lancamentos', 'chave_origem')
@@ -0,0 +1,43 @@
+"""adiciona consumos abastecimento
+
+Revision ID: f5b1d9e3a7c4
+Revises: e2a6c8d4f1b3
+Create Date: 2026-01-20 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f5b1d9e3a7c4'
+down_revision = 'e2a6c8d4f1b3'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Preenchida pela primeira atualização de consumo (GET /abastecimentos/consumo ou job diário)
+    op.create_table('consumos_abastecimento',
+        sa.Column('abastecimento_id', sa.Integer(), nullable=False),
+        sa.Column('equipamento_id', sa.Integer(), nullable=False),
+        sa.Column('data_abastecimento', sa.Date(), nullable=False),
+        sa.Column('km_hodometro', sa.Numeric(precision=10, scale=2), nullable=False),
+        sa.Column('km_rodados', sa.Numeric(precision=10, scale=2), nullable=True),
+        sa.Column('litros', sa.Numeric(precision=10, scale=2), nullable=False),
+        sa.Column('km_por_litro', sa.Numeric(precision=10, scale=3), nullable=True),
+        sa.Column('km_por_litro_medio', sa.Numeric(precision=10, scale=3), nullable=True),
+        sa.Column('anomalia', sa.String(length=30), nullable=True),
+        sa.ForeignKeyConstraint(['abastecimento_id'], ['abastecimentos.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['equipamento_id'], ['equipamentos.id'], ),
+        sa.PrimaryKeyConstraint('abastecimento_id')
+    )
+    op.create_index(
+        'ix_consumo_equipamento_ordem', 'consumos_abastecimento',
+        ['equipamento_id', 'data_abastecimento', 'abastecimento_id'], unique=False
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_consumo_equipamento_ordem', table_name='consumos_abastecimento')
+    op.drop_table('consumos_abastecimento')
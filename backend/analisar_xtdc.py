@@ -1,45 +1,73 @@
 """
 Script para analisar arquivos do XTDC e identificar seu conteúdo
+
+Os arquivos são mapeados em memória (mmap) e as buscas rodam direto nos
+bytes, sem ler o arquivo inteiro nem montar uma cópia em texto.
 """
-import os
+import re
+import sys
 from pathlib import Path
 
+# Adiciona o diretório raiz ao path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from app.parsers.xtdc_dat import ENCODING, LAYOUT_PARTIDAS, LAYOUT_PLANO_CONTAS, mapear_arquivo
+
+# Layouts de registro já decodificados em app.parsers.xtdc_dat
+LAYOUTS_CONHECIDOS = {
+    'XTDC019.DAT': ('partidas dos lançamentos', LAYOUT_PARTIDAS),
+    'XTDC035.DAT': ('plano de contas', LAYOUT_PLANO_CONTAS),
+}
+
+# Sequências de 4+ caracteres imprimíveis (ASCII e acentos do cp860)
+PADRAO_TEXTO = re.compile(rb'[\x20-\x7e\x80-\xa5]{4,}')
+
+KEYWORDS = {
+    'historico': [b'hist', b'lan\x87', b'lanca', b'pagamento', b'recebimento'],
+    'centro_custo': [b'custo', b'centro', b'depart'],
+    'lancamento': [b'debito', b'credito', b'saldo', b'valor'],
+    'conta': [b'ativo', b'passivo', b'receita', b'despesa'],
+}
+
 
 def analisar_arquivo_dat(arquivo_path):
     """Analisa um arquivo .DAT e tenta identificar seu conteúdo"""
     try:
-        with open(arquivo_path, 'rb') as f:
-            data = f.read()
-
-        tamanho = len(data)
-
-        # Tentar ler como texto
-        try:
-            texto = data.decode('latin1', errors='ignore')
-            texto_limpo = ''.join(c for c in texto if c.isprintable() or c in '\n\r\t')
-        except:
-            texto_limpo = ""
-
-        # Procurar por palavras-chave
-        keywords = {
-            'historico': ['hist', 'lanç', 'lanca', 'pagamento', 'recebimento'],
-            'centro_custo': ['custo', 'centro', 'depart'],
-            'lancamento': ['debito', 'credito', 'saldo', 'valor'],
-            'conta': ['ativo', 'passivo', 'receita', 'despesa'],
-        }
-
-        encontrados = {}
-        for categoria, palavras in keywords.items():
-            encontrados[categoria] = any(palavra in texto_limpo.lower() for palavra in palavras)
-
-        return {
+        with mapear_arquivo(str(arquivo_path)) as dados:
+            tamanho = len(dados)
+            buffer = dados.obj
+
+            trechos = []
+            caracteres_texto = 0
+            for trecho in PADRAO_TEXTO.finditer(buffer):
+                caracteres_texto += trecho.end() - trecho.start()
+                if len(trechos) < 10:
+                    trechos.append(trecho.group().decode(ENCODING))
+
+            encontrados = {}
+            for categoria, palavras in KEYWORDS.items():
+                encontrados[categoria] = any(
+                    re.search(re.escape(palavra), buffer, re.IGNORECASE) for palavra in palavras
+                )
+
+            amostra = ' | '.join(trechos) if trechos else bytes(dados[:100]).hex()
+
+        resultado = {
             'arquivo': arquivo_path.name,
             'tamanho': tamanho,
-            'texto_legivel': len(texto_limpo) > 20,
+            'texto_legivel': caracteres_texto > 20,
             'categorias': encontrados,
-            'amostra': texto_limpo[:200] if texto_limpo else data[:100].hex()
+            'amostra': amostra[:200],
         }
 
+        layout = LAYOUTS_CONHECIDOS.get(arquivo_path.name.upper())
+        if layout:
+            descricao, registro = layout
+            resultado['layout'] = (
+                f"{descricao}: {tamanho // registro.tamanho:,} registros de {registro.tamanho} bytes"
+            )
+        return resultado
+
     except Exception as e:
         return {
             'arquivo': arquivo_path.name,
@@ -67,6 +95,9 @@ def main():
             print(f"   ERRO: {resultado['erro']}")
             continue
 
+        if resultado.get('layout'):
+            print(f"   Layout: {resultado['layout']}")
+
         print(f"   Texto legivel: {'SIM' if resultado.get('texto_legivel') else 'NAO'}")
 
         if resultado.get('categorias'):
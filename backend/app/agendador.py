@@ -0,0 +1,109 @@
+"""
+Agendador de jobs em processo
+
+Roda os jobs diários (status de vencimento das contas, geração das contas
+recorrentes, consumo de combustível dos novos abastecimentos e agendamento
+das manutenções preventivas) em uma task asyncio iniciada com a aplicação.
+O trabalho de banco vai para uma thread; cada job tem sessão e transação
+próprias, então a falha de um não desfaz os outros. Com vários workers cada
+um executa os jobs; como são idempotentes, execuções repetidas não alteram
+nada.
+"""
+import asyncio
+import logging
+from datetime import datetime, timedelta
+from typing import List, Optional
+
+from app.config import settings
+from app.database import SessionLocal
+from app.models.conta_pagar import ContaPagar
+from app.models.conta_receber import ContaReceber
+from app.services.status_contas import atualizar_status_vencidos
+from app.services.geracao_contas import materializar_recorrentes
+from app.services.consumo_combustivel import atualizar_consumo
+from app.services.manutencao_preventiva import agendar_preventivas
+from app.services.fluxo_caixa import invalidar_projecao_fluxo_caixa
+
+logger = logging.getLogger("app.agendador")
+
+
+def _job_status_vencidos(db) -> dict:
+    return {f"vencidas_{tabela}": quantidade for tabela, quantidade in atualizar_status_vencidos(db).items()}
+
+
+def _job_recorrentes(db) -> dict:
+    return {
+        f"recorrentes_{modelo.__tablename__}": materializar_recorrentes(db, modelo)
+        for modelo in (ContaPagar, ContaReceber)
+    }
+
+
+def _job_consumo(db) -> dict:
+    return {"consumos_abastecimento": atualizar_consumo(db)["processados"]}
+
+
+def _job_preventivas(db) -> dict:
+    return {"manutencoes_preventivas": agendar_preventivas(db)["agendadas"]}
+
+
+JOBS_CONTAS = [("status_vencidos", _job_status_vencidos), ("recorrentes", _job_recorrentes)]
+JOBS_FROTA = [("consumo_combustivel", _job_consumo), ("manutencoes_preventivas", _job_preventivas)]
+
+
+def _executar_job(fabrica_sessao, job) -> dict:
+    db = fabrica_sessao()
+    try:
+        resultado = job(db)
+        db.commit()
+        return resultado
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+def executar_jobs_diarios(jobs: Optional[List] = None, fabrica_sessao=SessionLocal) -> dict:
+    """
+    Executa os jobs (padrão: contas e frota), cada um na sua transação.
+
+    A falha de um job é logada e não desfaz os demais; os nomes dos jobs que
+    falharam vão em resultado["falhas"].
+    """
+    resultado, falhas = {}, []
+    for nome, job in (JOBS_CONTAS + JOBS_FROTA) if jobs is None else jobs:
+        try:
+            resultado.update(_executar_job(fabrica_sessao, job))
+        except Exception:
+            logger.exception("Falha no job diário %s", nome)
+            falhas.append(nome)
+    invalidar_projecao_fluxo_caixa()
+    if falhas:
+        resultado["falhas"] = falhas
+    return resultado
+
+
+def segundos_ate_proxima_execucao(agora: Optional[datetime] = None) -> float:
+    """Segundos até o próximo AGENDADOR_HORA (hora local, minuto 5)"""
+    agora = agora or datetime.now()
+    proxima = agora.replace(hour=settings.AGENDADOR_HORA, minute=5, second=0, microsecond=0)
+    if proxima <= agora:
+        proxima += timedelta(days=1)
+    return (proxima - agora).total_seconds()
+
+
+async def _loop_jobs_diarios():
+    while True:
+        try:
+            resultado = await asyncio.to_thread(executar_jobs_diarios)
+            logger.info("Jobs diários executados: %s", resultado)
+        except Exception:
+            logger.exception("Falha nos jobs diários")
+        await asyncio.sleep(segundos_ate_proxima_execucao())
+
+
+def iniciar_agendador() -> Optional[asyncio.Task]:
+    """Inicia o loop dos jobs diários (executa uma vez já na inicialização)"""
+    if not settings.AGENDADOR_ATIVO:
+        return None
+    return asyncio.create_task(_loop_jobs_diarios())
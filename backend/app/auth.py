@@ -1,21 +1,25 @@
 from datetime import datetime, timedelta
 from typing import Optional
 from jose import JWTError, jwt
-from passlib.context import CryptContext
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
+from app.config import settings
 from app.database import get_db
 from app.models.usuario import Usuario
 from app.schemas.auth import TokenData
+from app.cache_usuarios import UsuarioAutenticado, obter_usuario_cache, guardar_usuario_cache
+from app.hash_senhas import criar_contexto, verificar_senha_async
 
 # Configurações
 SECRET_KEY = "seu-secret-key-super-secreto-mude-isso-em-producao"  # TODO: Mover para .env
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 30 * 24  # 30 dias
 
-# Password hashing
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Password hashing (uso síncrono: scripts; as rotas usam app.hash_senhas)
+pwd_context = criar_contexto(settings.BCRYPT_ROUNDS)
 
 # OAuth2
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="api/auth/login")
@@ -49,23 +53,47 @@ def get_user_by_email(db: Session, email: str) -> Optional[Usuario]:
     return db.query(Usuario).filter(Usuario.email == email).first()
 
 
-def authenticate_user(db: Session, email: str, password: str) -> Optional[Usuario]:
-    """Autentica um usuário."""
-    user = get_user_by_email(db, email)
+async def authenticate_user(db: AsyncSession, email: str, password: str) -> Optional[UsuarioAutenticado]:
+    """
+    Autentica um usuário.
+
+    A conexão é devolvida ao pool antes da verificação bcrypt, que roda no
+    pool de processos. Se o hash usa um custo diferente do configurado, é
+    regravado com o custo atual.
+    """
+    resultado = await db.execute(
+        select(
+            Usuario.id, Usuario.email, Usuario.senha_hash, Usuario.ativo, Usuario.is_admin
+        ).where(Usuario.email == email)
+    )
+    user = resultado.first()
+    await db.rollback()
     if not user:
         return None
-    if not verify_password(password, user.senha_hash):
-        return None
-    if not user.ativo:
+
+    valida, novo_hash = await verificar_senha_async(password, user.senha_hash)
+    if not valida or not user.ativo:
         return None
-    return user
+
+    if novo_hash:
+        await db.execute(
+            update(Usuario).where(Usuario.id == user.id).values(senha_hash=novo_hash)
+        )
+        await db.commit()
+
+    return UsuarioAutenticado(id=user.id, email=user.email, ativo=user.ativo, is_admin=user.is_admin)
 
 
 async def get_current_user(
     token: str = Depends(oauth2_scheme),
     db: Session = Depends(get_db)
-) -> Usuario:
-    """Obtém o usuário atual a partir do token JWT."""
+) -> UsuarioAutenticado:
+    """
+    Obtém o usuário atual a partir do token JWT.
+
+    O usuário fica em cache por AUTH_CACHE_TTL_SEGUNDOS; em acerto de cache
+    a requisição não consulta o banco.
+    """
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Não foi possível validar as credenciais",
@@ -81,9 +109,21 @@ async def get_current_user(
     except JWTError:
         raise credentials_exception
 
-    user = get_user_by_email(db, email=token_data.email)
+    user = obter_usuario_cache(token_data.email)
     if user is None:
-        raise credentials_exception
+        usuario = get_user_by_email(db, email=token_data.email)
+        if usuario is None:
+            raise credentials_exception
+        user = UsuarioAutenticado(
+            id=usuario.id,
+            email=usuario.email,
+            ativo=usuario.ativo,
+            is_admin=usuario.is_admin,
+        )
+        guardar_usuario_cache(user)
+        # Libera a conexão: a sessão é a mesma da rota, que pode demorar (ex: bcrypt)
+        db.rollback()
+
     if not user.ativo:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
@@ -94,8 +134,8 @@ async def get_current_user(
 
 
 async def get_current_active_user(
-    current_user: Usuario = Depends(get_current_user)
-) -> Usuario:
+    current_user: UsuarioAutenticado = Depends(get_current_user)
+) -> UsuarioAutenticado:
     """Obtém o usuário atual e verifica se está ativo."""
     if not current_user.ativo:
         raise HTTPException(
@@ -106,8 +146,8 @@ async def get_current_active_user(
 
 
 async def get_current_admin_user(
-    current_user: Usuario = Depends(get_current_user)
-) -> Usuario:
+    current_user: UsuarioAutenticado = Depends(get_current_user)
+) -> UsuarioAutenticado:
     """Obtém o usuário atual e verifica se é admin."""
     if not current_user.is_admin:
         raise HTTPException(
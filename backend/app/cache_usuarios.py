@@ -0,0 +1,111 @@
+"""
+Cache dos usuários autenticados
+
+get_current_user guarda por alguns segundos o essencial do usuário do
+token (id, email, ativo, is_admin), chaveado pelo subject do JWT, para não
+consultar a tabela usuarios a cada requisição autenticada.
+
+Por padrão o cache é local ao processo. Com AUTH_CACHE_REDIS_URL definido
+o cache passa a ser compartilhado entre os workers (requer o pacote redis),
+e a invalidação feita por um worker vale para todos.
+"""
+import json
+import threading
+import time
+from dataclasses import dataclass, asdict
+from typing import Dict, Optional, Tuple
+
+from app.config import settings
+
+
+@dataclass(frozen=True)
+class UsuarioAutenticado:
+    id: int
+    email: str
+    ativo: bool
+    is_admin: bool
+
+
+class _CacheMemoria:
+    def __init__(self, ttl: int):
+        self.ttl = ttl
+        self._itens: Dict[str, Tuple[float, UsuarioAutenticado]] = {}
+        self._lock = threading.Lock()
+
+    def obter(self, email: str) -> Optional[UsuarioAutenticado]:
+        with self._lock:
+            item = self._itens.get(email)
+            if item is None:
+                return None
+            expira_em, usuario = item
+            if time.monotonic() >= expira_em:
+                del self._itens[email]
+                return None
+            return usuario
+
+    def guardar(self, usuario: UsuarioAutenticado) -> None:
+        with self._lock:
+            self._itens[usuario.email] = (time.monotonic() + self.ttl, usuario)
+
+    def remover(self, email: str) -> None:
+        with self._lock:
+            self._itens.pop(email, None)
+
+    def limpar(self) -> None:
+        with self._lock:
+            self._itens.clear()
+
+
+class _CacheRedis:
+    PREFIXO = "ajr:usuario:"
+
+    def __init__(self, url: str, ttl: int):
+        import redis  # dependência opcional, só para deploy com vários workers
+
+        self.ttl = ttl
+        self._cliente = redis.Redis.from_url(url)
+
+    def obter(self, email: str) -> Optional[UsuarioAutenticado]:
+        valor = self._cliente.get(self.PREFIXO + email)
+        return UsuarioAutenticado(**json.loads(valor)) if valor else None
+
+    def guardar(self, usuario: UsuarioAutenticado) -> None:
+        self._cliente.setex(self.PREFIXO + usuario.email, self.ttl, json.dumps(asdict(usuario)))
+
+    def remover(self, email: str) -> None:
+        self._cliente.delete(self.PREFIXO + email)
+
+    def limpar(self) -> None:
+        for chave in self._cliente.scan_iter(self.PREFIXO + "*"):
+            self._cliente.delete(chave)
+
+
+def _criar_cache():
+    if settings.AUTH_CACHE_REDIS_URL:
+        return _CacheRedis(settings.AUTH_CACHE_REDIS_URL, settings.AUTH_CACHE_TTL_SEGUNDOS)
+    return _CacheMemoria(settings.AUTH_CACHE_TTL_SEGUNDOS)
+
+
+_cache = _criar_cache()
+
+
+def obter_usuario_cache(email: str) -> Optional[UsuarioAutenticado]:
+    if not settings.AUTH_CACHE_TTL_SEGUNDOS:
+        return None
+    return _cache.obter(email)
+
+
+def guardar_usuario_cache(usuario: UsuarioAutenticado) -> None:
+    if settings.AUTH_CACHE_TTL_SEGUNDOS:
+        _cache.guardar(usuario)
+
+
+def invalidar_usuario_cache(*emails: str) -> None:
+    """Descarta os usuários do cache; chamar após alterar/desativar usuários"""
+    for email in emails:
+        if email:
+            _cache.remover(email)
+
+
+def limpar_cache_usuarios() -> None:
+    _cache.limpar()
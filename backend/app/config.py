@@ -1,3 +1,5 @@
+from typing import Optional
+
 from pydantic_settings import BaseSettings
 
 
@@ -7,6 +9,31 @@ class Settings(BaseSettings):
     DATABASE_NAME: str
     DATABASE_USER: str
     DATABASE_PASSWORD: str
+    # Pool de conexões (por engine e por worker do uvicorn)
+    DATABASE_POOL_SIZE: int = 5
+    DATABASE_MAX_OVERFLOW: int = 10
+    DATABASE_POOL_TIMEOUT: int = 30
+    DATABASE_POOL_RECYCLE: int = 1800
+    DATABASE_POOL_PRE_PING: bool = True
+    # Timeout de statement em ms (0 = sem limite)
+    DATABASE_STATEMENT_TIMEOUT_MS: int = 0
+    # Loga requisições que esperaram mais que isso (ms) por conexão do pool
+    DATABASE_POOL_WAIT_LOG_MS: float = 100.0
+    # Cache do usuário autenticado (0 desativa); Redis opcional para vários workers
+    AUTH_CACHE_TTL_SEGUNDOS: int = 60
+    AUTH_CACHE_REDIS_URL: Optional[str] = None
+    # Hash de senhas: custo do bcrypt, processos dedicados e fila máxima
+    BCRYPT_ROUNDS: int = 12
+    BCRYPT_WORKERS: int = 2
+    BCRYPT_MAX_PENDENTES: int = 64
+    # Jobs diários em processo (status de vencimento das contas)
+    AGENDADOR_ATIVO: bool = True
+    AGENDADOR_HORA: int = 0
+    # Processos para ler balancetes XTDC na importação via API (0 = no próprio processo)
+    IMPORTACAO_XTDC_WORKERS: int = 2
+    # Consumo de combustível: desvios-padrão para anomalia e intervalos mínimos por equipamento
+    CONSUMO_DESVIOS_ANOMALIA: float = 3.0
+    CONSUMO_AMOSTRA_MINIMA: int = 5
     APP_NAME: str = "AJR System - API"
     DEBUG: bool = True
 
@@ -14,6 +41,20 @@ class Settings(BaseSettings):
     def database_url(self) -> str:
         return f"postgresql://{self.DATABASE_USER}:{self.DATABASE_PASSWORD}@{self.DATABASE_HOST}:{self.DATABASE_PORT}/{self.DATABASE_NAME}"
 
+    @property
+    def async_database_url(self) -> str:
+        return f"postgresql+asyncpg://{self.DATABASE_USER}:{self.DATABASE_PASSWORD}@{self.DATABASE_HOST}:{self.DATABASE_PORT}/{self.DATABASE_NAME}"
+
+    @property
+    def pool_options(self) -> dict:
+        return {
+            "pool_size": self.DATABASE_POOL_SIZE,
+            "max_overflow": self.DATABASE_MAX_OVERFLOW,
+            "pool_timeout": self.DATABASE_POOL_TIMEOUT,
+            "pool_recycle": self.DATABASE_POOL_RECYCLE,
+            "pool_pre_ping": self.DATABASE_POOL_PRE_PING,
+        }
+
     class Config:
         env_file = ".env"
 
@@ -1,11 +1,41 @@
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from app.config import settings
+from app.pool_metrics import QueuePoolCronometrado, AsyncQueuePoolCronometrado
 
-engine = create_engine(settings.database_url)
+
+def _connect_args(assincrono: bool) -> dict:
+    """Timeout de statement aplicado na abertura de cada conexão"""
+    if not settings.DATABASE_STATEMENT_TIMEOUT_MS:
+        return {}
+    timeout = str(settings.DATABASE_STATEMENT_TIMEOUT_MS)
+    if assincrono:
+        return {"server_settings": {"statement_timeout": timeout}}
+    return {"options": f"-c statement_timeout={timeout}"}
+
+
+engine = create_engine(
+    settings.database_url,
+    poolclass=QueuePoolCronometrado,
+    connect_args=_connect_args(assincrono=False),
+    **settings.pool_options
+)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Engine assíncrona (asyncpg) para as rotas de leitura pesadas: não ocupa
+# uma thread do threadpool do FastAPI enquanto a query roda
+async_engine = create_async_engine(
+    settings.async_database_url,
+    poolclass=AsyncQueuePoolCronometrado,
+    connect_args=_connect_args(assincrono=True),
+    **settings.pool_options
+)
+AsyncSessionLocal = async_sessionmaker(
+    async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False
+)
+
 Base = declarative_base()
 
 
@@ -15,3 +45,8 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
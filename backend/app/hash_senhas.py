@@ -0,0 +1,93 @@
+"""
+Hash e verificação de senhas fora do event loop
+
+bcrypt custa centenas de ms de CPU por chamada. As rotas de autenticação
+mandam esse trabalho para um pool de processos dedicado e limitado
+(BCRYPT_WORKERS), sem segurar sessão/conexão do banco enquanto esperam, e
+recusam novas requisições quando a fila passa de BCRYPT_MAX_PENDENTES em
+vez de acumular logins e atrasar o resto da API.
+
+A verificação também informa quando o hash foi gerado com um custo
+diferente de BCRYPT_ROUNDS, para que o login regrave o hash com o custo
+atual.
+"""
+import asyncio
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from typing import Optional, Tuple
+
+from passlib.context import CryptContext
+
+from app.config import settings
+
+
+class HashSobrecarregado(Exception):
+    """Fila de hash de senhas cheia; a requisição deve ser recusada (503)"""
+
+
+@lru_cache(maxsize=None)
+def criar_contexto(rounds: int) -> CryptContext:
+    # Hashes com custo diferente de `rounds` são marcados para atualização
+    return CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=rounds)
+
+
+def _gerar_hash(senha: str, rounds: int) -> str:
+    return criar_contexto(rounds).hash(senha)
+
+
+def _verificar_e_atualizar(senha: str, senha_hash: str, rounds: int) -> Tuple[bool, Optional[str]]:
+    return criar_contexto(rounds).verify_and_update(senha, senha_hash)
+
+
+_executor: Optional[ProcessPoolExecutor] = None
+_pendentes = 0
+_lock = threading.Lock()
+
+
+def _obter_executor() -> ProcessPoolExecutor:
+    """Pool criado no primeiro uso, dentro de cada worker do uvicorn"""
+    global _executor
+    with _lock:
+        if _executor is None:
+            _executor = ProcessPoolExecutor(
+                max_workers=settings.BCRYPT_WORKERS,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return _executor
+
+
+def encerrar_pool() -> None:
+    global _executor
+    with _lock:
+        if _executor is not None:
+            _executor.shutdown(wait=False, cancel_futures=True)
+            _executor = None
+
+
+async def _executar(funcao, *args):
+    global _pendentes
+    with _lock:
+        if _pendentes >= settings.BCRYPT_MAX_PENDENTES:
+            raise HashSobrecarregado()
+        _pendentes += 1
+    try:
+        if settings.BCRYPT_WORKERS <= 0:
+            # Sem pool de processos (ex: ambiente sem multiprocessing): usa thread
+            return await asyncio.to_thread(funcao, *args)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(_obter_executor(), funcao, *args)
+    finally:
+        with _lock:
+            _pendentes -= 1
+
+
+async def gerar_hash_async(senha: str) -> str:
+    """Gera o hash da senha com o custo configurado"""
+    return await _executar(_gerar_hash, senha, settings.BCRYPT_ROUNDS)
+
+
+async def verificar_senha_async(senha: str, senha_hash: str) -> Tuple[bool, Optional[str]]:
+    """Retorna (válida, novo_hash); novo_hash vem preenchido se o custo mudou"""
+    return await _executar(_verificar_e_atualizar, senha, senha_hash, settings.BCRYPT_ROUNDS)
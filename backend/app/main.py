@@ -1,6 +1,14 @@
-from fastapi import FastAPI
+import logging
+import time
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 from app.config import settings
+from app.pagination import NEXT_CURSOR_HEADER
+from app.pool_metrics import iniciar_medicao_requisicao
+from app.agendador import iniciar_agendador
+from app.hash_senhas import encerrar_pool
 from app.routers import (
     equipamentos,
     clientes,
@@ -16,10 +24,25 @@ from app.routers import (
     dashboard,
     contas_pagar,
     contas_receber,
+    fluxo_caixa,
+    importacao,
     auth,
+    metrics,
 )
 
-app = FastAPI(title=settings.APP_NAME, debug=settings.DEBUG)
+logger = logging.getLogger("app.db")
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    tarefa_agendador = iniciar_agendador()
+    yield
+    if tarefa_agendador:
+        tarefa_agendador.cancel()
+    encerrar_pool()
+
+
+app = FastAPI(title=settings.APP_NAME, debug=settings.DEBUG, lifespan=lifespan)
 
 app.add_middleware(
     CORSMiddleware,
@@ -27,8 +50,28 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER],
 )
 
+
+@app.middleware("http")
+async def medir_espera_conexao(request: Request, call_next):
+    """Loga o tempo que a requisição esperou por conexões do pool"""
+    acumulador = iniciar_medicao_requisicao()
+    inicio = time.perf_counter()
+    response = await call_next(request)
+    checkouts, espera = acumulador
+    espera_ms = espera * 1000
+    if checkouts:
+        nivel = logging.WARNING if espera_ms >= settings.DATABASE_POOL_WAIT_LOG_MS else logging.DEBUG
+        logger.log(
+            nivel,
+            "%s %s conexoes=%d espera_pool_ms=%.1f total_ms=%.1f",
+            request.method, request.url.path, checkouts, espera_ms,
+            (time.perf_counter() - inicio) * 1000
+        )
+    return response
+
 # Registrar router - Autenticação
 app.include_router(auth.router)
 
@@ -50,7 +93,12 @@ app.include_router(centros_custo.router)
 app.include_router(lancamentos.router)
 app.include_router(contas_pagar.router)
 app.include_router(contas_receber.router)
+app.include_router(fluxo_caixa.router)
 app.include_router(dashboard.router)
+app.include_router(importacao.router)
+
+# Registrar router - Observabilidade
+app.include_router(metrics.router)
 
 
 @app.get("/")
@@ -3,6 +3,7 @@ from app.models.historico import Historico
 from app.models.centro_custo import CentroCusto
 from app.models.lancamento import Lancamento
 from app.models.partida import Partida
+from app.models.saldo_mensal import SaldoMensal
 from app.models.usuario import Usuario
 from app.models.cliente import Cliente
 from app.models.equipamento import Equipamento
@@ -10,7 +11,9 @@ from app.models.motorista import Motorista
 from app.models.contrato_locacao import ContratoLocacao
 from app.models.viagem import Viagem
 from app.models.abastecimento import Abastecimento
+from app.models.consumo_abastecimento import ConsumoAbastecimento
 from app.models.manutencao import Manutencao
+from app.models.plano_manutencao import PlanoManutencao
 from app.models.conta_pagar import ContaPagar, StatusContaPagar
 from app.models.conta_receber import ContaReceber, StatusContaReceber
 
@@ -20,6 +23,7 @@ __all__ = [
     "CentroCusto",
     "Lancamento",
     "Partida",
+    "SaldoMensal",
     "Usuario",
     "Cliente",
     "Equipamento",
@@ -27,7 +31,9 @@ __all__ = [
     "ContratoLocacao",
     "Viagem",
     "Abastecimento",
+    "ConsumoAbastecimento",
     "Manutencao",
+    "PlanoManutencao",
     "ContaPagar",
     "StatusContaPagar",
     "ContaReceber",
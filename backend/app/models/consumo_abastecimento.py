@@ -0,0 +1,33 @@
+from sqlalchemy import Column, Integer, String, Date, Numeric, ForeignKey, Index
+from sqlalchemy.orm import relationship
+from app.database import Base
+
+
+class ConsumoAbastecimento(Base):
+    """
+    Consumo entre um abastecimento e o anterior do mesmo equipamento.
+
+    Tabela derivada de abastecimentos (só os que têm km_hodometro), mantida
+    por app.services.consumo_combustivel: cada atualização processa apenas os
+    abastecimentos posteriores ao último já calculado de cada equipamento.
+    """
+    __tablename__ = "consumos_abastecimento"
+
+    abastecimento_id = Column(Integer, ForeignKey("abastecimentos.id", ondelete="CASCADE"), primary_key=True)
+    equipamento_id = Column(Integer, ForeignKey("equipamentos.id"), nullable=False)
+    data_abastecimento = Column(Date, nullable=False)
+    km_hodometro = Column(Numeric(10, 2), nullable=False)
+    km_rodados = Column(Numeric(10, 2), nullable=True)  # Nulo no primeiro abastecimento
+    litros = Column(Numeric(10, 2), nullable=False)
+    km_por_litro = Column(Numeric(10, 3), nullable=True)
+    km_por_litro_medio = Column(Numeric(10, 3), nullable=True)  # Média do equipamento no cálculo
+    anomalia = Column(String(30), nullable=True)  # HODOMETRO_REGREDIU, CONSUMO_ALTO, CONSUMO_BAIXO
+
+    # Relationships
+    abastecimento = relationship("Abastecimento")
+    equipamento = relationship("Equipamento")
+
+    # Último abastecimento processado por equipamento
+    __table_args__ = (
+        Index("ix_consumo_equipamento_ordem", "equipamento_id", "data_abastecimento", "abastecimento_id"),
+    )
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Date, Numeric, Boolean, ForeignKey, DateTime, Enum as SQLEnum
+from sqlalchemy import Column, Integer, String, Date, Numeric, Boolean, ForeignKey, DateTime, Index, Enum as SQLEnum
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.database import Base
@@ -47,3 +47,15 @@ class ContaPagar(Base):
 
     # Relationships
     lancamento = relationship("Lancamento", foreign_keys=[lancamento_id])
+
+    # Uma parcela por número dentro do grupo (geração idempotente de séries)
+    __table_args__ = (
+        Index(
+            "uq_conta_pagar_grupo_parcela",
+            "grupo_parcelamento",
+            "parcela_numero",
+            unique=True,
+            postgresql_where=grupo_parcelamento.isnot(None),
+            sqlite_where=grupo_parcelamento.isnot(None),
+        ),
+    )
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Date, Numeric, ForeignKey, DateTime, Enum as SQLEnum
+from sqlalchemy import Column, Integer, String, Date, Numeric, Boolean, ForeignKey, DateTime, Index, Enum as SQLEnum
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.database import Base
@@ -32,6 +32,14 @@ class ContaReceber(Base):
     parcela_total = Column(Integer, nullable=True)
     grupo_parcelamento = Column(String(100), nullable=True)
 
+    # Recorrência (ex: mensalidade de contrato)
+    recorrente = Column(Boolean, default=False)
+    dia_vencimento_recorrente = Column(Integer, nullable=True)
+
+    # Faturamento de contrato de locação: uma conta por contrato e competência (AAAAMM)
+    contrato_id = Column(Integer, ForeignKey("contratos_locacao.id"), nullable=True)
+    competencia = Column(Integer, nullable=True)
+
     # Número da Nota Fiscal / Documento
     numero_documento = Column(String(50), nullable=True, index=True)
 
@@ -47,3 +55,25 @@ class ContaReceber(Base):
     # Relationships
     cliente = relationship("Cliente", foreign_keys=[cliente_id])
     lancamento = relationship("Lancamento", foreign_keys=[lancamento_id])
+    contrato = relationship("ContratoLocacao", foreign_keys=[contrato_id])
+
+    # Uma parcela por número dentro do grupo (geração idempotente de séries)
+    __table_args__ = (
+        Index(
+            "uq_conta_receber_grupo_parcela",
+            "grupo_parcelamento",
+            "parcela_numero",
+            unique=True,
+            postgresql_where=grupo_parcelamento.isnot(None),
+            sqlite_where=grupo_parcelamento.isnot(None),
+        ),
+        # Faturamento idempotente por (contrato, competência)
+        Index(
+            "uq_conta_receber_contrato_competencia",
+            "contrato_id",
+            "competencia",
+            unique=True,
+            postgresql_where=contrato_id.isnot(None),
+            sqlite_where=contrato_id.isnot(None),
+        ),
+    )
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Boolean, Numeric, DateTime, Enum
+from sqlalchemy import Column, Integer, String, Boolean, Numeric, Date, DateTime, Enum
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.database import Base
@@ -28,7 +28,9 @@ class Equipamento(Base):
     numero_serie = Column(String(100), nullable=True)
     valor_aquisicao = Column(Numeric(15, 2), nullable=True)
     hodometro_inicial = Column(Numeric(10, 2), nullable=True)
+    # Mantidos pelas viagens e abastecimentos (app.services.hodometro)
     hodometro_atual = Column(Numeric(10, 2), nullable=True)
+    data_ultima_leitura = Column(Date, nullable=True)
     ativo = Column(Boolean, default=True, nullable=False)
     observacoes = Column(String(1000), nullable=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Date, ForeignKey, DateTime
+from sqlalchemy import Column, Integer, String, Date, ForeignKey, DateTime, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.database import Base
@@ -13,9 +13,16 @@ class Lancamento(Base):
     historico_id = Column(Integer, ForeignKey("historicos.id"), nullable=False)
     complemento = Column(String(500), nullable=True)
     usuario_id = Column(Integer, nullable=True)
+    # Chave do registro no sistema de origem (ex: XTDC019:1628)
+    chave_origem = Column(String(30), nullable=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
 
     # Relationships
     historico = relationship("Historico", back_populates="lancamentos")
     partidas = relationship("Partida", back_populates="lancamento", cascade="all, delete-orphan")
+
+    # Uma importação por registro de origem (reimportações idempotentes)
+    __table_args__ = (
+        Index("uq_lancamento_chave_origem", "chave_origem", unique=True),
+    )
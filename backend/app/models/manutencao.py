@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Date, Numeric, ForeignKey, DateTime, Enum, Text
+from sqlalchemy import Column, Integer, String, Date, Numeric, ForeignKey, DateTime, Enum, Text, Index, text
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.database import Base
@@ -37,9 +37,24 @@ class Manutencao(Base):
     numero_nota = Column(String(50), nullable=True)
     observacoes = Column(String(1000), nullable=True)
     lancamento_id = Column(Integer, ForeignKey("lancamentos.id"), nullable=True)
+    # Preventivas agendadas por um plano (app.services.manutencao_preventiva)
+    plano_manutencao_id = Column(Integer, ForeignKey("planos_manutencao.id"), nullable=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
 
     # Relationships
     equipamento = relationship("Equipamento", back_populates="manutencoes")
     lancamento = relationship("Lancamento")
+    plano_manutencao = relationship("PlanoManutencao")
+
+    # No máximo uma manutenção em aberto por equipamento e plano (agendamento idempotente)
+    __table_args__ = (
+        Index(
+            "uq_manutencao_plano_aberta",
+            "equipamento_id",
+            "plano_manutencao_id",
+            unique=True,
+            postgresql_where=text("status IN ('AGENDADA', 'EM_ANDAMENTO')"),
+            sqlite_where=text("status IN ('AGENDADA', 'EM_ANDAMENTO')"),
+        ),
+    )
@@ -0,0 +1,26 @@
+from sqlalchemy import Column, Integer, String, Boolean, Numeric, DateTime, Enum
+from sqlalchemy.sql import func
+from app.database import Base
+from app.models.equipamento import TipoEquipamento
+
+
+class PlanoManutencao(Base):
+    """
+    Regra de manutenção preventiva por tipo de equipamento: a cada
+    intervalo_km e/ou intervalo_dias desde a última manutenção do plano.
+
+    As antecedências antecipam a manutenção (entra em pendentes e é agendada
+    antes de atingir o km ou a data). Usado por app.services.manutencao_preventiva.
+    """
+    __tablename__ = "planos_manutencao"
+
+    id = Column(Integer, primary_key=True, index=True)
+    tipo_equipamento = Column(Enum(TipoEquipamento), nullable=False, index=True)
+    descricao = Column(String(255), nullable=False)
+    intervalo_km = Column(Numeric(10, 2), nullable=True)
+    intervalo_dias = Column(Integer, nullable=True)
+    antecedencia_km = Column(Numeric(10, 2), default=0, nullable=False)
+    antecedencia_dias = Column(Integer, default=0, nullable=False)
+    ativo = Column(Boolean, default=True, nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
@@ -0,0 +1,35 @@
+from sqlalchemy import Column, Integer, Numeric, ForeignKey, Index, func, literal_column
+from sqlalchemy.orm import relationship
+from app.database import Base
+
+
+class SaldoMensal(Base):
+    """
+    Totais de débitos e créditos por conta, centro de custo e mês.
+
+    Mantida incrementalmente pelas rotas de lançamentos; pode ser reconstruída
+    a partir das partidas com reconstruir_saldos_mensais.py.
+    """
+    __tablename__ = "saldos_mensais"
+
+    id = Column(Integer, primary_key=True, index=True)
+    conta_id = Column(Integer, ForeignKey("plano_contas.id"), nullable=False)
+    centro_custo_id = Column(Integer, ForeignKey("centros_custo.id"), nullable=True)
+    ano_mes = Column(Integer, nullable=False, index=True)  # Ex: 202501
+    debitos = Column(Numeric(15, 2), nullable=False, default=0)
+    creditos = Column(Numeric(15, 2), nullable=False, default=0)
+
+    # Relationships
+    conta = relationship("PlanoContas")
+    centro_custo = relationship("CentroCusto")
+
+    # centro_custo_id nulo participa da chave como 0
+    __table_args__ = (
+        Index(
+            "uq_saldo_mensal_chave",
+            "conta_id",
+            func.coalesce(literal_column("centro_custo_id"), literal_column("0")),
+            "ano_mes",
+            unique=True,
+        ),
+    )
@@ -0,0 +1,106 @@
+"""
+Paginação por cursor (keyset) para os endpoints de listagem
+
+O cursor é um token opaco com os valores das colunas de ordenação do
+último item da página (ex: data + id). A próxima página filtra por
+(data, id) < (data_cursor, id_cursor), que usa o índice composto e custa
+o mesmo em qualquer profundidade, ao contrário de OFFSET.
+"""
+import base64
+import json
+from datetime import date, datetime
+from typing import List, Optional
+
+from fastapi import HTTPException, Response
+from sqlalchemy import tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+# Header com o cursor da próxima página (só enviado quando a página veio cheia)
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def codificar_cursor(valores: list) -> str:
+    """Gera o token opaco a partir dos valores das colunas de ordenação"""
+    serializaveis = [v.isoformat() if isinstance(v, (date, datetime)) else v for v in valores]
+    return base64.urlsafe_b64encode(json.dumps(serializaveis).encode()).decode()
+
+
+def decodificar_cursor(cursor: str, colunas: list) -> list:
+    """Converte o token de volta para valores tipados conforme as colunas"""
+    try:
+        valores = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        if not isinstance(valores, list) or len(valores) != len(colunas):
+            raise ValueError("quantidade de valores diferente das colunas")
+        convertidos = []
+        for valor, coluna in zip(valores, colunas):
+            tipo = coluna.type.python_type
+            if tipo is date:
+                valor = date.fromisoformat(valor)
+            elif tipo is datetime:
+                valor = datetime.fromisoformat(valor)
+            convertidos.append(valor)
+        return convertidos
+    except (ValueError, TypeError, json.JSONDecodeError):
+        raise HTTPException(status_code=400, detail="Cursor de paginação inválido")
+
+
+def _aplicar_pagina(query, colunas: list, skip: int, limit: int, cursor: Optional[str], descendente: bool):
+    """Ordenação, filtro keyset (ou offset) e limit; serve para Query e select()"""
+    if descendente:
+        query = query.order_by(*[coluna.desc() for coluna in colunas])
+    else:
+        query = query.order_by(*colunas)
+
+    if cursor:
+        chave = tuple_(*colunas)
+        valores = tuple_(*decodificar_cursor(cursor, colunas))
+        query = query.filter(chave < valores if descendente else chave > valores)
+    else:
+        query = query.offset(skip)
+
+    return query.limit(limit)
+
+
+def _definir_proximo_cursor(itens: List, colunas: list, limit: int, response: Response) -> None:
+    if itens and len(itens) == limit:
+        ultimo = itens[-1]
+        response.headers[NEXT_CURSOR_HEADER] = codificar_cursor(
+            [getattr(ultimo, coluna.key) for coluna in colunas]
+        )
+
+
+def paginar(
+    query,
+    colunas: list,
+    skip: int,
+    limit: int,
+    cursor: Optional[str],
+    response: Response,
+    descendente: bool = False,
+) -> List:
+    """
+    Ordena a query pelas colunas (a última deve ser o id) e aplica a página.
+
+    Com cursor usa keyset e ignora skip; sem cursor mantém offset/limit.
+    Em ambos os casos devolve o próximo cursor no header X-Next-Cursor.
+    """
+    itens = _aplicar_pagina(query, colunas, skip, limit, cursor, descendente).all()
+    _definir_proximo_cursor(itens, colunas, limit, response)
+    return itens
+
+
+async def paginar_async(
+    db: AsyncSession,
+    stmt,
+    colunas: list,
+    skip: int,
+    limit: int,
+    cursor: Optional[str],
+    response: Response,
+    descendente: bool = False,
+) -> List:
+    """Mesmo que paginar(), para um select() de entidade executado em AsyncSession"""
+    resultado = await db.execute(_aplicar_pagina(stmt, colunas, skip, limit, cursor, descendente))
+    itens = resultado.scalars().all()
+    _definir_proximo_cursor(itens, colunas, limit, response)
+    return itens
@@ -1,155 +1,221 @@
 """
 Parser para arquivos de balancete do XTDC (.LST)
 Extrai o plano de contas com estrutura hierárquica
+
+O arquivo é lido linha a linha: iter_contas() gera as contas sob demanda e
+acumula as estatísticas na mesma passada, sem carregar o arquivo inteiro.
+parse_many() percorre vários balancetes (ex: AJRNEWS/TRABALHO/*.LST) da
+mesma forma.
 """
 import re
-from typing import List, Dict, Optional
-from decimal import Decimal
+import time
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+from decimal import Decimal, InvalidOperation
+
+# Padrão esperado: CODIGO NOME SALDO_ANT DEBITOS CREDITOS SALDO_ATUAL
+# Exemplo: 1.1.01.01.01      Caixa                               3.450,00     1.230.737,43       130.498,74      1.103.688,69
+# Formato do código: 1.1.01.01.01 ou 1 ou 1.1
+PADRAO_CODIGO = re.compile(r'(\d+(?:\.\d+)*)\s+')
+PADRAO_VALOR = re.compile(r'[\d.,\-\(\)]+')
+MAX_VALORES = 4
+
+# Tipo de conta pelo primeiro dígito do código
+TIPOS_CONTA = {
+    '1': 'ATIVO',
+    '2': 'PASSIVO',
+    '3': 'PATRIMONIO_LIQUIDO',
+    '4': 'RECEITA',
+    '5': 'DESPESA',
+    '6': 'DESPESA',
+    '7': 'RECEITA'
+}
+NATUREZA_DEVEDORA = ('ATIVO', 'DESPESA')
+TIPOS_ESTATISTICA = ('ATIVO', 'PASSIVO', 'PATRIMONIO_LIQUIDO', 'RECEITA', 'DESPESA')
+NIVEIS_ESTATISTICA = range(1, 6)
+
+_ZERO = Decimal('0')
+
+
+def parse_valor(valor_str: Optional[str]) -> Decimal:
+    """Converte string de valor (1.234,56 ou (1.234,56)) para Decimal"""
+    if not valor_str:
+        return _ZERO
+
+    # Remove pontos de milhar e substitui vírgula por ponto
+    valor_str = valor_str.replace('.', '').replace(',', '.')
+
+    # Trata valores negativos (entre parênteses)
+    if '(' in valor_str:
+        valor_str = '-' + valor_str.replace('(', '').replace(')', '')
+
+    try:
+        return Decimal(valor_str)
+    except InvalidOperation:
+        return _ZERO
 
 
 class ContaXTDC:
-    """Representa uma conta do plano de contas do XTDC"""
+    """
+    Representa uma conta do plano de contas do XTDC
+
+    Nível, tipo, natureza e se aceita lançamento são calculados uma única vez
+    na criação; __slots__ mantém o registro compacto em importações grandes.
+    """
+
+    __slots__ = (
+        'codigo', 'nome', 'saldo_anterior', 'debitos', 'creditos', 'saldo_atual',
+        'nivel', 'tipo_conta', 'natureza', 'aceita_lancamento',
+    )
 
     def __init__(self, codigo: str, nome: str, saldo_anterior: Decimal = None,
                  debitos: Decimal = None, creditos: Decimal = None, saldo_atual: Decimal = None):
         self.codigo = codigo
         self.nome = nome
-        self.saldo_anterior = saldo_anterior or Decimal('0')
-        self.debitos = debitos or Decimal('0')
-        self.creditos = creditos or Decimal('0')
-        self.saldo_atual = saldo_atual or Decimal('0')
-
-    @property
-    def nivel(self) -> int:
-        """Calcula o nível hierárquico baseado no código"""
+        self.saldo_anterior = saldo_anterior or _ZERO
+        self.debitos = debitos or _ZERO
+        self.creditos = creditos or _ZERO
+        self.saldo_atual = saldo_atual or _ZERO
+
         # 1 = nível 1, 1.1 = nível 2, 1.1.01 = nível 3, etc
-        return len([p for p in self.codigo.split('.') if p])
-
-    @property
-    def tipo_conta(self) -> str:
-        """Determina o tipo de conta baseado no primeiro dígito"""
-        primeiro_digito = self.codigo[0]
-        tipos = {
-            '1': 'ATIVO',
-            '2': 'PASSIVO',
-            '3': 'PATRIMONIO_LIQUIDO',
-            '4': 'RECEITA',
-            '5': 'DESPESA',
-            '6': 'DESPESA',
-            '7': 'RECEITA'
-        }
-        return tipos.get(primeiro_digito, 'ATIVO')
-
-    @property
-    def natureza(self) -> str:
-        """Determina a natureza baseado no tipo"""
-        tipo = self.tipo_conta
-        if tipo in ['ATIVO', 'DESPESA']:
-            return 'DEVEDORA'
-        return 'CREDORA'
-
-    @property
-    def aceita_lancamento(self) -> bool:
-        """Contas analíticas (com mais níveis) aceitam lançamento"""
-        # Se tem saldo_atual diferente de zero ou movimentação, é analítica
-        return self.nivel >= 3 or self.saldo_atual != 0 or self.debitos != 0 or self.creditos != 0
+        self.nivel = len([p for p in codigo.split('.') if p])
+        self.tipo_conta = TIPOS_CONTA.get(codigo[0], 'ATIVO')
+        self.natureza = 'DEVEDORA' if self.tipo_conta in NATUREZA_DEVEDORA else 'CREDORA'
+        # Contas analíticas (com mais níveis ou com movimentação) aceitam lançamento
+        self.aceita_lancamento = (
+            self.nivel >= 3 or self.saldo_atual != 0 or self.debitos != 0 or self.creditos != 0
+        )
 
     def __repr__(self):
         return f"<Conta {self.codigo} - {self.nome}>"
 
 
+class EstatisticasBalancete:
+    """Contadores das contas extraídas, atualizados a cada conta (uma passada)"""
+
+    def __init__(self):
+        self.total_contas = 0
+        self.por_tipo = dict.fromkeys(TIPOS_ESTATISTICA, 0)
+        self.por_nivel = dict.fromkeys(NIVEIS_ESTATISTICA, 0)
+        self.analiticas = 0
+
+    def adicionar(self, conta: ContaXTDC) -> None:
+        self.total_contas += 1
+        self.por_tipo[conta.tipo_conta] += 1
+        if conta.nivel in self.por_nivel:
+            self.por_nivel[conta.nivel] += 1
+        if conta.aceita_lancamento:
+            self.analiticas += 1
+
+    def como_dict(self) -> Dict:
+        return {
+            'total_contas': self.total_contas,
+            'por_tipo': dict(self.por_tipo),
+            'por_nivel': {f'Nível {nivel}': total for nivel, total in self.por_nivel.items()},
+            'analiticas': self.analiticas,
+            'sinteticas': self.total_contas - self.analiticas,
+        }
+
+
+def extrair_conta(linha: str) -> Optional[ContaXTDC]:
+    """Extrai dados de uma conta de uma linha do balancete"""
+    linha = linha.strip()
+
+    # Toda conta começa pelo código; o resto (vazias, cabeçalhos, totais) sai
+    # aqui sem passar pelo regex
+    if not linha or not linha[0].isdigit():
+        return None
+
+    # Ignorar cabeçalhos e separadores
+    if 'NOME' in linha or '---' in linha or 'BALANCETE' in linha:
+        return None
+
+    match = PADRAO_CODIGO.match(linha)
+    if not match:
+        return None
+
+    # Os valores são as últimas palavras numéricas (até 4); o nome é o que
+    # sobra entre o código e elas, nunca vazio. Equivale ao antigo regex
+    # único `CODIGO (.+?) VALOR? VALOR? VALOR? VALOR?$`, sem o backtracking
+    # que ele fazia em linhas que não terminam em valor.
+    resto = linha[match.end():]
+    palavras = resto.split()
+    quantidade = 0
+    while (quantidade < MAX_VALORES and quantidade < len(palavras) - 1
+           and PADRAO_VALOR.fullmatch(palavras[-1 - quantidade])):
+        quantidade += 1
+
+    if quantidade:
+        nome, *valores = resto.rsplit(None, quantidade)
+    else:
+        nome, valores = resto, []
+    valores += [None] * (MAX_VALORES - quantidade)
+
+    return ContaXTDC(
+        codigo=match.group(1),
+        nome=nome,
+        saldo_anterior=parse_valor(valores[0]),
+        debitos=parse_valor(valores[1]),
+        creditos=parse_valor(valores[2]),
+        saldo_atual=parse_valor(valores[3])
+    )
+
+
 class BalanceteXTDCParser:
     """Parser para arquivos de balancete do XTDC"""
 
     def __init__(self, arquivo_path: str):
         self.arquivo_path = arquivo_path
         self.contas: List[ContaXTDC] = []
+        self.estatisticas = EstatisticasBalancete()
 
-    def parse(self) -> List[ContaXTDC]:
-        """Processa o arquivo e extrai as contas"""
+    def iter_contas(self) -> Iterator[ContaXTDC]:
+        """Gera as contas do arquivo, uma linha por vez"""
+        self.estatisticas = EstatisticasBalancete()
         with open(self.arquivo_path, 'r', encoding='latin1', errors='ignore') as f:
-            linhas = f.readlines()
-
-        for linha in linhas:
-            conta = self._extrair_conta(linha)
-            if conta:
-                self.contas.append(conta)
+            for linha in f:
+                conta = extrair_conta(linha)
+                if conta:
+                    self.estatisticas.adicionar(conta)
+                    yield conta
 
+    def parse(self) -> List[ContaXTDC]:
+        """Processa o arquivo e extrai as contas"""
+        self.contas = list(self.iter_contas())
         return self.contas
 
-    def _extrair_conta(self, linha: str) -> Optional[ContaXTDC]:
-        """Extrai dados de uma conta de uma linha do balancete"""
-        # Padrão esperado: CODIGO NOME SALDO_ANT DEBITOS CREDITOS SALDO_ATUAL
-        # Exemplo: 1.1.01.01.01      Caixa                               3.450,00     1.230.737,43       130.498,74      1.103.688,69
-
-        # Remove espaços extras e tenta extrair
-        linha = linha.strip()
-
-        # Ignorar linhas vazias, cabeçalhos e separadores
-        if not linha or 'NOME' in linha or '---' in linha or 'BALANCETE' in linha:
-            return None
-
-        # Regex para capturar código (pode ter pontos e números)
-        # Formato: 1.1.01.01.01 ou 1 ou 1.1
-        match = re.match(r'^(\d+(?:\.\d+)*)\s+(.+?)(?:\s+([\d.,\-\(\)]+))?(?:\s+([\d.,\-\(\)]+))?(?:\s+([\d.,\-\(\)]+))?(?:\s+([\d.,\-\(\)]+))?$', linha)
-
-        if not match:
-            return None
-
-        codigo = match.group(1).strip()
-        nome = match.group(2).strip()
-
-        # Extrair valores (podem estar ausentes)
-        try:
-            saldo_anterior = self._parse_valor(match.group(3)) if match.group(3) else Decimal('0')
-            debitos = self._parse_valor(match.group(4)) if match.group(4) else Decimal('0')
-            creditos = self._parse_valor(match.group(5)) if match.group(5) else Decimal('0')
-            saldo_atual = self._parse_valor(match.group(6)) if match.group(6) else Decimal('0')
-        except:
-            saldo_anterior = debitos = creditos = saldo_atual = Decimal('0')
-
-        return ContaXTDC(
-            codigo=codigo,
-            nome=nome,
-            saldo_anterior=saldo_anterior,
-            debitos=debitos,
-            creditos=creditos,
-            saldo_atual=saldo_atual
-        )
-
-    def _parse_valor(self, valor_str: str) -> Decimal:
-        """Converte string de valor para Decimal"""
-        if not valor_str:
-            return Decimal('0')
-
-        # Remove espaços, pontos de milhar e substitui vírgula por ponto
-        valor_str = valor_str.strip()
-        valor_str = valor_str.replace('.', '').replace(',', '.')
-
-        # Trata valores negativos (entre parênteses)
-        if '(' in valor_str:
-            valor_str = '-' + valor_str.replace('(', '').replace(')', '')
-
-        try:
-            return Decimal(valor_str)
-        except:
-            return Decimal('0')
-
     def get_estatisticas(self) -> Dict:
-        """Retorna estatísticas das contas extraídas"""
-        return {
-            'total_contas': len(self.contas),
-            'por_tipo': {
-                'ATIVO': len([c for c in self.contas if c.tipo_conta == 'ATIVO']),
-                'PASSIVO': len([c for c in self.contas if c.tipo_conta == 'PASSIVO']),
-                'PATRIMONIO_LIQUIDO': len([c for c in self.contas if c.tipo_conta == 'PATRIMONIO_LIQUIDO']),
-                'RECEITA': len([c for c in self.contas if c.tipo_conta == 'RECEITA']),
-                'DESPESA': len([c for c in self.contas if c.tipo_conta == 'DESPESA']),
-            },
-            'por_nivel': {
-                f'Nível {i}': len([c for c in self.contas if c.nivel == i])
-                for i in range(1, 6)
-            },
-            'analiticas': len([c for c in self.contas if c.aceita_lancamento]),
-            'sinteticas': len([c for c in self.contas if not c.aceita_lancamento]),
-        }
+        """Retorna estatísticas das contas já lidas (parse ou iter_contas)"""
+        return self.estatisticas.como_dict()
+
+
+def parse_many(caminhos: Iterable[str]) -> Iterator[Tuple[str, ContaXTDC]]:
+    """
+    Gera (arquivo, conta) de vários balancetes, na ordem dos arquivos
+
+    Ex: parse_many(sorted(Path('AJRNEWS/AJRNEWS/TRABALHO').glob('*.LST')))
+    """
+    for caminho in caminhos:
+        for conta in BalanceteXTDCParser(str(caminho)).iter_contas():
+            yield str(caminho), conta
+
+
+def ler_arquivo(caminho: str) -> Dict:
+    """
+    Lê um balancete inteiro: contas, estatísticas e tempo de leitura (ms)
+
+    Fica neste módulo, que não importa o resto da aplicação, para ser
+    executado nos processos da importação paralela.
+    """
+    inicio = time.perf_counter()
+    parser = BalanceteXTDCParser(caminho)
+    try:
+        contas = parser.parse()
+    except OSError as e:
+        return {"arquivo": caminho, "erro": str(e), "contas": [],
+                "parse_ms": round((time.perf_counter() - inicio) * 1000, 1)}
+    return {
+        "arquivo": caminho,
+        "contas": contas,
+        "estatisticas": parser.get_estatisticas(),
+        "parse_ms": round((time.perf_counter() - inicio) * 1000, 1),
+    }
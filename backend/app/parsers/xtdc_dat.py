@@ -0,0 +1,184 @@
+"""
+Leitura dos arquivos .DAT do XTDC (WK Sistemas) por registros
+
+O arquivo é mapeado em memória (mmap) e cada registro de tamanho fixo é
+decodificado direto do mapeamento com struct.Struct.unpack_from, sem ler o
+arquivo inteiro nem convertê-lo para texto. Os registros são gerados sob
+demanda, já com os tipos finais (int, date, Decimal, str).
+
+Layouts conhecidos (pasta AJRNEWS/DADOS):
+
+- XTDC019.DAT: partidas dos lançamentos, 30 bytes por registro. O registro
+  0 é cabeçalho; o número do registro é a CHAVE exibida no razão (sem o
+  dígito verificador). As contas são códigos reduzidos (número do registro
+  no XTDC035, 0 = sem conta), a data é um serial de dias (1 = 01/01/1940) e
+  o valor é BCD compactado com 2 casas decimais.
+- XTDC035.DAT: plano de contas, 52 bytes por registro (o número do
+  registro é o código reduzido). A classificação é gravada em nibbles:
+  0-9 dígitos, 0xE ponto e 0xA preenchimento.
+- XTDC060.DAT: não tem registros fixos; é a área de textos (complementos
+  de histórico) separados por CR CR, lida com iter_textos().
+
+Os textos usam a página de código DOS em português (cp860).
+"""
+import mmap
+import os
+import struct
+from contextlib import contextmanager
+from datetime import date, timedelta
+from decimal import Decimal
+from typing import Callable, Iterator, NamedTuple, Optional
+
+ENCODING = 'cp860'
+DATA_BASE = date(1939, 12, 31)
+SEPARADOR_TEXTO = b'\r\r'
+
+
+class PartidaXTDC(NamedTuple):
+    """Partida de um lançamento (XTDC019.DAT)"""
+    chave: int
+    numero: int
+    conta_debito: int
+    conta_credito: int
+    data: Optional[date]
+    valor: Decimal
+    lote: int
+    tipo: int
+    controle: int
+
+
+class ContaDAT(NamedTuple):
+    """Conta do plano de contas (XTDC035.DAT)"""
+    reduzido: int
+    codigo: str
+    nome: str
+    sintetica: bool
+    situacao: int
+
+
+class TextoXTDC(NamedTuple):
+    """Texto da área de complementos (XTDC060.DAT) e sua posição no arquivo"""
+    posicao: int
+    texto: str
+
+
+class LayoutRegistro:
+    """
+    Registro de tamanho fixo: formato struct e a função que monta o registro
+    tipado a partir de (número do registro, campos). A função pode retornar
+    None para pular registros vazios.
+    """
+
+    def __init__(self, formato: str, criar: Callable, primeiro: int = 0):
+        self.struct = struct.Struct(formato)
+        self.tamanho = self.struct.size
+        self.criar = criar
+        self.primeiro = primeiro
+
+
+def data_xtdc(serial: int) -> Optional[date]:
+    """Serial de dias do XTDC (1 = 01/01/1940) para date; 0 = sem data"""
+    return DATA_BASE + timedelta(days=serial) if serial else None
+
+
+def valor_bcd(dados: bytes, casas: int = 2) -> Decimal:
+    """BCD compactado (dois dígitos por byte) para Decimal"""
+    digitos = dados.hex()
+    if not digitos.isdigit():
+        raise ValueError(f"Valor BCD inválido: {digitos}")
+    return Decimal(int(digitos)).scaleb(-casas)
+
+
+def classificacao_nibbles(dados: bytes) -> str:
+    """Classificação gravada em nibbles (1e1e01e01a -> 1.1.01.01)"""
+    return dados.hex().split('a', 1)[0].replace('e', '.')
+
+
+@contextmanager
+def mapear_arquivo(caminho: str) -> Iterator[memoryview]:
+    """Mapeia o arquivo só para leitura; arquivos vazios viram um buffer vazio"""
+    with open(caminho, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            yield memoryview(b'')
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapa:
+            with memoryview(mapa) as dados:
+                yield dados
+
+
+def ler_registros(caminho: str, layout: LayoutRegistro) -> Iterator:
+    """Gera os registros tipados do arquivo, um por vez"""
+    unpack_from = layout.struct.unpack_from
+    criar = layout.criar
+    with mapear_arquivo(caminho) as dados:
+        total = len(dados) // layout.tamanho
+        for indice in range(layout.primeiro, total):
+            registro = criar(indice, unpack_from(dados, indice * layout.tamanho))
+            if registro is not None:
+                yield registro
+
+
+def _criar_partida(indice: int, campos: tuple) -> PartidaXTDC:
+    numero, controle, debito, credito, serial, valor, tipo, lote = campos
+    return PartidaXTDC(
+        chave=indice,
+        numero=numero,
+        conta_debito=debito,
+        conta_credito=credito,
+        data=data_xtdc(serial),
+        valor=valor_bcd(valor),
+        lote=lote,
+        tipo=tipo,
+        controle=controle,
+    )
+
+
+def _criar_conta(indice: int, campos: tuple) -> Optional[ContaDAT]:
+    nome, classificacao, situacao, indicador = campos
+    codigo = classificacao_nibbles(classificacao)
+    nome = nome.decode(ENCODING).rstrip(' \x00')
+    # Registros livres: classificação só com preenchimento ou zerados
+    if not codigo or not nome:
+        return None
+    return ContaDAT(
+        reduzido=indice,
+        codigo=codigo,
+        nome=nome,
+        sintetica=indicador == b'T',
+        situacao=situacao,
+    )
+
+
+# numero, controle, conta débito, conta crédito, data, valor (BCD), tipo, lote, reservado
+LAYOUT_PARTIDAS = LayoutRegistro('<5H8sBH9x', _criar_partida, primeiro=1)
+# nome, classificação (nibbles), situação, indicador T (totalizadora) / a (analítica)
+LAYOUT_PLANO_CONTAS = LayoutRegistro('<40s10sBc', _criar_conta)
+
+
+def iter_partidas(caminho: str) -> Iterator[PartidaXTDC]:
+    """Partidas dos lançamentos (XTDC019.DAT), na ordem do arquivo"""
+    return ler_registros(caminho, LAYOUT_PARTIDAS)
+
+
+def iter_plano_contas(caminho: str) -> Iterator[ContaDAT]:
+    """Contas do plano de contas (XTDC035.DAT), na ordem do código reduzido"""
+    return ler_registros(caminho, LAYOUT_PLANO_CONTAS)
+
+
+def iter_textos(caminho: str) -> Iterator[TextoXTDC]:
+    """Textos não vazios da área de complementos (XTDC060.DAT)"""
+    with mapear_arquivo(caminho) as dados:
+        buscar = dados.obj.find  # mmap.find: busca no mapeamento, sem copiar
+        # Os primeiros bytes até o primeiro separador são o cabeçalho
+        inicio = buscar(SEPARADOR_TEXTO)
+        if inicio < 0:
+            return
+        inicio += len(SEPARADOR_TEXTO)
+        tamanho = len(dados)
+        while inicio < tamanho:
+            fim = buscar(SEPARADOR_TEXTO, inicio)
+            if fim < 0:
+                fim = tamanho
+            if fim > inicio:
+                yield TextoXTDC(inicio, str(dados[inicio:fim], ENCODING).strip())
+            inicio = fim + len(SEPARADOR_TEXTO)
@@ -0,0 +1,82 @@
+"""
+Métricas do pool de conexões
+
+Os pools das engines medem quanto tempo cada checkout esperou por uma
+conexão (fila do pool + abertura de conexão nova). O total é acumulado
+por pool, para o endpoint /metrics/db-pool, e por requisição, para o log
+de tempo de espera emitido pelo middleware em app.main.
+"""
+import threading
+import time
+from contextvars import ContextVar
+from typing import Dict, Optional
+
+from sqlalchemy.pool import QueuePool, AsyncAdaptedQueuePool
+
+# Acumulador [checkouts, segundos de espera] da requisição corrente; é uma
+# lista (mutável) para que threads do threadpool, que recebem uma cópia do
+# contexto, somem no mesmo objeto
+_espera_requisicao: ContextVar[Optional[list]] = ContextVar("espera_requisicao", default=None)
+
+
+class _CheckoutCronometrado:
+    """Mixin que cronometra _do_get (obtenção de conexão do pool)"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._metricas_lock = threading.Lock()
+        self.total_checkouts = 0
+        self.espera_total = 0.0
+        self.espera_maxima = 0.0
+
+    def _do_get(self):
+        inicio = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            espera = time.perf_counter() - inicio
+            with self._metricas_lock:
+                self.total_checkouts += 1
+                self.espera_total += espera
+                self.espera_maxima = max(self.espera_maxima, espera)
+            acumulador = _espera_requisicao.get()
+            if acumulador is not None:
+                acumulador[0] += 1
+                acumulador[1] += espera
+
+
+class QueuePoolCronometrado(_CheckoutCronometrado, QueuePool):
+    pass
+
+
+class AsyncQueuePoolCronometrado(_CheckoutCronometrado, AsyncAdaptedQueuePool):
+    pass
+
+
+def iniciar_medicao_requisicao() -> list:
+    """Começa a acumular a espera por conexão da requisição corrente"""
+    acumulador = [0, 0.0]
+    _espera_requisicao.set(acumulador)
+    return acumulador
+
+
+def resumo_pool(pool) -> Dict:
+    """Estado atual e espera acumulada de um pool"""
+    resumo = {
+        "tamanho": pool.size(),
+        "em_uso": pool.checkedout(),
+        "ociosas": pool.checkedin(),
+        "overflow": max(pool.overflow(), 0),
+        "max_overflow": pool._max_overflow,
+        "timeout_segundos": pool.timeout(),
+    }
+    if isinstance(pool, _CheckoutCronometrado):
+        with pool._metricas_lock:
+            checkouts = pool.total_checkouts
+            resumo.update({
+                "checkouts": checkouts,
+                "espera_total_ms": round(pool.espera_total * 1000, 3),
+                "espera_media_ms": round(pool.espera_total * 1000 / checkouts, 3) if checkouts else 0.0,
+                "espera_maxima_ms": round(pool.espera_maxima * 1000, 3),
+            })
+    return resumo
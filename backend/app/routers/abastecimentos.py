@@ -1,10 +1,16 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status, Response
+from sqlalchemy import func, select
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 from datetime import date
 from app.database import get_db
+from app.pagination import paginar
 from app.models.abastecimento import Abastecimento
+from app.models.consumo_abastecimento import ConsumoAbastecimento
 from app.schemas.abastecimento import AbastecimentoCreate, AbastecimentoUpdate, AbastecimentoResponse
+from app.services.consumo_combustivel import atualizar_consumo, descartar_consumo
+from app.services.custos_equipamentos import invalidar_custos_equipamentos
+from app.services.hodometro import registrar_leitura, remover_leitura
 
 router = APIRouter(prefix="/abastecimentos", tags=["Abastecimentos"])
 
@@ -13,9 +19,11 @@ router = APIRouter(prefix="/abastecimentos", tags=["Abastecimentos"])
 def listar_abastecimentos(
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = None,
     equipamento_id: int = None,
     data_inicio: date = None,
     data_fim: date = None,
+    response: Response = None,
     db: Session = Depends(get_db)
 ):
     query = db.query(Abastecimento)
@@ -26,10 +34,88 @@ def listar_abastecimentos(
     if data_fim:
         query = query.filter(Abastecimento.data_abastecimento <= data_fim)
 
-    abastecimentos = query.order_by(Abastecimento.data_abastecimento.desc()).offset(skip).limit(limit).all()
+    abastecimentos = paginar(
+        query, [Abastecimento.data_abastecimento, Abastecimento.id], skip, limit, cursor, response, descendente=True
+    )
     return abastecimentos
 
 
+@router.get("/consumo", response_model=dict)
+def consumo_combustivel(
+    equipamento_id: int = None,
+    data_inicio: date = None,
+    data_fim: date = None,
+    apenas_anomalias: bool = False,
+    limit: int = Query(500, ge=1, le=5000),
+    db: Session = Depends(get_db)
+):
+    """
+    Consumo (km/l) entre abastecimentos e anomalias detectadas
+
+    Só leitura: os abastecimentos novos são processados pelo job diário ou
+    por POST /abastecimentos/consumo/atualizar. Traz o resumo por equipamento
+    (média de km/l e anomalias) e os intervalos mais recentes primeiro.
+    """
+    c = ConsumoAbastecimento
+    filtros = []
+    if equipamento_id:
+        filtros.append(c.equipamento_id == equipamento_id)
+    if data_inicio:
+        filtros.append(c.data_abastecimento >= data_inicio)
+    if data_fim:
+        filtros.append(c.data_abastecimento <= data_fim)
+
+    resumo = db.execute(
+        select(
+            c.equipamento_id,
+            func.count(c.km_por_litro).label("intervalos"),
+            func.sum(c.km_rodados).filter(c.anomalia.is_(None)).label("km_rodados"),
+            func.sum(c.litros).filter(c.anomalia.is_(None), c.km_rodados.isnot(None)).label("litros"),
+            func.count(c.anomalia).label("anomalias"),
+        ).where(*filtros).group_by(c.equipamento_id).order_by(c.equipamento_id)
+    ).all()
+
+    if apenas_anomalias:
+        filtros.append(c.anomalia.isnot(None))
+    intervalos = db.execute(
+        select(c).where(*filtros).order_by(c.data_abastecimento.desc(), c.abastecimento_id.desc()).limit(limit)
+    ).scalars().all()
+
+    return {
+        "equipamentos": [
+            {
+                "equipamento_id": linha.equipamento_id,
+                "intervalos": linha.intervalos,
+                "km_por_litro": round(linha.km_rodados / linha.litros, 3) if linha.litros else None,
+                "anomalias": linha.anomalias,
+            }
+            for linha in resumo
+        ],
+        "intervalos": [
+            {
+                "abastecimento_id": consumo.abastecimento_id,
+                "equipamento_id": consumo.equipamento_id,
+                "data_abastecimento": consumo.data_abastecimento,
+                "km_hodometro": consumo.km_hodometro,
+                "km_rodados": consumo.km_rodados,
+                "litros": consumo.litros,
+                "km_por_litro": consumo.km_por_litro,
+                "km_por_litro_medio": consumo.km_por_litro_medio,
+                "anomalia": consumo.anomalia,
+            }
+            for consumo in intervalos
+        ],
+    }
+
+
+@router.post("/consumo/atualizar", response_model=dict)
+def atualizar_consumo_combustivel(completo: bool = False, db: Session = Depends(get_db)):
+    """Processa agora os abastecimentos ainda não calculados (ou todos, com completo=true)"""
+    resultado = atualizar_consumo(db, completo=completo)
+    db.commit()
+    return resultado
+
+
 @router.get("/{abastecimento_id}", response_model=AbastecimentoResponse)
 def buscar_abastecimento(abastecimento_id: int, db: Session = Depends(get_db)):
     abastecimento = db.query(Abastecimento).filter(Abastecimento.id == abastecimento_id).first()
@@ -42,7 +128,13 @@ def buscar_abastecimento(abastecimento_id: int, db: Session = Depends(get_db)):
 def criar_abastecimento(abastecimento: AbastecimentoCreate, db: Session = Depends(get_db)):
     novo_abastecimento = Abastecimento(**abastecimento.model_dump())
     db.add(novo_abastecimento)
+    descartar_consumo(db, novo_abastecimento.equipamento_id, novo_abastecimento.data_abastecimento)
+    registrar_leitura(
+        db, novo_abastecimento.equipamento_id, novo_abastecimento.km_hodometro,
+        novo_abastecimento.data_abastecimento,
+    )
     db.commit()
+    invalidar_custos_equipamentos()
     db.refresh(novo_abastecimento)
     return novo_abastecimento
 
@@ -57,11 +149,24 @@ def atualizar_abastecimento(
     if not db_abastecimento:
         raise HTTPException(status_code=404, detail="Abastecimento não encontrado")
 
+    # Consumos a partir da data antiga e da nova são recalculados
+    descartar_consumo(db, db_abastecimento.equipamento_id, db_abastecimento.data_abastecimento)
+    leitura_anterior = (
+        db_abastecimento.equipamento_id, db_abastecimento.km_hodometro, db_abastecimento.data_abastecimento
+    )
     update_data = abastecimento.model_dump(exclude_unset=True)
     for field, value in update_data.items():
         setattr(db_abastecimento, field, value)
+    descartar_consumo(db, db_abastecimento.equipamento_id, db_abastecimento.data_abastecimento)
+    db.flush()
+    remover_leitura(db, *leitura_anterior)
+    registrar_leitura(
+        db, db_abastecimento.equipamento_id, db_abastecimento.km_hodometro,
+        db_abastecimento.data_abastecimento,
+    )
 
     db.commit()
+    invalidar_custos_equipamentos()
     db.refresh(db_abastecimento)
     return db_abastecimento
 
@@ -72,6 +177,13 @@ def deletar_abastecimento(abastecimento_id: int, db: Session = Depends(get_db)):
     if not db_abastecimento:
         raise HTTPException(status_code=404, detail="Abastecimento não encontrado")
 
+    descartar_consumo(db, db_abastecimento.equipamento_id, db_abastecimento.data_abastecimento)
     db.delete(db_abastecimento)
+    db.flush()
+    remover_leitura(
+        db, db_abastecimento.equipamento_id, db_abastecimento.km_hodometro,
+        db_abastecimento.data_abastecimento,
+    )
     db.commit()
+    invalidar_custos_equipamentos()
     return None
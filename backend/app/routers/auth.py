@@ -1,10 +1,12 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordRequestForm
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from typing import List
 from datetime import timedelta
 
-from app.database import get_db
+from app.database import get_db, get_async_db
 from app.models.usuario import Usuario
 from app.schemas.auth import (
     UsuarioCreate,
@@ -14,25 +16,56 @@ from app.schemas.auth import (
     LoginRequest
 )
 from app.auth import (
-    get_password_hash,
     authenticate_user,
     create_access_token,
     get_current_user,
     get_current_admin_user,
     ACCESS_TOKEN_EXPIRE_MINUTES,
-    get_user_by_email
 )
+from app.cache_usuarios import UsuarioAutenticado, invalidar_usuario_cache
+from app.hash_senhas import HashSobrecarregado, gerar_hash_async
 
 router = APIRouter(prefix="/api/auth", tags=["Autenticação"])
 
 
+def _servidor_ocupado() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="Muitas autenticações simultâneas, tente novamente",
+        headers={"Retry-After": "1"},
+    )
+
+
+async def _autenticar(db: AsyncSession, email: str, senha: str) -> UsuarioAutenticado:
+    try:
+        user = await authenticate_user(db, email, senha)
+    except HashSobrecarregado:
+        raise _servidor_ocupado()
+    if not user:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Email ou senha incorretos",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    return user
+
+
+async def _gerar_hash(senha: str) -> str:
+    try:
+        return await gerar_hash_async(senha)
+    except HashSobrecarregado:
+        raise _servidor_ocupado()
+
 @router.post("/register", response_model=UsuarioResponse, status_code=status.HTTP_201_CREATED)
-def register(user_data: UsuarioCreate, db: Session = Depends(get_db)):
+async def register(user_data: UsuarioCreate, db: AsyncSession = Depends(get_async_db)):
     """
     Registra um novo usuário no sistema.
     """
     # Verifica se email já existe
-    existing_user = get_user_by_email(db, user_data.email)
+    existing_user = (await db.execute(
+        select(Usuario.id).where(Usuario.email == user_data.email)
+    )).first()
+    await db.rollback()  # não segura a conexão durante o hash
     if existing_user:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -40,7 +73,7 @@ def register(user_data: UsuarioCreate, db: Session = Depends(get_db)):
         )
 
     # Cria o novo usuário
-    hashed_password = get_password_hash(user_data.senha)
+    hashed_password = await _gerar_hash(user_data.senha)
     new_user = Usuario(
         nome=user_data.nome,
         email=user_data.email,
@@ -50,24 +83,18 @@ def register(user_data: UsuarioCreate, db: Session = Depends(get_db)):
     )
 
     db.add(new_user)
-    db.commit()
-    db.refresh(new_user)
+    await db.commit()
+    await db.refresh(new_user)
 
     return new_user
 
 
 @router.post("/login", response_model=Token)
-def login(login_data: LoginRequest, db: Session = Depends(get_db)):
+async def login(login_data: LoginRequest, db: AsyncSession = Depends(get_async_db)):
     """
     Autentica um usuário e retorna um token JWT.
     """
-    user = authenticate_user(db, login_data.email, login_data.senha)
-    if not user:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Email ou senha incorretos",
-            headers={"WWW-Authenticate": "Bearer"},
-        )
+    user = await _autenticar(db, login_data.email, login_data.senha)
 
     # Cria o token de acesso
     access_token_expires = timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
@@ -80,20 +107,14 @@ def login(login_data: LoginRequest, db: Session = Depends(get_db)):
 
 
 @router.post("/token", response_model=Token)
-def login_for_access_token(
+async def login_for_access_token(
     form_data: OAuth2PasswordRequestForm = Depends(),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     OAuth2 compatible token login (usado pelo Swagger UI).
     """
-    user = authenticate_user(db, form_data.username, form_data.password)
-    if not user:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Email ou senha incorretos",
-            headers={"WWW-Authenticate": "Bearer"},
-        )
+    user = await _autenticar(db, form_data.username, form_data.password)
 
     access_token_expires = timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
     access_token = create_access_token(
@@ -105,18 +126,27 @@ def login_for_access_token(
 
 
 @router.get("/me", response_model=UsuarioResponse)
-def get_current_user_info(current_user: Usuario = Depends(get_current_user)):
+def get_current_user_info(
+    current_user: UsuarioAutenticado = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
     """
     Retorna informações do usuário atualmente logado.
     """
-    return current_user
+    user = db.query(Usuario).filter(Usuario.id == current_user.id).first()
+    if not user:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Usuário não encontrado"
+        )
+    return user
 
 
 @router.get("/users", response_model=List[UsuarioResponse])
 def list_users(
     skip: int = 0,
     limit: int = 100,
-    current_user: Usuario = Depends(get_current_admin_user),
+    current_user: UsuarioAutenticado = Depends(get_current_admin_user),
     db: Session = Depends(get_db)
 ):
     """
@@ -126,42 +156,56 @@ def list_users(
     return users
 
 
+async def _obter_usuario(db: AsyncSession, user_id: int) -> Usuario:
+    user = await db.get(Usuario, user_id)
+    if not user:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Usuário não encontrado"
+        )
+    return user
+
+
 @router.patch("/users/{user_id}", response_model=UsuarioResponse)
-def update_user(
+async def update_user(
     user_id: int,
     user_data: UsuarioUpdate,
-    current_user: Usuario = Depends(get_current_admin_user),
-    db: Session = Depends(get_db)
+    current_user: UsuarioAutenticado = Depends(get_current_admin_user),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Atualiza um usuário (apenas admin).
     """
-    user = db.query(Usuario).filter(Usuario.id == user_id).first()
-    if not user:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Usuário não encontrado"
-        )
-
-    # Atualiza apenas os campos fornecidos
-    if user_data.nome is not None:
-        user.nome = user_data.nome
+    # Usuário e email conferidos antes do bcrypt: id inexistente não gasta um hash
+    user = await _obter_usuario(db, user_id)
     if user_data.email is not None:
-        # Verifica se o novo email já existe
-        existing_user = get_user_by_email(db, user_data.email)
+        existing_user = (await db.execute(
+            select(Usuario.id).where(Usuario.email == user_data.email)
+        )).first()
         if existing_user and existing_user.id != user_id:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Email já cadastrado no sistema"
             )
-        user.email = user_data.email
+
     if user_data.senha is not None:
-        user.senha_hash = get_password_hash(user_data.senha)
+        await db.rollback()  # não segura a conexão durante o hash
+        novo_hash = await _gerar_hash(user_data.senha)
+        user = await _obter_usuario(db, user_id)
+        user.senha_hash = novo_hash
+    email_anterior = user.email
+
+    # Atualiza apenas os campos fornecidos
+    if user_data.nome is not None:
+        user.nome = user_data.nome
+    if user_data.email is not None:
+        user.email = user_data.email
     if user_data.ativo is not None:
         user.ativo = user_data.ativo
 
-    db.commit()
-    db.refresh(user)
+    await db.commit()
+    await db.refresh(user)
+    invalidar_usuario_cache(email_anterior, user.email)
 
     return user
 
@@ -169,7 +213,7 @@ def update_user(
 @router.delete("/users/{user_id}", status_code=status.HTTP_204_NO_CONTENT)
 def delete_user(
     user_id: int,
-    current_user: Usuario = Depends(get_current_admin_user),
+    current_user: UsuarioAutenticado = Depends(get_current_admin_user),
     db: Session = Depends(get_db)
 ):
     """
@@ -193,5 +237,6 @@ def delete_user(
     # Desativa o usuário ao invés de deletar
     user.ativo = False
     db.commit()
+    invalidar_usuario_cache(user.email)
 
     return None
@@ -1,7 +1,8 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, status, Response
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 from app.database import get_db
+from app.pagination import paginar
 from app.models.centro_custo import CentroCusto
 from app.schemas.centro_custo import CentroCustoCreate, CentroCustoUpdate, CentroCustoResponse
 
@@ -12,13 +13,15 @@ router = APIRouter(prefix="/centros-custo", tags=["Centros de Custo"])
 def listar_centros_custo(
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = None,
     ativo: bool = None,
+    response: Response = None,
     db: Session = Depends(get_db)
 ):
     query = db.query(CentroCusto)
     if ativo is not None:
         query = query.filter(CentroCusto.ativo == ativo)
-    centros = query.offset(skip).limit(limit).all()
+    centros = paginar(query, [CentroCusto.id], skip, limit, cursor, response)
     return centros
 
 
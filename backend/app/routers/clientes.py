@@ -1,7 +1,8 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, status, Response
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 from app.database import get_db
+from app.pagination import paginar
 from app.models.cliente import Cliente
 from app.schemas.cliente import ClienteCreate, ClienteUpdate, ClienteResponse
 
@@ -12,13 +13,15 @@ router = APIRouter(prefix="/clientes", tags=["Clientes"])
 def listar_clientes(
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = None,
     ativo: bool = None,
+    response: Response = None,
     db: Session = Depends(get_db)
 ):
     query = db.query(Cliente)
     if ativo is not None:
         query = query.filter(Cliente.ativo == ativo)
-    clientes = query.offset(skip).limit(limit).all()
+    clientes = paginar(query, [Cliente.id], skip, limit, cursor, response)
     return clientes
 
 
@@ -1,11 +1,28 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Response
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from sqlalchemy import and_, or_
 from typing import List, Optional
 from datetime import date, datetime, timedelta
-from app.database import get_db
+from app.database import get_db, get_async_db
+from app.pagination import paginar
 from app.models.conta_pagar import ContaPagar, StatusContaPagar
-from app.schemas.conta_pagar import ContaPagarCreate, ContaPagarUpdate, ContaPagarResponse
+from app.schemas.conta_pagar import (
+    ContaPagarCreate,
+    ContaPagarUpdate,
+    ContaPagarResponse,
+    ContaPagarParceladoCreate,
+)
+from app.services.fluxo_caixa import invalidar_projecao_fluxo_caixa
+from app.services.resumo_contas import calcular_resumo
+from app.services.status_contas import filtro_status_efetivo, com_status_efetivo
+from app.services.geracao_contas import gerar_parcelas, iniciar_recorrencia, materializar_recorrentes
+
+# Colunas de agrupamento do resumo (a primeira não nula vira a chave do grupo)
+AGRUPAMENTOS_RESUMO = {
+    "categoria": [ContaPagar.categoria],
+    "fornecedor": [ContaPagar.fornecedor_nome, ContaPagar.fornecedor_id],
+}
 
 router = APIRouter(prefix="/contas-pagar", tags=["Contas a Pagar"])
 
@@ -14,20 +31,22 @@ router = APIRouter(prefix="/contas-pagar", tags=["Contas a Pagar"])
 def listar_contas_pagar(
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = None,
     status_filter: Optional[StatusContaPagar] = None,
     data_inicio: Optional[date] = None,
     data_fim: Optional[date] = None,
     categoria: Optional[str] = None,
     fornecedor_id: Optional[int] = None,
     vencidas: Optional[bool] = None,  # True = só vencidas, False = só não vencidas
+    response: Response = None,
     db: Session = Depends(get_db)
 ):
     """Lista contas a pagar com filtros"""
     query = db.query(ContaPagar)
 
-    # Filtro por status
+    # Filtro por status (efetivo: pendente vencida conta como VENCIDO)
     if status_filter:
-        query = query.filter(ContaPagar.status == status_filter)
+        query = query.filter(filtro_status_efetivo(ContaPagar, status_filter))
 
     # Filtro por período de vencimento
     if data_inicio:
@@ -62,16 +81,13 @@ def listar_contas_pagar(
             )
 
     # Ordenar por data de vencimento
-    contas = query.order_by(ContaPagar.data_vencimento.asc()).offset(skip).limit(limit).all()
+    contas = paginar(
+        query, [ContaPagar.data_vencimento, ContaPagar.id], skip, limit, cursor, response
+    )
 
-    # Atualizar status de contas vencidas automaticamente
+    # Status exibido é o efetivo; a gravação é feita pelo job diário
     hoje = date.today()
-    for conta in contas:
-        if conta.status == StatusContaPagar.A_VENCER and conta.data_vencimento < hoje:
-            conta.status = StatusContaPagar.VENCIDO
-    db.commit()
-
-    return contas
+    return [com_status_efetivo(conta, ContaPagarResponse, hoje) for conta in contas]
 
 
 @router.get("/proximos-vencimentos", response_model=List[ContaPagarResponse])
@@ -95,60 +111,23 @@ def proximos_vencimentos(
 
 
 @router.get("/resumo", response_model=dict)
-def resumo_contas_pagar(db: Session = Depends(get_db)):
-    """Retorna resumo das contas a pagar (hoje, semana, mês)"""
-    hoje = date.today()
-    fim_semana = hoje + timedelta(days=7)
-    fim_mes = hoje + timedelta(days=30)
-
-    # Contas a pagar hoje
-    hoje_query = db.query(ContaPagar).filter(
-        and_(
-            ContaPagar.status != StatusContaPagar.PAGO,
-            ContaPagar.data_vencimento == hoje
-        )
-    )
-    total_hoje = sum(float(c.valor) for c in hoje_query.all())
-    qtd_hoje = hoje_query.count()
-
-    # Contas a pagar esta semana
-    semana_query = db.query(ContaPagar).filter(
-        and_(
-            ContaPagar.status != StatusContaPagar.PAGO,
-            ContaPagar.data_vencimento >= hoje,
-            ContaPagar.data_vencimento <= fim_semana
-        )
-    )
-    total_semana = sum(float(c.valor) for c in semana_query.all())
-    qtd_semana = semana_query.count()
-
-    # Contas a pagar este mês
-    mes_query = db.query(ContaPagar).filter(
-        and_(
-            ContaPagar.status != StatusContaPagar.PAGO,
-            ContaPagar.data_vencimento >= hoje,
-            ContaPagar.data_vencimento <= fim_mes
-        )
-    )
-    total_mes = sum(float(c.valor) for c in mes_query.all())
-    qtd_mes = mes_query.count()
-
-    # Contas vencidas
-    vencidas_query = db.query(ContaPagar).filter(
-        and_(
-            ContaPagar.status != StatusContaPagar.PAGO,
-            ContaPagar.data_vencimento < hoje
-        )
+async def resumo_contas_pagar(
+    agrupar_por: Optional[str] = Query(None, pattern="^(categoria|fornecedor)$"),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Retorna resumo das contas a pagar (hoje, semana, mês, vencidas)
+
+    Uma única query agregada; com agrupar_por inclui "grupos" com as
+    mesmas faixas por categoria ou fornecedor.
+    """
+    return await db.run_sync(
+        calcular_resumo,
+        ContaPagar,
+        StatusContaPagar.PAGO,
+        "vencidas",
+        AGRUPAMENTOS_RESUMO[agrupar_por] if agrupar_por else None,
     )
-    total_vencidas = sum(float(c.valor) for c in vencidas_query.all())
-    qtd_vencidas = vencidas_query.count()
-
-    return {
-        "hoje": {"total": total_hoje, "quantidade": qtd_hoje},
-        "semana": {"total": total_semana, "quantidade": qtd_semana},
-        "mes": {"total": total_mes, "quantidade": qtd_mes},
-        "vencidas": {"total": total_vencidas, "quantidade": qtd_vencidas},
-    }
 
 
 @router.get("/{conta_id}", response_model=ContaPagarResponse)
@@ -157,19 +136,44 @@ def buscar_conta_pagar(conta_id: int, db: Session = Depends(get_db)):
     conta = db.query(ContaPagar).filter(ContaPagar.id == conta_id).first()
     if not conta:
         raise HTTPException(status_code=404, detail="Conta a pagar não encontrada")
-    return conta
+    return com_status_efetivo(conta, ContaPagarResponse)
 
 
 @router.post("/", response_model=ContaPagarResponse, status_code=status.HTTP_201_CREATED)
 def criar_conta_pagar(conta: ContaPagarCreate, db: Session = Depends(get_db)):
-    """Cria uma nova conta a pagar"""
+    """
+    Cria uma nova conta a pagar
+
+    Se recorrente, já gera as próximas contas da série até o horizonte.
+    """
     nova_conta = ContaPagar(**conta.model_dump())
+    if nova_conta.recorrente:
+        iniciar_recorrencia(nova_conta)
     db.add(nova_conta)
+    db.flush()
+    if nova_conta.recorrente:
+        materializar_recorrentes(db, ContaPagar, grupo=nova_conta.grupo_parcelamento)
     db.commit()
+    invalidar_projecao_fluxo_caixa()
     db.refresh(nova_conta)
     return nova_conta
 
 
+@router.post("/parcelado", response_model=List[ContaPagarResponse], status_code=status.HTTP_201_CREATED)
+def criar_conta_pagar_parcelado(conta: ContaPagarParceladoCreate, db: Session = Depends(get_db)):
+    """
+    Cria uma compra parcelada: divide o valor total em N contas mensais
+
+    Todas as parcelas são gravadas com um único INSERT no mesmo
+    grupo_parcelamento; centavos da divisão vão para as primeiras parcelas.
+    """
+    dados = conta.model_dump(exclude={"parcelas", "intervalo_meses"})
+    parcelas = gerar_parcelas(db, ContaPagar, dados, conta.parcelas, conta.intervalo_meses)
+    db.commit()
+    invalidar_projecao_fluxo_caixa()
+    return parcelas
+
+
 @router.put("/{conta_id}", response_model=ContaPagarResponse)
 def atualizar_conta_pagar(
     conta_id: int,
@@ -186,6 +190,7 @@ def atualizar_conta_pagar(
         setattr(db_conta, field, value)
 
     db.commit()
+    invalidar_projecao_fluxo_caixa()
     db.refresh(db_conta)
     return db_conta
 
@@ -205,6 +210,7 @@ def marcar_como_pago(
     db_conta.data_pagamento = data_pagamento or date.today()
 
     db.commit()
+    invalidar_projecao_fluxo_caixa()
     db.refresh(db_conta)
     return db_conta
 
@@ -218,4 +224,5 @@ def deletar_conta_pagar(conta_id: int, db: Session = Depends(get_db)):
 
     db.delete(db_conta)
     db.commit()
+    invalidar_projecao_fluxo_caixa()
     return None
@@ -1,11 +1,28 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Response
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from sqlalchemy import and_, or_
 from typing import List, Optional
 from datetime import date, datetime, timedelta
-from app.database import get_db
+from app.database import get_db, get_async_db
+from app.pagination import paginar
 from app.models.conta_receber import ContaReceber, StatusContaReceber
-from app.schemas.conta_receber import ContaReceberCreate, ContaReceberUpdate, ContaReceberResponse
+from app.schemas.conta_receber import (
+    ContaReceberCreate,
+    ContaReceberUpdate,
+    ContaReceberResponse,
+    ContaReceberParceladoCreate,
+)
+from app.services.fluxo_caixa import invalidar_projecao_fluxo_caixa
+from app.services.resumo_contas import calcular_resumo
+from app.services.status_contas import filtro_status_efetivo, com_status_efetivo
+from app.services.geracao_contas import gerar_parcelas, iniciar_recorrencia, materializar_recorrentes
+
+# Colunas de agrupamento do resumo (a primeira não nula vira a chave do grupo)
+AGRUPAMENTOS_RESUMO = {
+    "categoria": [ContaReceber.categoria],
+    "cliente": [ContaReceber.cliente_nome, ContaReceber.cliente_id],
+}
 
 router = APIRouter(prefix="/contas-receber", tags=["Contas a Receber"])
 
@@ -14,20 +31,22 @@ router = APIRouter(prefix="/contas-receber", tags=["Contas a Receber"])
 def listar_contas_receber(
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = None,
     status_filter: Optional[StatusContaReceber] = None,
     data_inicio: Optional[date] = None,
     data_fim: Optional[date] = None,
     categoria: Optional[str] = None,
     cliente_id: Optional[int] = None,
     atrasadas: Optional[bool] = None,  # True = só atrasadas, False = só em dia
+    response: Response = None,
     db: Session = Depends(get_db)
 ):
     """Lista contas a receber com filtros"""
     query = db.query(ContaReceber)
 
-    # Filtro por status
+    # Filtro por status (efetivo: pendente vencida conta como ATRASADO)
     if status_filter:
-        query = query.filter(ContaReceber.status == status_filter)
+        query = query.filter(filtro_status_efetivo(ContaReceber, status_filter))
 
     # Filtro por período de vencimento
     if data_inicio:
@@ -62,16 +81,13 @@ def listar_contas_receber(
             )
 
     # Ordenar por data de vencimento
-    contas = query.order_by(ContaReceber.data_vencimento.asc()).offset(skip).limit(limit).all()
+    contas = paginar(
+        query, [ContaReceber.data_vencimento, ContaReceber.id], skip, limit, cursor, response
+    )
 
-    # Atualizar status de contas atrasadas automaticamente
+    # Status exibido é o efetivo; a gravação é feita pelo job diário
     hoje = date.today()
-    for conta in contas:
-        if conta.status == StatusContaReceber.A_RECEBER and conta.data_vencimento < hoje:
-            conta.status = StatusContaReceber.ATRASADO
-    db.commit()
-
-    return contas
+    return [com_status_efetivo(conta, ContaReceberResponse, hoje) for conta in contas]
 
 
 @router.get("/proximos-recebimentos", response_model=List[ContaReceberResponse])
@@ -95,60 +111,23 @@ def proximos_recebimentos(
 
 
 @router.get("/resumo", response_model=dict)
-def resumo_contas_receber(db: Session = Depends(get_db)):
-    """Retorna resumo das contas a receber (hoje, semana, mês)"""
-    hoje = date.today()
-    fim_semana = hoje + timedelta(days=7)
-    fim_mes = hoje + timedelta(days=30)
-
-    # Contas a receber hoje
-    hoje_query = db.query(ContaReceber).filter(
-        and_(
-            ContaReceber.status != StatusContaReceber.RECEBIDO,
-            ContaReceber.data_vencimento == hoje
-        )
-    )
-    total_hoje = sum(float(c.valor) for c in hoje_query.all())
-    qtd_hoje = hoje_query.count()
-
-    # Contas a receber esta semana
-    semana_query = db.query(ContaReceber).filter(
-        and_(
-            ContaReceber.status != StatusContaReceber.RECEBIDO,
-            ContaReceber.data_vencimento >= hoje,
-            ContaReceber.data_vencimento <= fim_semana
-        )
-    )
-    total_semana = sum(float(c.valor) for c in semana_query.all())
-    qtd_semana = semana_query.count()
-
-    # Contas a receber este mês
-    mes_query = db.query(ContaReceber).filter(
-        and_(
-            ContaReceber.status != StatusContaReceber.RECEBIDO,
-            ContaReceber.data_vencimento >= hoje,
-            ContaReceber.data_vencimento <= fim_mes
-        )
-    )
-    total_mes = sum(float(c.valor) for c in mes_query.all())
-    qtd_mes = mes_query.count()
-
-    # Contas atrasadas
-    atrasadas_query = db.query(ContaReceber).filter(
-        and_(
-            ContaReceber.status != StatusContaReceber.RECEBIDO,
-            ContaReceber.data_vencimento < hoje
-        )
+async def resumo_contas_receber(
+    agrupar_por: Optional[str] = Query(None, pattern="^(categoria|cliente)$"),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Retorna resumo das contas a receber (hoje, semana, mês, atrasadas)
+
+    Uma única query agregada; com agrupar_por inclui "grupos" com as
+    mesmas faixas por categoria ou cliente.
+    """
+    return await db.run_sync(
+        calcular_resumo,
+        ContaReceber,
+        StatusContaReceber.RECEBIDO,
+        "atrasadas",
+        AGRUPAMENTOS_RESUMO[agrupar_por] if agrupar_por else None,
     )
-    total_atrasadas = sum(float(c.valor) for c in atrasadas_query.all())
-    qtd_atrasadas = atrasadas_query.count()
-
-    return {
-        "hoje": {"total": total_hoje, "quantidade": qtd_hoje},
-        "semana": {"total": total_semana, "quantidade": qtd_semana},
-        "mes": {"total": total_mes, "quantidade": qtd_mes},
-        "atrasadas": {"total": total_atrasadas, "quantidade": qtd_atrasadas},
-    }
 
 
 @router.get("/{conta_id}", response_model=ContaReceberResponse)
@@ -157,19 +136,44 @@ def buscar_conta_receber(conta_id: int, db: Session = Depends(get_db)):
     conta = db.query(ContaReceber).filter(ContaReceber.id == conta_id).first()
     if not conta:
         raise HTTPException(status_code=404, detail="Conta a receber não encontrada")
-    return conta
+    return com_status_efetivo(conta, ContaReceberResponse)
 
 
 @router.post("/", response_model=ContaReceberResponse, status_code=status.HTTP_201_CREATED)
 def criar_conta_receber(conta: ContaReceberCreate, db: Session = Depends(get_db)):
-    """Cria uma nova conta a receber"""
+    """
+    Cria uma nova conta a receber
+
+    Se recorrente, já gera as próximas contas da série até o horizonte.
+    """
     nova_conta = ContaReceber(**conta.model_dump())
+    if nova_conta.recorrente:
+        iniciar_recorrencia(nova_conta)
     db.add(nova_conta)
+    db.flush()
+    if nova_conta.recorrente:
+        materializar_recorrentes(db, ContaReceber, grupo=nova_conta.grupo_parcelamento)
     db.commit()
+    invalidar_projecao_fluxo_caixa()
     db.refresh(nova_conta)
     return nova_conta
 
 
+@router.post("/parcelado", response_model=List[ContaReceberResponse], status_code=status.HTTP_201_CREATED)
+def criar_conta_receber_parcelado(conta: ContaReceberParceladoCreate, db: Session = Depends(get_db)):
+    """
+    Cria uma venda parcelada: divide o valor total em N contas mensais
+
+    Todas as parcelas são gravadas com um único INSERT no mesmo
+    grupo_parcelamento; centavos da divisão vão para as primeiras parcelas.
+    """
+    dados = conta.model_dump(exclude={"parcelas", "intervalo_meses"})
+    parcelas = gerar_parcelas(db, ContaReceber, dados, conta.parcelas, conta.intervalo_meses)
+    db.commit()
+    invalidar_projecao_fluxo_caixa()
+    return parcelas
+
+
 @router.put("/{conta_id}", response_model=ContaReceberResponse)
 def atualizar_conta_receber(
     conta_id: int,
@@ -186,6 +190,7 @@ def atualizar_conta_receber(
         setattr(db_conta, field, value)
 
     db.commit()
+    invalidar_projecao_fluxo_caixa()
     db.refresh(db_conta)
     return db_conta
 
@@ -205,6 +210,7 @@ def marcar_como_recebido(
     db_conta.data_recebimento = data_recebimento or date.today()
 
     db.commit()
+    invalidar_projecao_fluxo_caixa()
     db.refresh(db_conta)
     return db_conta
 
@@ -218,4 +224,5 @@ def deletar_conta_receber(conta_id: int, db: Session = Depends(get_db)):
 
     db.delete(db_conta)
     db.commit()
+    invalidar_projecao_fluxo_caixa()
     return None
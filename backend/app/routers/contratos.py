@@ -1,9 +1,15 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status, Response
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
+from app.auth import get_current_admin_user
+from app.cache_usuarios import UsuarioAutenticado
 from app.database import get_db
+from app.pagination import paginar
 from app.models.contrato_locacao import ContratoLocacao
 from app.schemas.contrato_locacao import ContratoLocacaoCreate, ContratoLocacaoUpdate, ContratoLocacaoResponse
+from app.services.custos_equipamentos import invalidar_custos_equipamentos
+from app.services.faturamento_contratos import DIA_VENCIMENTO_PADRAO, faturar_competencia
+from app.services.fluxo_caixa import invalidar_projecao_fluxo_caixa
 
 router = APIRouter(prefix="/contratos", tags=["Contratos de Locação"])
 
@@ -12,16 +18,47 @@ router = APIRouter(prefix="/contratos", tags=["Contratos de Locação"])
 def listar_contratos(
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = None,
     status_filtro: str = None,
+    response: Response = None,
     db: Session = Depends(get_db)
 ):
     query = db.query(ContratoLocacao)
     if status_filtro:
         query = query.filter(ContratoLocacao.status == status_filtro)
-    contratos = query.offset(skip).limit(limit).all()
+    contratos = paginar(query, [ContratoLocacao.id], skip, limit, cursor, response)
     return contratos
 
 
+@router.post("/faturamento", response_model=dict)
+def faturar_contratos(
+    competencia: str = Query(..., description="AAAA-MM"),
+    dia_vencimento: int = Query(DIA_VENCIMENTO_PADRAO, ge=1, le=31),
+    historico_id: Optional[int] = None,
+    conta_debito_id: Optional[int] = None,
+    conta_credito_id: Optional[int] = None,
+    centro_custo_id: Optional[int] = None,
+    current_user: UsuarioAutenticado = Depends(get_current_admin_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Gera as contas a receber da competência para os contratos ativos (apenas admin).
+
+    Idempotente por contrato e competência. Com historico_id, conta_debito_id
+    (clientes) e conta_credito_id (receita), cada conta nova ganha seu lançamento.
+    """
+    try:
+        resultado = faturar_competencia(
+            db, competencia, dia_vencimento, historico_id, conta_debito_id, conta_credito_id,
+            centro_custo_id, current_user.id,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    db.commit()
+    invalidar_projecao_fluxo_caixa()
+    return resultado
+
+
 @router.get("/{contrato_id}", response_model=ContratoLocacaoResponse)
 def buscar_contrato(contrato_id: int, db: Session = Depends(get_db)):
     contrato = db.query(ContratoLocacao).filter(ContratoLocacao.id == contrato_id).first()
@@ -41,6 +78,7 @@ def criar_contrato(contrato: ContratoLocacaoCreate, db: Session = Depends(get_db
     novo_contrato = ContratoLocacao(**contrato.model_dump())
     db.add(novo_contrato)
     db.commit()
+    invalidar_custos_equipamentos()
     db.refresh(novo_contrato)
     return novo_contrato
 
@@ -60,6 +98,7 @@ def atualizar_contrato(
         setattr(db_contrato, field, value)
 
     db.commit()
+    invalidar_custos_equipamentos()
     db.refresh(db_contrato)
     return db_contrato
 
@@ -72,4 +111,5 @@ def deletar_contrato(contrato_id: int, db: Session = Depends(get_db)):
 
     db.delete(db_contrato)
     db.commit()
+    invalidar_custos_equipamentos()
     return None
@@ -1,9 +1,12 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status, Response
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
+from datetime import date
 from app.database import get_db
+from app.pagination import paginar
 from app.models.equipamento import Equipamento
 from app.schemas.equipamento import EquipamentoCreate, EquipamentoUpdate, EquipamentoResponse
+from app.services.custos_equipamentos import calcular_custos
 
 router = APIRouter(prefix="/equipamentos", tags=["Equipamentos"])
 
@@ -12,16 +15,38 @@ router = APIRouter(prefix="/equipamentos", tags=["Equipamentos"])
 def listar_equipamentos(
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = None,
     ativo: bool = None,
+    response: Response = None,
     db: Session = Depends(get_db)
 ):
     query = db.query(Equipamento)
     if ativo is not None:
         query = query.filter(Equipamento.ativo == ativo)
-    equipamentos = query.offset(skip).limit(limit).all()
+    equipamentos = paginar(query, [Equipamento.id], skip, limit, cursor, response)
     return equipamentos
 
 
+@router.get("/custos", response_model=dict)
+def custos_equipamentos(
+    periodo: str = Query(None, pattern=r"^\d{4}(-\d{2})?$", description="AAAA ou AAAA-MM (padrão: mês atual)"),
+    por_mes: bool = False,
+    db: Session = Depends(get_db)
+):
+    """
+    Custos e receita por equipamento no período
+
+    Combustível, manutenção, km rodado, custo/km, litros/100km e receita de
+    locação de cada equipamento. Com por_mes=true, uma linha por equipamento
+    e mês do período.
+    """
+    periodo = periodo or date.today().strftime("%Y-%m")
+    try:
+        return calcular_custos(db, periodo, por_mes)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
 @router.get("/{equipamento_id}", response_model=EquipamentoResponse)
 def buscar_equipamento(equipamento_id: int, db: Session = Depends(get_db)):
     equipamento = db.query(Equipamento).filter(Equipamento.id == equipamento_id).first()
@@ -43,7 +68,8 @@ def criar_equipamento(equipamento: EquipamentoCreate, db: Session = Depends(get_
         if db_placa:
             raise HTTPException(status_code=400, detail="Placa já cadastrada")
 
-    novo_equipamento = Equipamento(**equipamento.model_dump())
+    # hodometro_inicial é a semente; viagens e abastecimentos atualizam o atual
+    novo_equipamento = Equipamento(**equipamento.model_dump(), hodometro_atual=equipamento.hodometro_inicial)
     db.add(novo_equipamento)
     db.commit()
     db.refresh(novo_equipamento)
@@ -0,0 +1,23 @@
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database import get_async_db
+from app.services.fluxo_caixa import calcular_projecao
+
+router = APIRouter(prefix="/fluxo-caixa", tags=["Fluxo de Caixa"])
+
+
+@router.get("/projecao", response_model=dict)
+async def projecao_fluxo_caixa(
+    horizonte_dias: int = Query(90, ge=1, le=730),
+    granularidade: str = Query("dia", pattern="^(dia|semana|mes)$"),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Projeta o saldo de caixa a partir do saldo de Caixa e Bancos (1.1.1)
+
+    Soma as contas a receber e subtrai as contas a pagar em aberto até o
+    horizonte; vencidas são consideradas para hoje. Cada período traz as
+    entradas, saídas e o saldo projetado ao fim do período.
+    """
+    return await db.run_sync(calcular_projecao, horizonte_dias, granularidade)
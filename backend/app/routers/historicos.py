@@ -1,7 +1,8 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, status, Response
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 from app.database import get_db
+from app.pagination import paginar
 from app.models.historico import Historico
 from app.schemas.historico import HistoricoCreate, HistoricoUpdate, HistoricoResponse
 
@@ -12,13 +13,15 @@ router = APIRouter(prefix="/historicos", tags=["Históricos Padrão"])
 def listar_historicos(
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = None,
     ativo: bool = None,
+    response: Response = None,
     db: Session = Depends(get_db)
 ):
     query = db.query(Historico)
     if ativo is not None:
         query = query.filter(Historico.ativo == ativo)
-    historicos = query.offset(skip).limit(limit).all()
+    historicos = paginar(query, [Historico.id], skip, limit, cursor, response)
     return historicos
 
 
@@ -0,0 +1,78 @@
+import os
+import shutil
+import tempfile
+from typing import List
+
+from fastapi import APIRouter, Depends, File, HTTPException, UploadFile, status
+from sqlalchemy.orm import Session
+
+from app.auth import get_current_admin_user
+from app.cache_usuarios import UsuarioAutenticado
+from app.config import settings
+from app.database import get_db
+from app.services.fluxo_caixa import invalidar_projecao_fluxo_caixa
+from app.services.import_lancamentos_xtdc import ImportadorLancamentosXTDC
+from app.services.pipeline_xtdc import importar_balancetes
+
+router = APIRouter(prefix="/importacao", tags=["Importação"])
+
+
+@router.post("/xtdc/balancetes", response_model=dict)
+def importar_balancetes_xtdc(
+    arquivos: List[UploadFile] = File(...),
+    current_user: UsuarioAutenticado = Depends(get_current_admin_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Importa o plano de contas de vários balancetes XTDC (.LST) (apenas admin).
+
+    Os arquivos são lidos em paralelo, mesclados (o último arquivo enviado
+    prevalece para códigos repetidos) e gravados de uma vez. Retorna contas
+    e tempo de leitura por arquivo e o tempo de cada etapa.
+    """
+    if not arquivos:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Nenhum arquivo enviado")
+
+    with tempfile.TemporaryDirectory(prefix="xtdc_") as pasta:
+        caminhos = []
+        for indice, arquivo in enumerate(arquivos):
+            nome = os.path.basename(arquivo.filename or "") or "balancete.LST"
+            # Prefixo mantém a ordem de envio e evita colisão de nomes repetidos
+            caminho = os.path.join(pasta, f"{indice:04d}_{nome}")
+            with open(caminho, "wb") as destino:
+                shutil.copyfileobj(arquivo.file, destino)
+            caminhos.append(caminho)
+
+        relatorio = importar_balancetes(db, caminhos, workers=settings.IMPORTACAO_XTDC_WORKERS)
+
+    for item, arquivo in zip(relatorio["arquivos"], arquivos):
+        item["arquivo"] = arquivo.filename
+    return relatorio
+
+
+@router.post("/xtdc/lancamentos", response_model=dict)
+def importar_lancamentos_xtdc(
+    partidas: UploadFile = File(..., description="XTDC019.DAT"),
+    plano: UploadFile = File(..., description="XTDC035.DAT"),
+    current_user: UsuarioAutenticado = Depends(get_current_admin_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Importa os lançamentos do razão XTDC (apenas admin).
+
+    Recebe as partidas (XTDC019.DAT) e o plano de contas (XTDC035.DAT); as
+    contas precisam estar cadastradas com a mesma classificação. Lançamentos
+    já importados são ignorados, então o mesmo arquivo pode ser reenviado.
+    """
+    with tempfile.TemporaryDirectory(prefix="xtdc_") as pasta:
+        caminhos = []
+        for arquivo in (partidas, plano):
+            caminho = os.path.join(pasta, f"{len(caminhos)}.DAT")
+            with open(caminho, "wb") as destino:
+                shutil.copyfileobj(arquivo.file, destino)
+            caminhos.append(caminho)
+
+        relatorio = ImportadorLancamentosXTDC(db, usuario_id=current_user.id).importar(*caminhos)
+
+    invalidar_projecao_fluxo_caixa()
+    return relatorio
@@ -1,39 +1,81 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from typing import List
+from fastapi import APIRouter, Depends, HTTPException, status, Response, Request, Query
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, selectinload
+from typing import AsyncIterator, List, Optional
 from datetime import date
-from app.database import get_db
+import json
+from app.database import get_db, get_async_db
+from app.pagination import paginar_async
 from app.models.lancamento import Lancamento
 from app.models.partida import Partida
-from app.schemas.lancamento import LancamentoCreate, LancamentoResponse
+from app.schemas.lancamento import LancamentoCreate, LancamentoResponse, LancamentoLoteResponse
+from app.services.fluxo_caixa import invalidar_projecao_fluxo_caixa
+from app.services.saldos_mensais import aplicar_partidas
+from app.services.lancamentos_lote import TAMANHO_BLOCO, importar_bloco, importar_lancamentos, novo_resultado
+from app.services.exportacao_razao import gerar_exportacao
 
 router = APIRouter(prefix="/lancamentos", tags=["Lançamentos Contábeis"])
 
 
 @router.get("/", response_model=List[LancamentoResponse])
-def listar_lancamentos(
+async def listar_lancamentos(
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = None,
     data_inicio: date = None,
     data_fim: date = None,
     numero_lote: str = None,
-    db: Session = Depends(get_db)
+    response: Response = None,
+    db: AsyncSession = Depends(get_async_db)
 ):
-    query = db.query(Lancamento)
+    # Partidas da página inteira em uma única query adicional (evita N+1)
+    query = select(Lancamento).options(selectinload(Lancamento.partidas))
     if data_inicio:
-        query = query.filter(Lancamento.data_lancamento >= data_inicio)
+        query = query.where(Lancamento.data_lancamento >= data_inicio)
     if data_fim:
-        query = query.filter(Lancamento.data_lancamento <= data_fim)
+        query = query.where(Lancamento.data_lancamento <= data_fim)
     if numero_lote:
-        query = query.filter(Lancamento.numero_lote == numero_lote)
+        query = query.where(Lancamento.numero_lote == numero_lote)
 
-    lancamentos = query.order_by(Lancamento.data_lancamento.desc()).offset(skip).limit(limit).all()
+    lancamentos = await paginar_async(
+        db, query, [Lancamento.data_lancamento, Lancamento.id], skip, limit, cursor, response, descendente=True
+    )
     return lancamentos
 
 
+@router.get("/export")
+def exportar_lancamentos(
+    formato: str = Query("csv", alias="format", pattern="^(csv|ndjson)$"),
+    data_inicio: Optional[date] = None,
+    data_fim: Optional[date] = None,
+    db: Session = Depends(get_db)
+):
+    """
+    Exporta o razão (uma linha por partida) em CSV ou NDJSON via streaming.
+
+    As linhas são lidas com cursor no servidor em blocos, então o consumo de
+    memória não depende do tamanho do período exportado.
+    """
+    media_types = {"csv": "text/csv; charset=utf-8", "ndjson": "application/x-ndjson"}
+    nome_arquivo = f"razao_{data_inicio or 'inicio'}_{data_fim or 'fim'}.{formato}"
+    return StreamingResponse(
+        gerar_exportacao(db.get_bind(), formato, data_inicio, data_fim),
+        media_type=media_types[formato],
+        headers={"Content-Disposition": f'attachment; filename="{nome_arquivo}"'}
+    )
+
+
 @router.get("/{lancamento_id}", response_model=LancamentoResponse)
-def buscar_lancamento(lancamento_id: int, db: Session = Depends(get_db)):
-    lancamento = db.query(Lancamento).filter(Lancamento.id == lancamento_id).first()
+async def buscar_lancamento(lancamento_id: int, db: AsyncSession = Depends(get_async_db)):
+    resultado = await db.execute(
+        select(Lancamento).options(
+            selectinload(Lancamento.partidas)
+        ).where(Lancamento.id == lancamento_id)
+    )
+    lancamento = resultado.scalars().first()
     if not lancamento:
         raise HTTPException(status_code=404, detail="Lançamento não encontrado")
     return lancamento
@@ -70,11 +112,74 @@ def criar_lancamento(lancamento: LancamentoCreate, db: Session = Depends(get_db)
         )
         db.add(partida)
 
+    # Atualizar saldos mensais na mesma transação
+    aplicar_partidas(db, novo_lancamento.data_lancamento, lancamento.partidas)
+
     db.commit()
+    invalidar_projecao_fluxo_caixa()
     db.refresh(novo_lancamento)
     return novo_lancamento
 
 
+async def ler_linhas_ndjson(request: Request) -> AsyncIterator[bytes]:
+    """Linhas não vazias do corpo NDJSON, lidas do stream sem bufferizar o corpo inteiro"""
+    pendente = b""
+    async for pedaco in request.stream():
+        pendente += pedaco
+        *linhas, pendente = pendente.split(b"\n")
+        for linha in linhas:
+            if linha.strip():
+                yield linha
+    if pendente.strip():
+        yield pendente
+
+
+def item_ndjson(linha: bytes):
+    """Payload da linha; linha inválida vira Exception para ser reportada como erro do item"""
+    try:
+        return json.loads(linha)
+    except ValueError as e:  # JSONDecodeError e UnicodeDecodeError
+        return e
+
+
+async def ler_array_json(request: Request) -> list:
+    """Lê o corpo como array JSON (para lotes grandes, prefira NDJSON)"""
+    try:
+        itens = json.loads(await request.body())
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Corpo inválido: esperado array JSON ou NDJSON")
+    if not isinstance(itens, list):
+        raise HTTPException(status_code=400, detail="Corpo inválido: esperado array JSON ou NDJSON")
+    return itens
+
+
+@router.post("/bulk", response_model=LancamentoLoteResponse)
+async def criar_lancamentos_lote(request: Request, db: Session = Depends(get_db)):
+    """
+    Cria vários lançamentos de uma vez (array JSON ou application/x-ndjson).
+
+    Cada item é validado individualmente; os válidos são gravados em blocos
+    com INSERT multi-linha e os inválidos voltam em "erros" com seu índice.
+    NDJSON é lido do stream e gravado a cada TAMANHO_BLOCO linhas, sem
+    carregar o arquivo inteiro em memória.
+    """
+    if "ndjson" in request.headers.get("content-type", ""):
+        resultado = novo_resultado()
+        bloco = []
+        async for linha in ler_linhas_ndjson(request):
+            bloco.append(item_ndjson(linha))
+            if len(bloco) == TAMANHO_BLOCO:
+                await run_in_threadpool(importar_bloco, db, bloco, resultado)
+                bloco = []
+        if bloco:
+            await run_in_threadpool(importar_bloco, db, bloco, resultado)
+    else:
+        itens = await ler_array_json(request)
+        resultado = await run_in_threadpool(importar_lancamentos, db, itens)
+    invalidar_projecao_fluxo_caixa()
+    return resultado
+
+
 @router.put("/{lancamento_id}", response_model=LancamentoResponse)
 def atualizar_lancamento(lancamento_id: int, lancamento: LancamentoCreate, db: Session = Depends(get_db)):
     from decimal import Decimal
@@ -95,6 +200,9 @@ def atualizar_lancamento(lancamento_id: int, lancamento: LancamentoCreate, db: S
             detail=f"Partidas dobradas inválidas: débitos ({debitos}) != créditos ({creditos})"
         )
 
+    # Estornar as partidas antigas dos saldos mensais
+    aplicar_partidas(db, db_lancamento.data_lancamento, db_lancamento.partidas, sinal=-1)
+
     # Atualizar dados do lançamento
     for key, value in lancamento.model_dump(exclude={'partidas'}).items():
         setattr(db_lancamento, key, value)
@@ -110,7 +218,10 @@ def atualizar_lancamento(lancamento_id: int, lancamento: LancamentoCreate, db: S
         )
         db.add(partida)
 
+    aplicar_partidas(db, db_lancamento.data_lancamento, lancamento.partidas)
+
     db.commit()
+    invalidar_projecao_fluxo_caixa()
     db.refresh(db_lancamento)
     return db_lancamento
 
@@ -121,7 +232,10 @@ def deletar_lancamento(lancamento_id: int, db: Session = Depends(get_db)):
     if not db_lancamento:
         raise HTTPException(status_code=404, detail="Lançamento não encontrado")
 
+    aplicar_partidas(db, db_lancamento.data_lancamento, db_lancamento.partidas, sinal=-1)
+
     # As partidas serão deletadas automaticamente por causa do cascade
     db.delete(db_lancamento)
     db.commit()
+    invalidar_projecao_fluxo_caixa()
     return None
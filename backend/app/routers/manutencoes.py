@@ -1,10 +1,17 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 from datetime import date
 from app.database import get_db
 from app.models.manutencao import Manutencao
-from app.schemas.manutencao import ManutencaoCreate, ManutencaoUpdate, ManutencaoResponse
+from app.models.plano_manutencao import PlanoManutencao
+from app.schemas.manutencao import (
+    ManutencaoCreate, ManutencaoUpdate, ManutencaoResponse,
+    PlanoManutencaoCreate, PlanoManutencaoUpdate, PlanoManutencaoResponse,
+    PreventivasPendentesResponse,
+)
+from app.services.custos_equipamentos import invalidar_custos_equipamentos
+from app.services.manutencao_preventiva import agendar_preventivas, listar_pendentes
 
 router = APIRouter(prefix="/manutencoes", tags=["Manutenções"])
 
@@ -27,6 +34,61 @@ def listar_manutencoes(
     return manutencoes
 
 
+@router.get("/pendentes", response_model=PreventivasPendentesResponse)
+def preventivas_pendentes(
+    equipamento_id: Optional[int] = None,
+    data_referencia: Optional[date] = None,
+    db: Session = Depends(get_db)
+):
+    """
+    Preventivas vencidas e a vencer pelos planos de manutenção, contra o
+    hodômetro atual e a data de referência (padrão: hoje).
+    """
+    return listar_pendentes(db, data_referencia, equipamento_id)
+
+
+@router.post("/preventivas/agendar", response_model=dict)
+def agendar_manutencoes_preventivas(db: Session = Depends(get_db)):
+    """Agenda agora as preventivas devidas (o job diário faz o mesmo)"""
+    resultado = agendar_preventivas(db)
+    db.commit()
+    return resultado
+
+
+@router.get("/planos", response_model=List[PlanoManutencaoResponse])
+def listar_planos(ativo: Optional[bool] = None, db: Session = Depends(get_db)):
+    query = db.query(PlanoManutencao)
+    if ativo is not None:
+        query = query.filter(PlanoManutencao.ativo == ativo)
+    return query.order_by(PlanoManutencao.tipo_equipamento, PlanoManutencao.descricao).all()
+
+
+@router.post("/planos", response_model=PlanoManutencaoResponse, status_code=status.HTTP_201_CREATED)
+def criar_plano(plano: PlanoManutencaoCreate, db: Session = Depends(get_db)):
+    novo_plano = PlanoManutencao(**plano.model_dump())
+    db.add(novo_plano)
+    db.commit()
+    db.refresh(novo_plano)
+    return novo_plano
+
+
+@router.put("/planos/{plano_id}", response_model=PlanoManutencaoResponse)
+def atualizar_plano(plano_id: int, plano: PlanoManutencaoUpdate, db: Session = Depends(get_db)):
+    db_plano = db.query(PlanoManutencao).filter(PlanoManutencao.id == plano_id).first()
+    if not db_plano:
+        raise HTTPException(status_code=404, detail="Plano de manutenção não encontrado")
+
+    update_data = plano.model_dump(exclude_unset=True)
+    for field, value in update_data.items():
+        setattr(db_plano, field, value)
+    if db_plano.intervalo_km is None and db_plano.intervalo_dias is None:
+        raise HTTPException(status_code=400, detail="Informe intervalo_km e/ou intervalo_dias")
+
+    db.commit()
+    db.refresh(db_plano)
+    return db_plano
+
+
 @router.get("/{manutencao_id}", response_model=ManutencaoResponse)
 def buscar_manutencao(manutencao_id: int, db: Session = Depends(get_db)):
     manutencao = db.query(Manutencao).filter(Manutencao.id == manutencao_id).first()
@@ -40,6 +102,7 @@ def criar_manutencao(manutencao: ManutencaoCreate, db: Session = Depends(get_db)
     nova_manutencao = Manutencao(**manutencao.model_dump())
     db.add(nova_manutencao)
     db.commit()
+    invalidar_custos_equipamentos()
     db.refresh(nova_manutencao)
     return nova_manutencao
 
@@ -59,6 +122,7 @@ def atualizar_manutencao(
         setattr(db_manutencao, field, value)
 
     db.commit()
+    invalidar_custos_equipamentos()
     db.refresh(db_manutencao)
     return db_manutencao
 
@@ -71,4 +135,5 @@ def deletar_manutencao(manutencao_id: int, db: Session = Depends(get_db)):
 
     db.delete(db_manutencao)
     db.commit()
+    invalidar_custos_equipamentos()
     return None
@@ -0,0 +1,19 @@
+from fastapi import APIRouter
+from app.database import engine, async_engine
+from app.pool_metrics import resumo_pool
+
+router = APIRouter(prefix="/metrics", tags=["Métricas"])
+
+
+@router.get("/db-pool")
+def metricas_pool():
+    """
+    Estado dos pools de conexão deste worker
+
+    Conexões em uso, ociosas e em overflow, e a espera acumulada por
+    conexão desde o início do processo.
+    """
+    return {
+        "sync": resumo_pool(engine.pool),
+        "async": resumo_pool(async_engine.pool),
+    }
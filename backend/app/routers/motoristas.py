@@ -1,7 +1,8 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, status, Response
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 from app.database import get_db
+from app.pagination import paginar
 from app.models.motorista import Motorista
 from app.schemas.motorista import MotoristaCreate, MotoristaUpdate, MotoristaResponse
 
@@ -12,13 +13,15 @@ router = APIRouter(prefix="/motoristas", tags=["Motoristas"])
 def listar_motoristas(
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = None,
     ativo: bool = None,
+    response: Response = None,
     db: Session = Depends(get_db)
 ):
     query = db.query(Motorista)
     if ativo is not None:
         query = query.filter(Motorista.ativo == ativo)
-    motoristas = query.offset(skip).limit(limit).all()
+    motoristas = paginar(query, [Motorista.id], skip, limit, cursor, response)
     return motoristas
 
 
@@ -1,13 +1,23 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from sqlalchemy import func, case
-from typing import List
+from fastapi import APIRouter, Depends, HTTPException, status, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, contains_eager
+from sqlalchemy import select, func
+from typing import List, Optional
+from datetime import date
 from decimal import Decimal
-from app.database import get_db
+from app.database import get_db, get_async_db
+from app.pagination import paginar
 from app.models.plano_contas import PlanoContas
 from app.models.partida import Partida
 from app.models.lancamento import Lancamento
-from app.schemas.plano_contas import PlanoContasCreate, PlanoContasUpdate, PlanoContasResponse
+from app.models.saldo_mensal import SaldoMensal
+from app.schemas.plano_contas import (
+    PlanoContasCreate,
+    PlanoContasUpdate,
+    PlanoContasResponse,
+    SaldoContaResponse,
+)
+from app.services.arvore_contas import calcular_saldos_hierarquicos, invalidar_indice_contas
 
 router = APIRouter(prefix="/plano-contas", tags=["Plano de Contas"])
 
@@ -16,16 +26,33 @@ router = APIRouter(prefix="/plano-contas", tags=["Plano de Contas"])
 def listar_contas(
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = None,
     ativo: bool = None,
+    response: Response = None,
     db: Session = Depends(get_db)
 ):
     query = db.query(PlanoContas)
     if ativo is not None:
         query = query.filter(PlanoContas.ativo == ativo)
-    contas = query.order_by(PlanoContas.codigo).offset(skip).limit(limit).all()
+    contas = paginar(query, [PlanoContas.codigo], skip, limit, cursor, response)
     return contas
 
 
+@router.get("/saldos", response_model=List[SaldoContaResponse])
+async def listar_saldos(
+    data_inicio: Optional[date] = None,
+    data_fim: Optional[date] = None,
+    centro_custo_id: Optional[int] = None,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Retorna o saldo de todas as contas do plano.
+
+    Contas sintéticas trazem a soma de suas contas descendentes.
+    """
+    return await db.run_sync(calcular_saldos_hierarquicos, data_inicio, data_fim, centro_custo_id)
+
+
 @router.get("/{conta_id}", response_model=PlanoContasResponse)
 def buscar_conta(conta_id: int, db: Session = Depends(get_db)):
     conta = db.query(PlanoContas).filter(PlanoContas.id == conta_id).first()
@@ -56,6 +83,7 @@ def criar_conta(conta: PlanoContasCreate, db: Session = Depends(get_db)):
     nova_conta = PlanoContas(**conta.model_dump())
     db.add(nova_conta)
     db.commit()
+    invalidar_indice_contas()
     db.refresh(nova_conta)
     return nova_conta
 
@@ -75,6 +103,7 @@ def atualizar_conta(
         setattr(db_conta, field, value)
 
     db.commit()
+    invalidar_indice_contas()
     db.refresh(db_conta)
     return db_conta
 
@@ -91,31 +120,23 @@ def deletar_conta(conta_id: int, db: Session = Depends(get_db)):
 
 
 @router.get("/{conta_id}/saldo")
-def obter_saldo_conta(conta_id: int, db: Session = Depends(get_db)):
+async def obter_saldo_conta(conta_id: int, db: AsyncSession = Depends(get_async_db)):
     """
     Retorna o saldo atual da conta (soma de débitos - créditos)
     """
-    conta = db.query(PlanoContas).filter(PlanoContas.id == conta_id).first()
+    conta = await db.get(PlanoContas, conta_id)
     if not conta:
         raise HTTPException(status_code=404, detail="Conta não encontrada")
 
-    # Calcular saldo
-    resultado = db.query(
-        func.sum(
-            case(
-                (Partida.tipo == "DEBITO", Partida.valor),
-                else_=0
-            )
-        ).label("debitos"),
-        func.sum(
-            case(
-                (Partida.tipo == "CREDITO", Partida.valor),
-                else_=0
-            )
-        ).label("creditos")
-    ).filter(
-        Partida.conta_id == conta_id
-    ).first()
+    # Calcular saldo a partir dos totais mensais materializados
+    resultado = (await db.execute(
+        select(
+            func.sum(SaldoMensal.debitos).label("debitos"),
+            func.sum(SaldoMensal.creditos).label("creditos")
+        ).where(
+            SaldoMensal.conta_id == conta_id
+        )
+    )).one()
 
     debitos = resultado.debitos or Decimal(0)
     creditos = resultado.creditos or Decimal(0)
@@ -138,27 +159,32 @@ def obter_saldo_conta(conta_id: int, db: Session = Depends(get_db)):
 
 
 @router.get("/{conta_id}/movimentacoes")
-def obter_movimentacoes_conta(
+async def obter_movimentacoes_conta(
     conta_id: int,
     limit: int = 10,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Retorna as últimas movimentações (partidas) da conta
     """
-    conta = db.query(PlanoContas).filter(PlanoContas.id == conta_id).first()
+    conta = await db.get(PlanoContas, conta_id)
     if not conta:
         raise HTTPException(status_code=404, detail="Conta não encontrada")
 
     # Buscar últimas partidas com informações do lançamento
-    partidas = db.query(Partida).join(
-        Lancamento, Partida.lancamento_id == Lancamento.id
-    ).filter(
-        Partida.conta_id == conta_id
-    ).order_by(
-        Lancamento.data_lancamento.desc(),
-        Partida.id.desc()
-    ).limit(limit).all()
+    resultado = await db.execute(
+        select(Partida).join(
+            Lancamento, Partida.lancamento_id == Lancamento.id
+        ).options(
+            contains_eager(Partida.lancamento)  # lançamento já vem no JOIN
+        ).where(
+            Partida.conta_id == conta_id
+        ).order_by(
+            Lancamento.data_lancamento.desc(),
+            Partida.id.desc()
+        ).limit(limit)
+    )
+    partidas = resultado.scalars().all()
 
     movimentacoes = []
     for partida in partidas:
@@ -1,10 +1,13 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, status, Response
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 from datetime import date
 from app.database import get_db
+from app.pagination import paginar
 from app.models.viagem import Viagem
 from app.schemas.viagem import ViagemCreate, ViagemUpdate, ViagemResponse
+from app.services.custos_equipamentos import invalidar_custos_equipamentos
+from app.services.hodometro import registrar_leitura, remover_leitura
 
 router = APIRouter(prefix="/viagens", tags=["Viagens"])
 
@@ -13,10 +16,12 @@ router = APIRouter(prefix="/viagens", tags=["Viagens"])
 def listar_viagens(
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = None,
     equipamento_id: int = None,
     motorista_id: int = None,
     data_inicio: date = None,
     data_fim: date = None,
+    response: Response = None,
     db: Session = Depends(get_db)
 ):
     query = db.query(Viagem)
@@ -29,7 +34,9 @@ def listar_viagens(
     if data_fim:
         query = query.filter(Viagem.data_viagem <= data_fim)
 
-    viagens = query.order_by(Viagem.data_viagem.desc()).offset(skip).limit(limit).all()
+    viagens = paginar(
+        query, [Viagem.data_viagem, Viagem.id], skip, limit, cursor, response, descendente=True
+    )
     return viagens
 
 
@@ -45,7 +52,9 @@ def buscar_viagem(viagem_id: int, db: Session = Depends(get_db)):
 def criar_viagem(viagem: ViagemCreate, db: Session = Depends(get_db)):
     nova_viagem = Viagem(**viagem.model_dump())
     db.add(nova_viagem)
+    registrar_leitura(db, nova_viagem.equipamento_id, nova_viagem.km_final, nova_viagem.data_viagem)
     db.commit()
+    invalidar_custos_equipamentos()
     db.refresh(nova_viagem)
     return nova_viagem
 
@@ -60,11 +69,16 @@ def atualizar_viagem(
     if not db_viagem:
         raise HTTPException(status_code=404, detail="Viagem não encontrada")
 
+    leitura_anterior = (db_viagem.equipamento_id, db_viagem.km_final, db_viagem.data_viagem)
     update_data = viagem.model_dump(exclude_unset=True)
     for field, value in update_data.items():
         setattr(db_viagem, field, value)
+    db.flush()
+    remover_leitura(db, *leitura_anterior)
+    registrar_leitura(db, db_viagem.equipamento_id, db_viagem.km_final, db_viagem.data_viagem)
 
     db.commit()
+    invalidar_custos_equipamentos()
     db.refresh(db_viagem)
     return db_viagem
 
@@ -76,5 +90,8 @@ def deletar_viagem(viagem_id: int, db: Session = Depends(get_db)):
         raise HTTPException(status_code=404, detail="Viagem não encontrada")
 
     db.delete(db_viagem)
+    db.flush()
+    remover_leitura(db, db_viagem.equipamento_id, db_viagem.km_final, db_viagem.data_viagem)
     db.commit()
+    invalidar_custos_equipamentos()
     return None
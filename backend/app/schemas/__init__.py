@@ -3,6 +3,7 @@ from app.schemas.plano_contas import (
     PlanoContasCreate,
     PlanoContasUpdate,
     PlanoContasResponse,
+    SaldoContaResponse,
 )
 from app.schemas.historico import (
     HistoricoBase,
@@ -39,6 +40,7 @@ __all__ = [
     "PlanoContasCreate",
     "PlanoContasUpdate",
     "PlanoContasResponse",
+    "SaldoContaResponse",
     "HistoricoBase",
     "HistoricoCreate",
     "HistoricoUpdate",
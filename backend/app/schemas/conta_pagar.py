@@ -56,3 +56,10 @@ class ContaPagarResponse(ContaPagarBase):
 
     class Config:
         from_attributes = True
+
+
+class ContaPagarParceladoCreate(ContaPagarBase):
+    """Compra parcelada: valor é o total, dividido em `parcelas` vencimentos mensais"""
+    parcelas: int = Field(..., ge=1, le=360)
+    intervalo_meses: int = Field(1, ge=1, le=12)
+    usuario_id: Optional[int] = None
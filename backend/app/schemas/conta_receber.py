@@ -22,6 +22,10 @@ class ContaReceberCreate(ContaReceberBase):
     parcela_total: Optional[int] = None
     grupo_parcelamento: Optional[str] = Field(None, max_length=100)
 
+    # Campos opcionais para recorrência
+    recorrente: bool = False
+    dia_vencimento_recorrente: Optional[int] = Field(None, ge=1, le=31)
+
     usuario_id: Optional[int] = None
 
 
@@ -45,10 +49,21 @@ class ContaReceberResponse(ContaReceberBase):
     parcela_numero: Optional[int] = None
     parcela_total: Optional[int] = None
     grupo_parcelamento: Optional[str] = None
+    recorrente: Optional[bool] = False
+    dia_vencimento_recorrente: Optional[int] = None
     lancamento_id: Optional[int] = None
+    contrato_id: Optional[int] = None
+    competencia: Optional[int] = None
     usuario_id: Optional[int] = None
     created_at: datetime
     updated_at: Optional[datetime] = None
 
     class Config:
         from_attributes = True
+
+
+class ContaReceberParceladoCreate(ContaReceberBase):
+    """Venda parcelada: valor é o total, dividido em `parcelas` vencimentos mensais"""
+    parcelas: int = Field(..., ge=1, le=360)
+    intervalo_meses: int = Field(1, ge=1, le=12)
+    usuario_id: Optional[int] = None
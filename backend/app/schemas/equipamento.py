@@ -1,6 +1,6 @@
 from pydantic import BaseModel, Field
 from typing import Optional
-from datetime import datetime
+from datetime import date, datetime
 from decimal import Decimal
 from app.models.equipamento import TipoEquipamento
 
@@ -15,7 +15,6 @@ class EquipamentoBase(BaseModel):
     numero_serie: Optional[str] = Field(None, max_length=100)
     valor_aquisicao: Optional[Decimal] = None
     hodometro_inicial: Optional[Decimal] = None
-    hodometro_atual: Optional[Decimal] = None
     ativo: bool = True
     observacoes: Optional[str] = Field(None, max_length=1000)
 
@@ -32,13 +31,15 @@ class EquipamentoUpdate(BaseModel):
     ano_fabricacao: Optional[int] = None
     numero_serie: Optional[str] = Field(None, max_length=100)
     valor_aquisicao: Optional[Decimal] = None
-    hodometro_atual: Optional[Decimal] = None
     ativo: Optional[bool] = None
     observacoes: Optional[str] = Field(None, max_length=1000)
 
 
 class EquipamentoResponse(EquipamentoBase):
     id: int
+    # Mantido por app.services.hodometro a partir de viagens e abastecimentos
+    hodometro_atual: Optional[Decimal] = None
+    data_ultima_leitura: Optional[date] = None
     created_at: datetime
     updated_at: Optional[datetime] = None
 
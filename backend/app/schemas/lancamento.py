@@ -57,3 +57,21 @@ class LancamentoResponse(LancamentoBase):
 
     class Config:
         from_attributes = True
+
+
+class LancamentoLoteCriado(BaseModel):
+    indice: int
+    id: int
+
+
+class LancamentoLoteErro(BaseModel):
+    indice: int
+    erro: str
+
+
+class LancamentoLoteResponse(BaseModel):
+    total: int
+    criados: int
+    com_erro: int
+    lancamentos: List[LancamentoLoteCriado] = []
+    erros: List[LancamentoLoteErro] = []
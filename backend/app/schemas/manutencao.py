@@ -1,7 +1,8 @@
-from pydantic import BaseModel, Field
-from typing import Optional
+from pydantic import BaseModel, Field, model_validator
+from typing import Optional, List
 from datetime import date, datetime
 from decimal import Decimal
+from app.models.equipamento import TipoEquipamento
 from app.models.manutencao import TipoManutencao, StatusManutencao
 
 
@@ -21,6 +22,7 @@ class ManutencaoBase(BaseModel):
     numero_nota: Optional[str] = Field(None, max_length=50)
     observacoes: Optional[str] = Field(None, max_length=1000)
     lancamento_id: Optional[int] = None
+    plano_manutencao_id: Optional[int] = None
 
 
 class ManutencaoCreate(ManutencaoBase):
@@ -51,3 +53,57 @@ class ManutencaoResponse(ManutencaoBase):
 
     class Config:
         from_attributes = True
+
+
+class PlanoManutencaoBase(BaseModel):
+    tipo_equipamento: TipoEquipamento
+    descricao: str = Field(..., max_length=255)
+    intervalo_km: Optional[Decimal] = Field(None, gt=0)
+    intervalo_dias: Optional[int] = Field(None, gt=0)
+    antecedencia_km: Decimal = Field(Decimal("0"), ge=0)
+    antecedencia_dias: int = Field(0, ge=0)
+    ativo: bool = True
+
+
+class PlanoManutencaoCreate(PlanoManutencaoBase):
+    @model_validator(mode="after")
+    def validate_intervalo(self):
+        if self.intervalo_km is None and self.intervalo_dias is None:
+            raise ValueError("Informe intervalo_km e/ou intervalo_dias")
+        return self
+
+
+class PlanoManutencaoUpdate(BaseModel):
+    descricao: Optional[str] = Field(None, max_length=255)
+    intervalo_km: Optional[Decimal] = Field(None, gt=0)
+    intervalo_dias: Optional[int] = Field(None, gt=0)
+    antecedencia_km: Optional[Decimal] = Field(None, ge=0)
+    antecedencia_dias: Optional[int] = Field(None, ge=0)
+    ativo: Optional[bool] = None
+
+
+class PlanoManutencaoResponse(PlanoManutencaoBase):
+    id: int
+    created_at: datetime
+    updated_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
+
+
+class PreventivaPendente(BaseModel):
+    equipamento_id: int
+    identificador: str
+    tipo_equipamento: TipoEquipamento
+    hodometro_atual: Optional[Decimal] = None
+    plano_manutencao_id: int
+    descricao: str
+    proximo_km: Optional[Decimal] = None
+    km_restante: Optional[Decimal] = None
+    proxima_data: Optional[date] = None
+    manutencao_id: Optional[int] = None  # Manutenção em aberto, se já agendada
+
+
+class PreventivasPendentesResponse(BaseModel):
+    vencidas: List[PreventivaPendente]
+    a_vencer: List[PreventivaPendente]
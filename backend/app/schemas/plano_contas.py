@@ -29,3 +29,16 @@ class PlanoContasResponse(PlanoContasBase):
 
     class Config:
         from_attributes = True
+
+
+class SaldoContaResponse(BaseModel):
+    conta_id: int
+    codigo: str
+    descricao: str
+    natureza: NaturezaConta
+    nivel: int
+    aceita_lancamento: bool
+    conta_pai_id: Optional[int] = None
+    debitos: float
+    creditos: float
+    saldo: float
@@ -0,0 +1,181 @@
+"""
+Saldos hierárquicos do plano de contas
+
+Os saldos das contas analíticas vêm de uma única query agrupada e são
+somados nas contas sintéticas percorrendo em memória um índice
+código -> pai do plano de contas, mantido em cache no processo.
+"""
+import calendar
+import threading
+import time
+from dataclasses import dataclass
+from datetime import date
+from decimal import Decimal
+from typing import Dict, List, Optional
+
+from sqlalchemy import select, func, case
+from sqlalchemy.orm import Session
+
+from app.models.lancamento import Lancamento
+from app.models.partida import Partida
+from app.models.plano_contas import PlanoContas
+from app.models.saldo_mensal import SaldoMensal
+from app.services.saldos_mensais import ano_mes_de
+
+# Tempo máximo de vida do índice em cache (outros workers não recebem a invalidação)
+INDICE_TTL_SEGUNDOS = 300
+
+
+@dataclass(frozen=True)
+class NoConta:
+    id: int
+    codigo: str
+    descricao: str
+    natureza: str
+    nivel: int
+    aceita_lancamento: bool
+    pai_id: Optional[int]
+
+
+_indice: Optional[List[NoConta]] = None
+_indice_carregado_em = 0.0
+_lock = threading.Lock()
+
+
+def invalidar_indice_contas() -> None:
+    """Descarta o índice em cache; chamar após gravações em plano_contas"""
+    global _indice
+    with _lock:
+        _indice = None
+
+
+def obter_indice_contas(db: Session) -> List[NoConta]:
+    """
+    Retorna as contas ordenadas da mais profunda para a mais rasa, com o pai resolvido.
+
+    O pai é conta_pai_id quando informado; senão, a conta cujo código é o
+    código sem o último segmento (1.1.01.01 -> 1.1.01).
+    """
+    global _indice, _indice_carregado_em
+    with _lock:
+        if _indice is not None and time.monotonic() - _indice_carregado_em < INDICE_TTL_SEGUNDOS:
+            return _indice
+
+    linhas = db.execute(
+        select(
+            PlanoContas.id,
+            PlanoContas.codigo,
+            PlanoContas.descricao,
+            PlanoContas.natureza,
+            PlanoContas.nivel,
+            PlanoContas.aceita_lancamento,
+            PlanoContas.conta_pai_id,
+        )
+    ).all()
+
+    id_por_codigo = {linha.codigo: linha.id for linha in linhas}
+    indice = []
+    for linha in linhas:
+        pai_id = linha.conta_pai_id
+        if pai_id is None and "." in linha.codigo:
+            pai_id = id_por_codigo.get(linha.codigo.rsplit(".", 1)[0])
+        indice.append(NoConta(
+            id=linha.id,
+            codigo=linha.codigo,
+            descricao=linha.descricao,
+            natureza=linha.natureza.value if hasattr(linha.natureza, "value") else linha.natureza,
+            nivel=linha.nivel,
+            aceita_lancamento=linha.aceita_lancamento,
+            pai_id=pai_id,
+        ))
+    indice.sort(key=lambda no: (-no.codigo.count("."), no.codigo))
+
+    with _lock:
+        _indice = indice
+        _indice_carregado_em = time.monotonic()
+    return indice
+
+
+def _periodo_mensal(data_inicio: Optional[date], data_fim: Optional[date]) -> bool:
+    """True se o período cobre meses inteiros (pode ser lido de saldos_mensais)"""
+    if data_inicio and data_inicio.day != 1:
+        return False
+    if data_fim and data_fim.day != calendar.monthrange(data_fim.year, data_fim.month)[1]:
+        return False
+    return True
+
+
+def _movimento_por_conta(
+    db: Session,
+    data_inicio: Optional[date],
+    data_fim: Optional[date],
+    centro_custo_id: Optional[int],
+) -> Dict[int, tuple]:
+    """Débitos e créditos por conta analítica em uma query agrupada"""
+    if _periodo_mensal(data_inicio, data_fim):
+        query = select(
+            SaldoMensal.conta_id,
+            func.sum(SaldoMensal.debitos),
+            func.sum(SaldoMensal.creditos),
+        ).group_by(SaldoMensal.conta_id)
+        if data_inicio:
+            query = query.where(SaldoMensal.ano_mes >= ano_mes_de(data_inicio))
+        if data_fim:
+            query = query.where(SaldoMensal.ano_mes <= ano_mes_de(data_fim))
+        if centro_custo_id:
+            query = query.where(SaldoMensal.centro_custo_id == centro_custo_id)
+    else:
+        query = select(
+            Partida.conta_id,
+            func.sum(case((Partida.tipo == "DEBITO", Partida.valor), else_=0)),
+            func.sum(case((Partida.tipo == "CREDITO", Partida.valor), else_=0)),
+        ).join(
+            Lancamento, Partida.lancamento_id == Lancamento.id
+        ).group_by(Partida.conta_id)
+        if data_inicio:
+            query = query.where(Lancamento.data_lancamento >= data_inicio)
+        if data_fim:
+            query = query.where(Lancamento.data_lancamento <= data_fim)
+        if centro_custo_id:
+            query = query.where(Partida.centro_custo_id == centro_custo_id)
+
+    return {
+        conta_id: (Decimal(debitos or 0), Decimal(creditos or 0))
+        for conta_id, debitos, creditos in db.execute(query).all()
+    }
+
+
+def calcular_saldos_hierarquicos(
+    db: Session,
+    data_inicio: Optional[date] = None,
+    data_fim: Optional[date] = None,
+    centro_custo_id: Optional[int] = None,
+) -> List[Dict]:
+    """Saldo de todas as contas, com as sintéticas somando suas descendentes"""
+    indice = obter_indice_contas(db)
+    movimento = _movimento_por_conta(db, data_inicio, data_fim, centro_custo_id)
+
+    totais = {no.id: list(movimento.get(no.id, (Decimal(0), Decimal(0)))) for no in indice}
+    # Índice vem das folhas para a raiz: cada conta já acumulou suas filhas
+    for no in indice:
+        if no.pai_id is not None and no.pai_id in totais:
+            totais[no.pai_id][0] += totais[no.id][0]
+            totais[no.pai_id][1] += totais[no.id][1]
+
+    saldos = []
+    for no in sorted(indice, key=lambda n: n.codigo):
+        debitos, creditos = totais[no.id]
+        saldo = debitos - creditos if no.natureza == "DEVEDORA" else creditos - debitos
+        saldos.append({
+            "conta_id": no.id,
+            "codigo": no.codigo,
+            "descricao": no.descricao,
+            "natureza": no.natureza,
+            "nivel": no.nivel,
+            "aceita_lancamento": no.aceita_lancamento,
+            "conta_pai_id": no.pai_id,
+            "debitos": debitos,
+            "creditos": creditos,
+            "saldo": saldo,
+        })
+    return saldos
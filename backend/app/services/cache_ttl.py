@@ -0,0 +1,36 @@
+"""
+Cache em memória com validade (TTL) para relatórios calculados
+
+Local ao processo: a invalidação feita por um worker não chega aos demais,
+por isso cada valor também expira depois de ttl segundos.
+"""
+import threading
+import time
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+
+class CacheTTL:
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+        self._itens: Dict[Hashable, Tuple[float, Any]] = {}
+        self._lock = threading.Lock()
+
+    def obter(self, chave: Hashable) -> Optional[Any]:
+        """Valor da chave, ou None se ausente ou expirado"""
+        with self._lock:
+            item = self._itens.get(chave)
+            if item is None:
+                return None
+            expira_em, valor = item
+            if time.monotonic() >= expira_em:
+                del self._itens[chave]
+                return None
+            return valor
+
+    def guardar(self, chave: Hashable, valor: Any) -> None:
+        with self._lock:
+            self._itens[chave] = (time.monotonic() + self.ttl, valor)
+
+    def limpar(self) -> None:
+        with self._lock:
+            self._itens.clear()
@@ -0,0 +1,188 @@
+"""
+Consumo de combustível por equipamento e detecção de anomalias
+
+Cada abastecimento com km_hodometro fecha um intervalo com o abastecimento
+anterior do mesmo equipamento (LAG sobre km_hodometro ordenado por data e
+id): km rodados = km atual - km anterior e km/l = km rodados / litros do
+abastecimento atual (tanque cheio).
+
+Anomalias:
+- HODOMETRO_REGREDIU: km menor que o do abastecimento anterior;
+- CONSUMO_ALTO / CONSUMO_BAIXO: km/l a mais de CONSUMO_DESVIOS_ANOMALIA
+  desvios-padrão da média do equipamento (a partir de CONSUMO_AMOSTRA_MINIMA
+  intervalos). A comparação é feita com os quadrados, sem raiz no banco.
+
+A atualização é um único INSERT ... SELECT: para cada equipamento entram
+só os abastecimentos posteriores ao último já gravado em
+consumos_abastecimento, que serve de âncora para o LAG. A média e a
+variância combinam os intervalos já gravados com os novos. Gravar um
+abastecimento descarta os consumos a partir da data dele (descartar_consumo),
+que são recalculados na próxima atualização.
+"""
+import time
+from datetime import date
+from typing import Dict, Optional
+
+from sqlalchemy import and_, case, delete, func, literal, or_, select, true, union_all, Boolean, Numeric
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.models.abastecimento import Abastecimento
+from app.models.consumo_abastecimento import ConsumoAbastecimento
+from app.services.sql_dialeto import insert_dialeto
+
+HODOMETRO_REGREDIU = "HODOMETRO_REGREDIU"
+CONSUMO_ALTO = "CONSUMO_ALTO"
+CONSUMO_BAIXO = "CONSUMO_BAIXO"
+
+
+def descartar_consumo(db: Session, equipamento_id: int, a_partir_de: date) -> None:
+    """Remove os consumos do equipamento a partir da data (recalculados na próxima atualização)"""
+    db.execute(
+        delete(ConsumoAbastecimento).where(
+            ConsumoAbastecimento.equipamento_id == equipamento_id,
+            ConsumoAbastecimento.data_abastecimento >= a_partir_de,
+        )
+    )
+
+
+def _insert_consumos(db: Session, desvios: float, amostra_minima: int):
+    """INSERT ... SELECT dos intervalos novos de todos os equipamentos"""
+    a, c = Abastecimento, ConsumoAbastecimento
+
+    # Último consumo gravado de cada equipamento
+    ordem = func.row_number().over(
+        partition_by=c.equipamento_id,
+        order_by=(c.data_abastecimento.desc(), c.abastecimento_id.desc()),
+    )
+    ultimos = select(
+        c.equipamento_id, c.data_abastecimento, c.abastecimento_id, c.km_hodometro, ordem.label("ordem")
+    ).subquery()
+    ancora = select(ultimos).where(ultimos.c.ordem == 1).cte("ancora")
+
+    novos = select(
+        a.id.label("abastecimento_id"),
+        a.equipamento_id,
+        a.data_abastecimento,
+        a.km_hodometro,
+        a.litros,
+        literal(True, Boolean).label("novo"),
+    ).outerjoin(
+        ancora, ancora.c.equipamento_id == a.equipamento_id
+    ).where(
+        a.km_hodometro.isnot(None),
+        or_(
+            ancora.c.abastecimento_id.is_(None),
+            a.data_abastecimento > ancora.c.data_abastecimento,
+            and_(a.data_abastecimento == ancora.c.data_abastecimento, a.id > ancora.c.abastecimento_id),
+        ),
+    )
+    anteriores = select(
+        ancora.c.abastecimento_id,
+        ancora.c.equipamento_id,
+        ancora.c.data_abastecimento,
+        ancora.c.km_hodometro,
+        literal(0, Numeric(10, 2)).label("litros"),
+        literal(False, Boolean).label("novo"),
+    )
+    sequencia = union_all(novos, anteriores).subquery()
+
+    km_anterior = func.lag(sequencia.c.km_hodometro).over(
+        partition_by=sequencia.c.equipamento_id,
+        order_by=(sequencia.c.data_abastecimento, sequencia.c.abastecimento_id),
+    )
+    com_anterior = select(sequencia, km_anterior.label("km_anterior")).subquery()
+    km_rodados = com_anterior.c.km_hodometro - com_anterior.c.km_anterior
+    intervalos = select(
+        com_anterior.c.abastecimento_id,
+        com_anterior.c.equipamento_id,
+        com_anterior.c.data_abastecimento,
+        com_anterior.c.km_hodometro,
+        km_rodados.label("km_rodados"),
+        com_anterior.c.litros,
+        case(
+            (and_(km_rodados >= 0, com_anterior.c.litros > 0), km_rodados / com_anterior.c.litros),
+            else_=None,
+        ).label("km_por_litro"),
+    ).where(com_anterior.c.novo == literal(True, Boolean)).cte("intervalos")
+
+    # Média, média dos quadrados e tamanho da amostra: gravados + novos
+    validos = union_all(
+        select(c.equipamento_id, c.km_por_litro).where(
+            c.km_por_litro.isnot(None),
+            c.equipamento_id.in_(select(intervalos.c.equipamento_id)),
+        ),
+        select(intervalos.c.equipamento_id, intervalos.c.km_por_litro).where(
+            intervalos.c.km_por_litro.isnot(None)
+        ),
+    ).subquery()
+    estatisticas = select(
+        validos.c.equipamento_id,
+        func.avg(validos.c.km_por_litro).label("media"),
+        func.avg(validos.c.km_por_litro * validos.c.km_por_litro).label("media_quadrados"),
+        func.count().label("amostra"),
+    ).group_by(validos.c.equipamento_id).cte("estatisticas")
+
+    e = estatisticas
+    variancia = e.c.media_quadrados - e.c.media * e.c.media
+    fora_do_padrao = and_(
+        intervalos.c.km_por_litro.isnot(None),
+        e.c.amostra >= amostra_minima,
+        (intervalos.c.km_por_litro - e.c.media) * (intervalos.c.km_por_litro - e.c.media)
+        > desvios * desvios * variancia,
+    )
+    anomalia = case(
+        (intervalos.c.km_rodados < 0, HODOMETRO_REGREDIU),
+        (and_(fora_do_padrao, intervalos.c.km_por_litro < e.c.media), CONSUMO_ALTO),
+        (fora_do_padrao, CONSUMO_BAIXO),
+        else_=None,
+    )
+
+    # Atualizações simultâneas: o intervalo já gravado pela outra é ignorado
+    return insert_dialeto(db, ConsumoAbastecimento).from_select(
+        [
+            "abastecimento_id", "equipamento_id", "data_abastecimento", "km_hodometro", "km_rodados",
+            "litros", "km_por_litro", "km_por_litro_medio", "anomalia",
+        ],
+        select(
+            intervalos.c.abastecimento_id,
+            intervalos.c.equipamento_id,
+            intervalos.c.data_abastecimento,
+            intervalos.c.km_hodometro,
+            intervalos.c.km_rodados,
+            intervalos.c.litros,
+            intervalos.c.km_por_litro,
+            e.c.media,
+            anomalia,
+        ).outerjoin(
+            e, e.c.equipamento_id == intervalos.c.equipamento_id
+        ).where(true())  # SQLite: sem WHERE, o ON CONFLICT seria lido como condição do JOIN
+    ).on_conflict_do_nothing(
+        index_elements=["abastecimento_id"]
+    ).returning(ConsumoAbastecimento.abastecimento_id)
+
+
+def atualizar_consumo(
+    db: Session,
+    completo: bool = False,
+    desvios: Optional[float] = None,
+    amostra_minima: Optional[int] = None,
+) -> Dict:
+    """
+    Calcula os intervalos ainda não processados (ou todos, com completo=True).
+
+    Retorna quantos intervalos foram gravados e o tempo gasto. Não faz commit.
+    """
+    inicio = time.perf_counter()
+    if completo:
+        db.execute(delete(ConsumoAbastecimento))
+    # RETURNING em vez de rowcount: o sqlite3 não conta linhas de um WITH ... INSERT
+    processados = len(db.execute(_insert_consumos(
+        db,
+        desvios if desvios is not None else settings.CONSUMO_DESVIOS_ANOMALIA,
+        amostra_minima if amostra_minima is not None else settings.CONSUMO_AMOSTRA_MINIMA,
+    )).all())
+    return {
+        "processados": processados,
+        "tempo_ms": round((time.perf_counter() - inicio) * 1000, 1),
+    }
@@ -0,0 +1,230 @@
+"""
+Custos por equipamento
+
+Combustível (abastecimentos), manutenção (manutenções não canceladas),
+km rodado (viagens) e receita de locação (contratos não cancelados) de cada
+equipamento num período, numa única query: um CTE com os períodos (o
+período inteiro ou um por mês), um SELECT por origem agregando por
+(equipamento_id, período) e o UNION ALL deles agrupado de novo.
+
+A receita de locação é proporcional aos dias do contrato dentro do período:
+DIARIA = valor por dia, MENSAL = valor / 30 por dia, FECHADO = valor
+dividido pelos dias do contrato (sem data de fim, o valor inteiro no período
+do início). Contratos por HORA não entram (as horas trabalhadas não são
+registradas).
+
+Os relatórios ficam em cache por (período, por_mes) até a próxima gravação
+de abastecimento, manutenção, viagem ou contrato, ou no máximo
+CUSTOS_TTL_SEGUNDOS (outros workers não recebem a invalidação).
+"""
+import calendar
+from datetime import date
+from decimal import Decimal
+from typing import Dict, List, Tuple
+
+from sqlalchemy import Date, Numeric, case, func, literal, select, union_all
+from sqlalchemy.orm import Session
+
+from app.models.abastecimento import Abastecimento
+from app.models.contrato_locacao import ContratoLocacao, StatusContrato, TipoCobranca
+from app.models.equipamento import Equipamento
+from app.models.manutencao import Manutencao, StatusManutencao
+from app.models.viagem import Viagem
+from app.services.cache_ttl import CacheTTL
+from app.services.datas_sql import numero_dia
+
+CUSTOS_TTL_SEGUNDOS = 300
+DIAS_MES_COMERCIAL = 30
+
+_cache = CacheTTL(CUSTOS_TTL_SEGUNDOS)
+
+
+def invalidar_custos_equipamentos() -> None:
+    """Descarta os relatórios em cache; chamar após gravar abastecimentos, manutenções, viagens ou contratos"""
+    _cache.limpar()
+
+
+def intervalo_periodo(periodo: str) -> Tuple[date, date]:
+    """'AAAA' ou 'AAAA-MM' -> (primeiro dia, último dia); ValueError se inválido"""
+    partes = periodo.split("-")
+    if len(partes) == 1 and len(partes[0]) == 4:
+        ano = int(partes[0])
+        return date(ano, 1, 1), date(ano, 12, 31)
+    if len(partes) == 2 and len(partes[0]) == 4 and len(partes[1]) == 2:
+        ano, mes = int(partes[0]), int(partes[1])
+        return date(ano, mes, 1), date(ano, mes, calendar.monthrange(ano, mes)[1])
+    raise ValueError(f"Período inválido: {periodo} (use AAAA ou AAAA-MM)")
+
+
+def _periodos(periodo: str, inicio: date, fim: date, por_mes: bool) -> List[Tuple[str, date, date]]:
+    """(chave, início, fim) de cada período do relatório: o período todo ou cada mês"""
+    if not por_mes:
+        return [(periodo, inicio, fim)]
+    meses = []
+    ano, mes = inicio.year, inicio.month
+    while (ano, mes) <= (fim.year, fim.month):
+        meses.append((f"{ano:04d}-{mes:02d}", date(ano, mes, 1), date(ano, mes, calendar.monthrange(ano, mes)[1])))
+        ano, mes = (ano + 1, 1) if mes == 12 else (ano, mes + 1)
+    return meses
+
+
+def _zero():
+    return literal(0, Numeric(15, 2))
+
+
+def _maior(a, b):
+    return case((a > b, a), else_=b)
+
+
+def _menor(a, b):
+    return case((a < b, a), else_=b)
+
+
+def _query_custos(periodos: List[Tuple[str, date, date]]):
+    """(equipamento_id, periodo, combustivel, litros, manutencao, km, receita) por equipamento e período"""
+    p = union_all(*[
+        select(
+            literal(chave).label("periodo"),
+            literal(inicio, Date).label("inicio"),
+            literal(fim, Date).label("fim"),
+        )
+        for chave, inicio, fim in periodos
+    ]).cte("periodos")
+
+    def linha(equipamento_id, combustivel=None, litros=None, manutencao=None, km=None, receita=None):
+        return (
+            equipamento_id.label("equipamento_id"),
+            p.c.periodo,
+            func.sum(combustivel).label("combustivel") if combustivel is not None else _zero().label("combustivel"),
+            func.sum(litros).label("litros") if litros is not None else _zero().label("litros"),
+            func.sum(manutencao).label("manutencao") if manutencao is not None else _zero().label("manutencao"),
+            func.sum(km).label("km") if km is not None else _zero().label("km"),
+            func.sum(receita).label("receita") if receita is not None else _zero().label("receita"),
+        )
+
+    combustivel = select(
+        *linha(Abastecimento.equipamento_id, combustivel=Abastecimento.valor_total, litros=Abastecimento.litros)
+    ).join(
+        p, Abastecimento.data_abastecimento.between(p.c.inicio, p.c.fim)
+    ).group_by(Abastecimento.equipamento_id, p.c.periodo)
+
+    data_manutencao = func.coalesce(Manutencao.data_realizada, Manutencao.data_agendada)
+    valor_manutencao = func.coalesce(
+        Manutencao.valor_total,
+        func.coalesce(Manutencao.valor_mao_obra, 0) + func.coalesce(Manutencao.valor_pecas, 0),
+    )
+    manutencao = select(
+        *linha(Manutencao.equipamento_id, manutencao=valor_manutencao)
+    ).join(
+        p, data_manutencao.between(p.c.inicio, p.c.fim)
+    ).where(
+        Manutencao.status != StatusManutencao.CANCELADA
+    ).group_by(Manutencao.equipamento_id, p.c.periodo)
+
+    km_viagem = func.coalesce(Viagem.km_percorrido, Viagem.km_final - Viagem.km_inicial, 0)
+    km = select(
+        *linha(Viagem.equipamento_id, km=km_viagem)
+    ).join(
+        p, Viagem.data_viagem.between(p.c.inicio, p.c.fim)
+    ).group_by(Viagem.equipamento_id, p.c.periodo)
+
+    # Dias do contrato dentro do período (interseção dos intervalos, inclusive)
+    c = ContratoLocacao
+    fim_contrato = func.coalesce(c.data_fim_real, c.data_fim_prevista)
+    inicio_uso = _maior(c.data_inicio, p.c.inicio)
+    fim_uso = _menor(func.coalesce(fim_contrato, p.c.fim), p.c.fim)
+    dias_uso = numero_dia(fim_uso) - numero_dia(inicio_uso) + 1
+    dias_contrato = numero_dia(func.coalesce(fim_contrato, c.data_inicio)) - numero_dia(c.data_inicio) + 1
+    valor_dia = case(
+        (c.tipo_cobranca == TipoCobranca.DIARIA, c.valor_cobranca),
+        (c.tipo_cobranca == TipoCobranca.MENSAL, c.valor_cobranca / DIAS_MES_COMERCIAL),
+        (c.tipo_cobranca == TipoCobranca.FECHADO, c.valor_cobranca / dias_contrato),
+        else_=0,
+    )
+    # FECHADO sem data de fim: valor cheio uma vez, no período do início (como no faturamento)
+    valor_receita = case(
+        (
+            (c.tipo_cobranca == TipoCobranca.FECHADO) & fim_contrato.is_(None),
+            case((c.data_inicio >= p.c.inicio, c.valor_cobranca), else_=0),
+        ),
+        else_=valor_dia * dias_uso,
+    )
+    receita = select(
+        *linha(c.equipamento_id, receita=valor_receita)
+    ).join(
+        p, (c.data_inicio <= p.c.fim) & (func.coalesce(fim_contrato, p.c.fim) >= p.c.inicio)
+    ).where(
+        c.status != StatusContrato.CANCELADO
+    ).group_by(c.equipamento_id, p.c.periodo)
+
+    origens = union_all(
+        combustivel, manutencao, km, receita
+    ).cte("origens")
+
+    return select(
+        origens.c.equipamento_id,
+        Equipamento.identificador,
+        Equipamento.tipo,
+        origens.c.periodo,
+        func.sum(origens.c.combustivel).label("combustivel"),
+        func.sum(origens.c.litros).label("litros"),
+        func.sum(origens.c.manutencao).label("manutencao"),
+        func.sum(origens.c.km).label("km"),
+        func.sum(origens.c.receita).label("receita"),
+    ).join(
+        Equipamento, Equipamento.id == origens.c.equipamento_id
+    ).group_by(
+        origens.c.equipamento_id, Equipamento.identificador, Equipamento.tipo, origens.c.periodo
+    ).order_by(origens.c.periodo, origens.c.equipamento_id)
+
+
+def _decimal(valor) -> Decimal:
+    return Decimal(str(valor or 0)).quantize(Decimal("0.01"))
+
+
+def _indicadores(combustivel: Decimal, litros: Decimal, manutencao: Decimal, km: Decimal) -> Dict:
+    return {
+        "custo_km": (combustivel + manutencao) / km if km else None,
+        "litros_100km": litros * 100 / km if km else None,
+    }
+
+
+def calcular_custos(db: Session, periodo: str, por_mes: bool = False) -> Dict:
+    """Relatório de custos e receita por equipamento no período ('AAAA' ou 'AAAA-MM')"""
+    chave = (periodo, por_mes)
+    em_cache = _cache.obter(chave)
+    if em_cache is not None:
+        return em_cache
+
+    inicio, fim = intervalo_periodo(periodo)
+    equipamentos = []
+    totais = {campo: Decimal("0.00") for campo in ("combustivel", "litros", "manutencao", "km", "receita")}
+
+    for linha in db.execute(_query_custos(_periodos(periodo, inicio, fim, por_mes))):
+        valores = {campo: _decimal(getattr(linha, campo)) for campo in totais}
+        for campo, valor in valores.items():
+            totais[campo] += valor
+        indicadores = _indicadores(valores["combustivel"], valores["litros"], valores["manutencao"], valores["km"])
+        equipamentos.append({
+            "equipamento_id": linha.equipamento_id,
+            "identificador": linha.identificador,
+            "tipo": linha.tipo,
+            "periodo": linha.periodo,
+            **valores,
+            **{nome: _decimal(valor) if valor is not None else None for nome, valor in indicadores.items()},
+        })
+
+    indicadores = _indicadores(totais["combustivel"], totais["litros"], totais["manutencao"], totais["km"])
+    relatorio = {
+        "periodo": periodo,
+        "data_inicio": inicio,
+        "data_fim": fim,
+        "por_mes": por_mes,
+        "equipamentos": equipamentos,
+        "totais": {
+            **totais,
+            **{nome: _decimal(valor) if valor is not None else None for nome, valor in indicadores.items()},
+        },
+    }
+    _cache.guardar(chave, relatorio)
+    return relatorio
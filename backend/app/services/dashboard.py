@@ -0,0 +1,194 @@
+"""
+Motor de agregação do dashboard
+
+Calcula saldos, totais mensais e distribuição por categoria com poucas
+varreduras agrupadas sobre saldos_mensais JOIN plano_contas, em vez de uma
+query por indicador sobre as partidas.
+
+Tudo vai até hoje: os meses fechados vêm de saldos_mensais e o mês atual das
+partidas com data_lancamento <= hoje, para que lançamentos com data futura
+não entrem nos saldos nem nos totais do mês.
+"""
+from datetime import date
+from decimal import Decimal
+from typing import Dict, List, Tuple
+
+from sqlalchemy import select, func, case, and_, or_, literal, union_all
+from sqlalchemy.orm import Session, aliased
+
+from app.models.lancamento import Lancamento
+from app.models.partida import Partida, TipoPartida
+from app.models.plano_contas import PlanoContas
+from app.models.saldo_mensal import SaldoMensal
+from app.models.cliente import Cliente
+from app.models.equipamento import Equipamento
+from app.models.motorista import Motorista
+from app.services.saldos_mensais import ano_mes_de
+
+# Grupos de saldo exibidos no dashboard: chave -> (prefixo do código, natureza)
+GRUPOS_SALDO = {
+    "saldo_disponivel": ("1.1.1", "DEVEDORA"),   # Caixa e Bancos
+    "total_receber": ("1.1.2", "DEVEDORA"),      # Clientes a Receber
+    "total_pagar": ("2.1.1", "CREDORA"),         # Fornecedores a Pagar
+    "salarios_pagar": ("2.1.2", "CREDORA"),      # Salários a Pagar
+    "impostos_pagar": ("2.1.3", "CREDORA"),      # Impostos a Pagar
+}
+
+MESES_EVOLUCAO = 6
+
+
+def _soma_condicional(condicao, coluna):
+    return func.coalesce(func.sum(case((condicao, coluna), else_=0)), 0)
+
+
+def meses_anteriores(hoje: date, quantidade: int = MESES_EVOLUCAO) -> List[Tuple[int, int]]:
+    """Retorna os (ano, mês) dos últimos N meses, do mais antigo ao atual"""
+    meses = []
+    ano, mes = hoje.year, hoje.month
+    for _ in range(quantidade):
+        meses.append((ano, mes))
+        mes -= 1
+        if mes == 0:
+            ano, mes = ano - 1, 12
+    return list(reversed(meses))
+
+
+def movimentos_ate(hoje: date):
+    """Subquery (ano_mes, conta_id, debitos, creditos) com os movimentos até hoje"""
+    ano_mes_atual = ano_mes_de(hoje)
+    return union_all(
+        select(
+            SaldoMensal.ano_mes, SaldoMensal.conta_id, SaldoMensal.debitos, SaldoMensal.creditos
+        ).where(SaldoMensal.ano_mes < ano_mes_atual),
+        select(
+            literal(ano_mes_atual).label("ano_mes"),
+            Partida.conta_id,
+            case((Partida.tipo == TipoPartida.DEBITO, Partida.valor), else_=0).label("debitos"),
+            case((Partida.tipo == TipoPartida.CREDITO, Partida.valor), else_=0).label("creditos"),
+        ).join(
+            Lancamento, Partida.lancamento_id == Lancamento.id
+        ).where(
+            Lancamento.data_lancamento >= hoje.replace(day=1),
+            Lancamento.data_lancamento <= hoje,
+        ),
+    ).subquery("movimentos")
+
+
+def calcular_totais_cadastros(db: Session) -> Dict[str, int]:
+    """Contagens de cadastros ativos em uma única ida ao banco"""
+    resultado = db.execute(
+        select(
+            select(func.count(Cliente.id)).where(Cliente.ativo == True).scalar_subquery().label("clientes"),
+            select(func.count(Equipamento.id)).where(Equipamento.ativo == True).scalar_subquery().label("equipamentos"),
+            select(func.count(Motorista.id)).where(Motorista.ativo == True).scalar_subquery().label("motoristas"),
+            select(func.count(Lancamento.id)).scalar_subquery().label("lancamentos"),
+        )
+    ).one()
+    return dict(resultado._mapping)
+
+
+def calcular_saldos_e_evolucao(db: Session, hoje: date) -> Tuple[Dict[str, Decimal], List[Dict]]:
+    """
+    Varredura única dos movimentos até hoje agrupada por ano_mes.
+
+    Cada linha traz débitos/créditos de cada grupo de saldo e as receitas/despesas
+    do mês; os saldos são a soma de todas as linhas e a evolução mensal usa as
+    linhas dos últimos meses.
+    """
+    m = movimentos_ate(hoje)
+    colunas = []
+    for chave, (prefixo, _) in GRUPOS_SALDO.items():
+        no_grupo = PlanoContas.codigo.like(f"{prefixo}%")
+        colunas.append(_soma_condicional(no_grupo, m.c.debitos).label(f"{chave}_debitos"))
+        colunas.append(_soma_condicional(no_grupo, m.c.creditos).label(f"{chave}_creditos"))
+
+    colunas.append(
+        _soma_condicional(PlanoContas.tipo == "RECEITA", m.c.creditos).label("receitas")
+    )
+    colunas.append(
+        _soma_condicional(PlanoContas.tipo == "DESPESA", m.c.debitos).label("despesas")
+    )
+
+    linhas = db.execute(
+        select(m.c.ano_mes, *colunas)
+        .select_from(m)
+        .join(PlanoContas, m.c.conta_id == PlanoContas.id)
+        .where(
+            PlanoContas.aceita_lancamento == True,
+            or_(
+                PlanoContas.tipo.in_(["RECEITA", "DESPESA"]),
+                *[PlanoContas.codigo.like(f"{prefixo}%") for prefixo, _ in GRUPOS_SALDO.values()]
+            )
+        )
+        .group_by(m.c.ano_mes)
+    ).all()
+
+    saldos = {chave: Decimal(0) for chave in GRUPOS_SALDO}
+    por_mes = {}
+    for linha in linhas:
+        for chave, (_, natureza) in GRUPOS_SALDO.items():
+            debitos = Decimal(getattr(linha, f"{chave}_debitos"))
+            creditos = Decimal(getattr(linha, f"{chave}_creditos"))
+            saldos[chave] += debitos - creditos if natureza == "DEVEDORA" else creditos - debitos
+        por_mes[linha.ano_mes] = (Decimal(linha.receitas), Decimal(linha.despesas))
+
+    evolucao = []
+    for ano_ref, mes_ref in meses_anteriores(hoje):
+        receitas, despesas = por_mes.get(ano_ref * 100 + mes_ref, (Decimal(0), Decimal(0)))
+        evolucao.append({
+            "mes": date(ano_ref, mes_ref, 1).strftime("%b/%Y"),
+            "receitas": receitas,
+            "despesas": despesas,
+            "resultado": receitas - despesas
+        })
+
+    return saldos, evolucao
+
+
+def calcular_categorias_mes(db: Session, hoje: date) -> Tuple[List[Dict], List[Dict]]:
+    """
+    Receitas por conta e despesas por categoria (nível 3) do mês até hoje em uma única query.
+
+    O nome da categoria vem de um self-join com plano_contas pelo prefixo do código.
+    """
+    m = movimentos_ate(hoje)
+    Categoria = aliased(PlanoContas)
+    categoria_codigo = func.substring(PlanoContas.codigo, 1, 5)
+
+    linhas = db.execute(
+        select(
+            PlanoContas.tipo,
+            PlanoContas.descricao,
+            categoria_codigo.label("categoria_codigo"),
+            Categoria.descricao.label("categoria_descricao"),
+            func.sum(m.c.debitos).label("debitos"),
+            func.sum(m.c.creditos).label("creditos")
+        )
+        .select_from(m)
+        .join(PlanoContas, m.c.conta_id == PlanoContas.id)
+        .outerjoin(
+            Categoria,
+            and_(Categoria.codigo == categoria_codigo, Categoria.tipo == "DESPESA")
+        )
+        .where(
+            PlanoContas.aceita_lancamento == True,
+            PlanoContas.tipo.in_(["RECEITA", "DESPESA"]),
+            m.c.ano_mes == ano_mes_de(hoje)
+        )
+        .group_by(PlanoContas.id, PlanoContas.tipo, PlanoContas.descricao, categoria_codigo, Categoria.descricao)
+    ).all()
+
+    receitas_por_tipo = []
+    despesas_por_categoria = {}
+    for linha in linhas:
+        if linha.tipo == "RECEITA":
+            if linha.creditos > 0:
+                receitas_por_tipo.append({"nome": linha.descricao, "valor": float(linha.creditos)})
+        elif linha.debitos > 0:
+            nome = linha.categoria_descricao or linha.categoria_codigo
+            despesas_por_categoria[nome] = despesas_por_categoria.get(nome, Decimal(0)) + linha.debitos
+
+    return receitas_por_tipo, [
+        {"nome": nome, "valor": float(total)}
+        for nome, total in despesas_por_categoria.items()
+    ]
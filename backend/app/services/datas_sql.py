@@ -0,0 +1,40 @@
+"""
+Aritmética de datas em SQL com o mesmo resultado no PostgreSQL e no SQLite
+"""
+from sqlalchemy import Date, Integer
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.functions import FunctionElement
+
+
+class numero_dia(FunctionElement):
+    """Número do dia de uma data (diferença entre dois numero_dia = dias corridos)"""
+    type = Integer()
+    inherit_cache = True
+
+
+@compiles(numero_dia)
+def _numero_dia_padrao(elemento, compilador, **kw):
+    return "(%s - DATE '1970-01-01')" % compilador.process(elemento.clauses, **kw)
+
+
+@compiles(numero_dia, "sqlite")
+def _numero_dia_sqlite(elemento, compilador, **kw):
+    return "CAST(julianday(%s) AS INTEGER)" % compilador.process(elemento.clauses, **kw)
+
+
+class somar_dias(FunctionElement):
+    """Data + número (inteiro) de dias"""
+    type = Date()
+    inherit_cache = True
+
+
+@compiles(somar_dias)
+def _somar_dias_padrao(elemento, compilador, **kw):
+    data, dias = list(elemento.clauses)
+    return "(%s + %s)" % (compilador.process(data, **kw), compilador.process(dias, **kw))
+
+
+@compiles(somar_dias, "sqlite")
+def _somar_dias_sqlite(elemento, compilador, **kw):
+    data, dias = list(elemento.clauses)
+    return "date(%s, %s || ' days')" % (compilador.process(data, **kw), compilador.process(dias, **kw))
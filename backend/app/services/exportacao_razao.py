@@ -0,0 +1,121 @@
+"""
+Exportação do razão geral em streaming (CSV / NDJSON)
+
+Lê lancamentos JOIN partidas JOIN plano_contas JOIN historicos com cursor
+no servidor (stream_results + yield_per) e emite blocos de texto conforme
+as linhas chegam, em memória constante.
+"""
+import csv
+import io
+import json
+from datetime import date
+from typing import Iterator, Optional
+
+from sqlalchemy import select
+from sqlalchemy.engine import Engine
+
+from app.models.lancamento import Lancamento
+from app.models.partida import Partida
+from app.models.plano_contas import PlanoContas
+from app.models.historico import Historico
+from app.models.centro_custo import CentroCusto
+
+LINHAS_POR_BLOCO = 1000
+
+COLUNAS = [
+    "lancamento_id",
+    "data_lancamento",
+    "numero_lote",
+    "historico_codigo",
+    "historico_descricao",
+    "complemento",
+    "conta_codigo",
+    "conta_descricao",
+    "centro_custo_codigo",
+    "tipo",
+    "valor",
+]
+
+
+def _query_razao(data_inicio: Optional[date], data_fim: Optional[date]):
+    query = select(
+        Lancamento.id.label("lancamento_id"),
+        Lancamento.data_lancamento,
+        Lancamento.numero_lote,
+        Historico.codigo.label("historico_codigo"),
+        Historico.descricao.label("historico_descricao"),
+        Lancamento.complemento,
+        PlanoContas.codigo.label("conta_codigo"),
+        PlanoContas.descricao.label("conta_descricao"),
+        CentroCusto.codigo.label("centro_custo_codigo"),
+        Partida.tipo,
+        Partida.valor,
+    ).select_from(Partida).join(
+        Lancamento, Partida.lancamento_id == Lancamento.id
+    ).join(
+        PlanoContas, Partida.conta_id == PlanoContas.id
+    ).join(
+        Historico, Lancamento.historico_id == Historico.id
+    ).outerjoin(
+        CentroCusto, Partida.centro_custo_id == CentroCusto.id
+    ).order_by(
+        Lancamento.data_lancamento, Lancamento.id, Partida.id
+    )
+    if data_inicio:
+        query = query.where(Lancamento.data_lancamento >= data_inicio)
+    if data_fim:
+        query = query.where(Lancamento.data_lancamento <= data_fim)
+    return query
+
+
+def _valores(linha) -> list:
+    """Valores da linha na ordem de COLUNAS, já em tipos serializáveis (valor exato como texto)"""
+    return [
+        linha.lancamento_id,
+        linha.data_lancamento.isoformat(),
+        linha.numero_lote,
+        linha.historico_codigo,
+        linha.historico_descricao,
+        linha.complemento,
+        linha.conta_codigo,
+        linha.conta_descricao,
+        linha.centro_custo_codigo,
+        linha.tipo.value if hasattr(linha.tipo, "value") else linha.tipo,
+        str(linha.valor),
+    ]
+
+
+def gerar_exportacao(
+    engine: Engine,
+    formato: str,
+    data_inicio: Optional[date] = None,
+    data_fim: Optional[date] = None,
+) -> Iterator[str]:
+    """
+    Gera o conteúdo do arquivo em blocos de LINHAS_POR_BLOCO linhas.
+
+    Usa uma conexão própria (a sessão da requisição pode ser fechada antes
+    do fim do streaming).
+    """
+    with engine.connect() as conn:
+        resultado = conn.execution_options(
+            stream_results=True, yield_per=LINHAS_POR_BLOCO
+        ).execute(_query_razao(data_inicio, data_fim))
+
+        if formato == "csv":
+            buffer = io.StringIO()
+            writer = csv.writer(buffer)
+            writer.writerow(COLUNAS)
+            for bloco in resultado.partitions():
+                writer.writerows(_valores(linha) for linha in bloco)
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate(0)
+            if buffer.tell():
+                yield buffer.getvalue()
+        else:
+            for bloco in resultado.partitions():
+                yield "".join(
+                    json.dumps(dict(zip(COLUNAS, _valores(linha))), ensure_ascii=False) + "\n"
+                    for linha in bloco
+                )
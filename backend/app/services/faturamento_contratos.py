@@ -0,0 +1,208 @@
+"""
+Faturamento mensal dos contratos de locação
+
+Uma competência (AAAA-MM) vira uma conta a receber por contrato ATIVO que
+teve uso no mês, num único INSERT ... SELECT sobre contratos_locacao:
+
+- DIARIA: valor por dia x dias do contrato dentro do mês;
+- MENSAL: valor proporcional aos dias do mês (mês inteiro = valor cheio);
+- FECHADO: valor total, faturado na competência do início do contrato;
+- HORA: não entra (as horas trabalhadas não são registradas).
+
+O índice único (contrato_id, competencia) e o ON CONFLICT DO NOTHING tornam
+o faturamento idempotente: refaturar a competência só gera as contas que
+faltam. Opcionalmente cada conta nova ganha seu lançamento (débito na conta
+de clientes, crédito na de receita), gravado em lote com os saldos mensais.
+"""
+import calendar
+import time
+from collections import defaultdict
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import Date, Integer, Numeric, case, cast, func, insert, literal, or_, select, update
+from sqlalchemy.orm import Session
+
+from app.models.cliente import Cliente
+from app.models.conta_receber import ContaReceber, StatusContaReceber
+from app.models.contrato_locacao import ContratoLocacao, StatusContrato, TipoCobranca
+from app.models.historico import Historico
+from app.models.lancamento import Lancamento
+from app.models.partida import Partida, TipoPartida
+from app.models.plano_contas import PlanoContas
+from app.services.datas_sql import numero_dia
+from app.services.geracao_contas import somar_meses
+from app.services.saldos_mensais import ano_mes_de, aplicar_deltas
+from app.services.sql_dialeto import insert_dialeto
+
+CATEGORIA_LOCACAO = "LOCACAO"
+DIA_VENCIMENTO_PADRAO = 10
+
+
+def intervalo_competencia(competencia: str) -> Tuple[date, date]:
+    """'AAAA-MM' -> (primeiro dia, último dia); ValueError se inválida"""
+    try:
+        inicio = datetime.strptime(competencia, "%Y-%m").date()
+    except ValueError:
+        raise ValueError(f"Competência inválida: {competencia} (use AAAA-MM)")
+    return inicio, inicio.replace(day=calendar.monthrange(inicio.year, inicio.month)[1])
+
+
+def _insert_contas(db: Session, inicio: date, fim: date, vencimento: date, usuario_id: Optional[int]):
+    """INSERT ... SELECT das contas da competência; RETURNING das criadas"""
+    c = ContratoLocacao
+    inicio_sql, fim_sql = literal(inicio, Date), literal(fim, Date)
+
+    # Dias do contrato dentro da competência (interseção dos intervalos, inclusive)
+    fim_contrato = func.coalesce(c.data_fim_real, c.data_fim_prevista, fim_sql)
+    inicio_uso = case((c.data_inicio > inicio_sql, c.data_inicio), else_=inicio_sql)
+    fim_uso = case((fim_contrato < fim_sql, fim_contrato), else_=fim_sql)
+    dias_uso = numero_dia(fim_uso) - numero_dia(inicio_uso) + 1
+    valor = case(
+        (c.tipo_cobranca == TipoCobranca.DIARIA, c.valor_cobranca * dias_uso),
+        (
+            c.tipo_cobranca == TipoCobranca.MENSAL,
+            c.valor_cobranca * dias_uso / literal(Decimal(fim.day), Numeric(4, 2)),
+        ),
+        else_=c.valor_cobranca,
+    )
+
+    descricao = literal("Locação ") + c.numero_contrato + literal(f" - {inicio.month:02d}/{inicio.year}")
+    selecao = select(
+        descricao,
+        func.round(valor, 2),
+        literal(vencimento, Date),
+        cast(literal(StatusContaReceber.A_RECEBER.value), ContaReceber.__table__.c.status.type),
+        literal(CATEGORIA_LOCACAO),
+        c.cliente_id,
+        func.substr(Cliente.nome, 1, 200),
+        c.numero_contrato,
+        c.id,
+        literal(ano_mes_de(inicio)),
+        literal(usuario_id, Integer),
+    ).join(
+        Cliente, Cliente.id == c.cliente_id
+    ).where(
+        c.status == StatusContrato.ATIVO,
+        c.tipo_cobranca.in_([TipoCobranca.DIARIA, TipoCobranca.MENSAL, TipoCobranca.FECHADO]),
+        c.valor_cobranca > 0,
+        c.data_inicio <= fim_sql,
+        fim_contrato >= inicio_sql,
+        or_(c.tipo_cobranca != TipoCobranca.FECHADO, c.data_inicio >= inicio_sql),
+    )
+    return insert_dialeto(db, ContaReceber).from_select(
+        [
+            "descricao", "valor", "data_vencimento", "status", "categoria", "cliente_id", "cliente_nome",
+            "numero_documento", "contrato_id", "competencia", "usuario_id",
+        ],
+        selecao,
+    ).on_conflict_do_nothing().returning(ContaReceber.id, ContaReceber.descricao, ContaReceber.valor)
+
+
+def _validar_contabilizacao(db: Session, historico_id: int, conta_debito_id: int, conta_credito_id: int) -> None:
+    if db.get(Historico, historico_id) is None:
+        raise ValueError(f"Histórico {historico_id} não encontrado")
+    for conta_id in (conta_debito_id, conta_credito_id):
+        conta = db.get(PlanoContas, conta_id)
+        if conta is None:
+            raise ValueError(f"Conta {conta_id} não encontrada")
+        if not conta.aceita_lancamento or not conta.ativo:
+            raise ValueError(f"Conta {conta.codigo} não aceita lançamento")
+
+
+def _gravar_lancamentos(
+    db: Session,
+    contas: List,
+    competencia: int,
+    data_lancamento: date,
+    historico_id: int,
+    conta_debito_id: int,
+    conta_credito_id: int,
+    centro_custo_id: Optional[int],
+    usuario_id: Optional[int],
+) -> int:
+    """Um lançamento por conta criada (com partidas e saldos), em lote"""
+    lancamento_ids = db.execute(
+        insert(Lancamento).returning(Lancamento.id, sort_by_parameter_order=True),
+        [
+            {
+                "data_lancamento": data_lancamento,
+                "numero_lote": f"FAT{competencia}",
+                "historico_id": historico_id,
+                "complemento": conta.descricao,
+                "usuario_id": usuario_id,
+                "chave_origem": f"CR:{conta.id}",
+            }
+            for conta in contas
+        ],
+    ).scalars().all()
+
+    partidas = []
+    deltas = defaultdict(lambda: [Decimal(0), Decimal(0)])
+    ano_mes = ano_mes_de(data_lancamento)
+    for lancamento_id, conta in zip(lancamento_ids, contas):
+        for conta_id, tipo in ((conta_debito_id, TipoPartida.DEBITO), (conta_credito_id, TipoPartida.CREDITO)):
+            partidas.append({
+                "lancamento_id": lancamento_id, "conta_id": conta_id, "tipo": tipo,
+                "valor": conta.valor, "centro_custo_id": centro_custo_id,
+            })
+            deltas[(conta_id, centro_custo_id, ano_mes)][0 if tipo == TipoPartida.DEBITO else 1] += conta.valor
+    db.execute(insert(Partida), partidas)
+    aplicar_deltas(db, deltas)
+
+    db.execute(update(ContaReceber), [
+        {"id": conta.id, "lancamento_id": lancamento_id} for lancamento_id, conta in zip(lancamento_ids, contas)
+    ])
+    return len(lancamento_ids)
+
+
+def faturar_competencia(
+    db: Session,
+    competencia: str,
+    dia_vencimento: int = DIA_VENCIMENTO_PADRAO,
+    historico_id: Optional[int] = None,
+    conta_debito_id: Optional[int] = None,
+    conta_credito_id: Optional[int] = None,
+    centro_custo_id: Optional[int] = None,
+    usuario_id: Optional[int] = None,
+) -> Dict:
+    """
+    Fatura os contratos ativos na competência 'AAAA-MM'.
+
+    As contas vencem no dia_vencimento do mês seguinte. Com historico_id e as
+    duas contas contábeis, gera também os lançamentos (data: último dia da
+    competência). ValueError para competência ou contas inválidas. Não faz commit.
+    """
+    inicio_total = time.perf_counter()
+    inicio, fim = intervalo_competencia(competencia)
+    contabilizar = any(x is not None for x in (historico_id, conta_debito_id, conta_credito_id))
+    if contabilizar:
+        if None in (historico_id, conta_debito_id, conta_credito_id):
+            raise ValueError("Para gerar lançamentos informe historico_id, conta_debito_id e conta_credito_id")
+        _validar_contabilizacao(db, historico_id, conta_debito_id, conta_credito_id)
+
+    vencimento = somar_meses(inicio, 1, dia_vencimento)
+    contas = db.execute(_insert_contas(db, inicio, fim, vencimento, usuario_id)).all()
+    tempo_contas = time.perf_counter() - inicio_total
+
+    lancamentos = 0
+    inicio_lancamentos = time.perf_counter()
+    if contabilizar and contas:
+        lancamentos = _gravar_lancamentos(
+            db, contas, ano_mes_de(inicio), fim, historico_id, conta_debito_id, conta_credito_id,
+            centro_custo_id, usuario_id,
+        )
+    tempo_lancamentos = time.perf_counter() - inicio_lancamentos
+
+    return {
+        "competencia": competencia,
+        "contas_criadas": len(contas),
+        "valor_total": sum((conta.valor for conta in contas), Decimal("0.00")),
+        "lancamentos_criados": lancamentos,
+        "tempo_ms": {
+            "contas": round(tempo_contas * 1000, 1),
+            "lancamentos": round(tempo_lancamentos * 1000, 1),
+            "total": round((time.perf_counter() - inicio_total) * 1000, 1),
+        },
+    }
@@ -0,0 +1,158 @@
+"""
+Projeção de fluxo de caixa
+
+Parte do saldo contábil de Caixa e Bancos (contas 1.1.1) até hoje: meses
+fechados de saldos_mensais e o mês atual das partidas, sem lançamentos futuros;
+soma as contas a receber e subtrai as contas a pagar em aberto, por data de
+vencimento (vencidas entram hoje). Tudo sai de uma única query: UNION ALL
+dos movimentos, agregação diária e saldo acumulado com SUM() OVER. Os dias
+são agrupados em dia/semana/mês em memória.
+
+As projeções ficam em cache por (horizonte, granularidade) até a próxima
+gravação de conta ou lançamento, ou no máximo PROJECAO_TTL_SEGUNDOS (outros
+workers não recebem a invalidação).
+"""
+from datetime import date, timedelta
+from decimal import Decimal
+from typing import Dict, List, Optional
+
+from sqlalchemy import select, union_all, func, case, literal, Date, Numeric
+from sqlalchemy.orm import Session
+
+from app.models.conta_pagar import ContaPagar, StatusContaPagar
+from app.models.conta_receber import ContaReceber, StatusContaReceber
+from app.models.plano_contas import PlanoContas
+from app.services.cache_ttl import CacheTTL
+from app.services.dashboard import GRUPOS_SALDO, movimentos_ate
+
+PROJECAO_TTL_SEGUNDOS = 120
+GRANULARIDADES = ("dia", "semana", "mes")
+
+_cache = CacheTTL(PROJECAO_TTL_SEGUNDOS)
+
+
+def invalidar_projecao_fluxo_caixa() -> None:
+    """Descarta as projeções em cache; chamar após gravar contas ou lançamentos"""
+    _cache.limpar()
+
+
+def inicio_periodo(data: date, granularidade: str) -> date:
+    if granularidade == "semana":
+        return data - timedelta(days=data.weekday())
+    if granularidade == "mes":
+        return data.replace(day=1)
+    return data
+
+
+def _zero():
+    return literal(0, Numeric(15, 2))
+
+
+def _movimentos_diarios(db: Session, hoje: date, data_fim: date):
+    """(data, saldo_inicial, entradas, saidas, saldo_acumulado) por dia com movimento"""
+    prefixo, _ = GRUPOS_SALDO["saldo_disponivel"]
+    contabil = movimentos_ate(hoje)
+    saldo_contabil = select(
+        literal(hoje, Date).label("data"),
+        func.coalesce(func.sum(contabil.c.debitos - contabil.c.creditos), 0).label("saldo"),
+        _zero().label("entradas"),
+        _zero().label("saidas"),
+    ).select_from(contabil).join(
+        PlanoContas, contabil.c.conta_id == PlanoContas.id
+    ).where(PlanoContas.codigo.like(f"{prefixo}%"))
+
+    def contas(modelo, abertos, coluna_valor):
+        vencimento = case((modelo.data_vencimento < hoje, hoje), else_=modelo.data_vencimento)
+        return select(
+            vencimento.label("data"),
+            _zero().label("saldo"),
+            modelo.valor.label("entradas") if coluna_valor == "entradas" else _zero().label("entradas"),
+            modelo.valor.label("saidas") if coluna_valor == "saidas" else _zero().label("saidas"),
+        ).where(modelo.status.in_(abertos), modelo.data_vencimento <= data_fim)
+
+    movimentos = union_all(
+        saldo_contabil,
+        contas(ContaReceber, [StatusContaReceber.A_RECEBER, StatusContaReceber.ATRASADO], "entradas"),
+        contas(ContaPagar, [StatusContaPagar.A_VENCER, StatusContaPagar.VENCIDO], "saidas"),
+    ).subquery()
+
+    diario = select(
+        movimentos.c.data,
+        func.sum(movimentos.c.saldo).label("saldo"),
+        func.sum(movimentos.c.entradas).label("entradas"),
+        func.sum(movimentos.c.saidas).label("saidas"),
+    ).group_by(movimentos.c.data).subquery()
+
+    return db.execute(
+        select(
+            diario.c.data,
+            diario.c.saldo,
+            diario.c.entradas,
+            diario.c.saidas,
+            func.sum(diario.c.saldo + diario.c.entradas - diario.c.saidas).over(
+                order_by=diario.c.data
+            ).label("acumulado"),
+        ).order_by(diario.c.data)
+    ).all()
+
+
+def _decimal(valor) -> Decimal:
+    return Decimal(str(valor or 0)).quantize(Decimal("0.01"))
+
+
+def calcular_projecao(
+    db: Session,
+    horizonte_dias: int,
+    granularidade: str = "dia",
+    hoje: Optional[date] = None,
+) -> Dict:
+    hoje = hoje or date.today()
+    chave = (horizonte_dias, granularidade, hoje)
+    em_cache = _cache.obter(chave)
+    if em_cache is not None:
+        return em_cache
+
+    data_fim = hoje + timedelta(days=horizonte_dias)
+    linhas = _movimentos_diarios(db, hoje, data_fim)
+
+    saldo_inicial = sum((_decimal(linha.saldo) for linha in linhas), Decimal("0.00"))
+    periodos: List[Dict] = []
+    por_inicio: Dict[date, Dict] = {}
+    dia = hoje
+    while dia <= data_fim:
+        inicio = inicio_periodo(dia, granularidade)
+        if inicio not in por_inicio:
+            periodo = {
+                "inicio": max(inicio, hoje),
+                "fim": dia,
+                "entradas": Decimal("0.00"),
+                "saidas": Decimal("0.00"),
+                "saldo": None,
+            }
+            por_inicio[inicio] = periodo
+            periodos.append(periodo)
+        por_inicio[inicio]["fim"] = dia
+        dia += timedelta(days=1)
+
+    # Saldo acumulado do último dia com movimento vale até o próximo movimento
+    saldo = saldo_inicial
+    for linha in linhas:
+        periodo = por_inicio[inicio_periodo(linha.data, granularidade)]
+        periodo["entradas"] += _decimal(linha.entradas)
+        periodo["saidas"] += _decimal(linha.saidas)
+        periodo["saldo"] = _decimal(linha.acumulado)
+    for periodo in periodos:
+        if periodo["saldo"] is None:
+            periodo["saldo"] = saldo
+        saldo = periodo["saldo"]
+
+    projecao = {
+        "data_inicio": hoje,
+        "data_fim": data_fim,
+        "granularidade": granularidade,
+        "saldo_inicial": saldo_inicial,
+        "saldo_final": saldo,
+        "periodos": periodos,
+    }
+    _cache.guardar(chave, projecao)
+    return projecao
@@ -0,0 +1,186 @@
+"""
+Geração de séries de contas a pagar / a receber
+
+Parcelamentos: um modelo (valor total, primeiro vencimento, N parcelas) vira
+N contas em um único INSERT multi-linha, todas no mesmo grupo_parcelamento.
+
+Recorrências: para cada grupo cuja última conta é recorrente, o
+materializador gera as contas mensais seguintes até um horizonte móvel
+(HORIZONTE_MESES). O índice único (grupo_parcelamento, parcela_numero) e o
+INSERT ... ON CONFLICT DO NOTHING tornam a geração idempotente, mesmo com
+vários workers executando o job ao mesmo tempo.
+"""
+import calendar
+import uuid
+from datetime import date
+from decimal import Decimal
+from typing import Dict, List, Optional
+
+from sqlalchemy import String, select, insert, func, and_, cast, literal, update
+from sqlalchemy.orm import Session
+
+from app.models.conta_pagar import ContaPagar, StatusContaPagar
+from app.models.conta_receber import ContaReceber, StatusContaReceber
+from app.services.sql_dialeto import insert_dialeto
+
+HORIZONTE_MESES = 12
+TAMANHO_BLOCO = 1000
+
+# Campos copiados da última conta da série para as novas
+CAMPOS_SERIE = {
+    ContaPagar: [
+        "descricao", "valor", "categoria", "fornecedor_id", "fornecedor_nome",
+        "observacoes", "usuario_id", "recorrente", "dia_vencimento_recorrente",
+    ],
+    ContaReceber: [
+        "descricao", "valor", "categoria", "cliente_id", "cliente_nome",
+        "observacoes", "usuario_id", "recorrente", "dia_vencimento_recorrente",
+    ],
+}
+
+STATUS_CANCELADO = {
+    ContaPagar: StatusContaPagar.CANCELADO,
+    ContaReceber: StatusContaReceber.CANCELADO,
+}
+
+
+def somar_meses(data: date, meses: int, dia: Optional[int] = None) -> date:
+    """Soma meses mantendo o dia (ou `dia`), limitado ao último dia do mês"""
+    total = data.year * 12 + data.month - 1 + meses
+    ano, mes = divmod(total, 12)
+    mes += 1
+    return date(ano, mes, min(dia or data.day, calendar.monthrange(ano, mes)[1]))
+
+
+def dividir_valor(total: Decimal, parcelas: int) -> List[Decimal]:
+    """Divide em centavos exatos; os centavos que sobram vão para as primeiras parcelas"""
+    centavos = int((Decimal(total) * 100).to_integral_value())
+    base, resto = divmod(centavos, parcelas)
+    return [
+        (Decimal(base + (1 if i < resto else 0)) / 100).quantize(Decimal("0.01"))
+        for i in range(parcelas)
+    ]
+
+
+def novo_grupo() -> str:
+    return uuid.uuid4().hex
+
+
+def gerar_parcelas(db: Session, modelo, dados: Dict, parcelas: int, intervalo_meses: int = 1) -> List:
+    """
+    Insere as N parcelas descritas por `dados` (campos do schema, com valor
+    total e primeiro vencimento) e retorna as contas criadas. Não faz commit.
+    """
+    dados = dict(dados)
+    valor_total = dados.pop("valor")
+    primeiro_vencimento = dados.pop("data_vencimento")
+    descricao = dados.pop("descricao")
+    grupo = novo_grupo()
+
+    linhas = []
+    for numero, valor in enumerate(dividir_valor(valor_total, parcelas), start=1):
+        sufixo = f" ({numero}/{parcelas})"
+        linhas.append({
+            **dados,
+            "descricao": descricao[:200 - len(sufixo)] + sufixo,
+            "valor": valor,
+            "data_vencimento": somar_meses(primeiro_vencimento, (numero - 1) * intervalo_meses),
+            "parcela_numero": numero,
+            "parcela_total": parcelas,
+            "grupo_parcelamento": grupo,
+        })
+
+    return db.scalars(insert(modelo).returning(modelo, sort_by_parameter_order=True), linhas).all()
+
+
+def iniciar_recorrencia(conta) -> None:
+    """Primeira conta de uma recorrência: garante grupo e número da parcela"""
+    if not conta.grupo_parcelamento:
+        conta.grupo_parcelamento = novo_grupo()
+    if not conta.parcela_numero:
+        conta.parcela_numero = 1
+
+
+def adotar_recorrentes_legadas(db: Session, modelo) -> int:
+    """
+    Recorrentes sem grupo (anteriores às séries) viram a parcela 1 de um grupo
+    próprio ('legado-<id>'), para entrarem na materialização. Não faz commit.
+    """
+    return db.execute(
+        update(modelo)
+        .where(modelo.recorrente == True, modelo.grupo_parcelamento.is_(None))
+        .values(
+            grupo_parcelamento=literal("legado-") + cast(modelo.id, String),
+            parcela_numero=func.coalesce(modelo.parcela_numero, 1),
+        )
+        .execution_options(synchronize_session=False)
+    ).rowcount
+
+
+def materializar_recorrentes(
+    db: Session,
+    modelo,
+    hoje: Optional[date] = None,
+    horizonte_meses: int = HORIZONTE_MESES,
+    grupo: Optional[str] = None,
+) -> int:
+    """
+    Gera as contas das recorrências até hoje + horizonte_meses.
+
+    Considera só grupos cuja última conta está marcada como recorrente e não
+    cancelada (desmarcar a última encerra a série); recorrentes legadas, sem
+    grupo, são adotadas antes. Retorna quantas contas foram criadas. Não faz
+    commit.
+    """
+    if not grupo:
+        adotar_recorrentes_legadas(db, modelo)
+    limite = somar_meses(hoje or date.today(), horizonte_meses)
+
+    ultima = select(
+        modelo.grupo_parcelamento,
+        func.max(modelo.parcela_numero).label("numero"),
+    ).where(modelo.grupo_parcelamento.isnot(None)).group_by(modelo.grupo_parcelamento)
+    if grupo:
+        ultima = ultima.where(modelo.grupo_parcelamento == grupo)
+    ultima = ultima.subquery()
+
+    ultimas_contas = db.scalars(
+        select(modelo).join(
+            ultima,
+            and_(
+                modelo.grupo_parcelamento == ultima.c.grupo_parcelamento,
+                modelo.parcela_numero == ultima.c.numero,
+            )
+        ).where(
+            modelo.recorrente == True,
+            modelo.status != STATUS_CANCELADO[modelo],
+            modelo.data_vencimento < limite,
+        )
+    ).all()
+
+    linhas = []
+    for conta in ultimas_contas:
+        dia = conta.dia_vencimento_recorrente or conta.data_vencimento.day
+        numero, vencimento = conta.parcela_numero, conta.data_vencimento
+        while True:
+            numero += 1
+            vencimento = somar_meses(vencimento, 1, dia)
+            if vencimento > limite:
+                break
+            linha = {campo: getattr(conta, campo) for campo in CAMPOS_SERIE[modelo]}
+            linha.update({
+                "data_vencimento": vencimento,
+                "parcela_numero": numero,
+                "grupo_parcelamento": conta.grupo_parcelamento,
+            })
+            linhas.append(linha)
+
+    criadas = 0
+    for inicio in range(0, len(linhas), TAMANHO_BLOCO):
+        stmt = insert_dialeto(db, modelo).values(linhas[inicio:inicio + TAMANHO_BLOCO])
+        stmt = stmt.on_conflict_do_nothing(
+            index_elements=[modelo.grupo_parcelamento, modelo.parcela_numero],
+            index_where=modelo.grupo_parcelamento.isnot(None),
+        )
+        criadas += db.execute(stmt).rowcount
+    return criadas
@@ -0,0 +1,117 @@
+"""
+Hodômetro atual dos equipamentos
+
+Equipamento.hodometro_atual guarda a maior leitura (Viagem.km_final e
+Abastecimento.km_hodometro) e data_ultima_leitura a data da leitura mais
+recente, para que listas e agendamentos leiam uma coluna em vez de varrer
+viagens e abastecimentos.
+
+- registrar_leitura: leitura nova só pode aumentar os valores (um UPDATE);
+- remover_leitura: leitura alterada ou excluída só força recálculo do
+  equipamento se era ela que definia hodômetro ou data;
+- recalcular_hodometros: recálculo em lote (histórico, importações).
+"""
+from datetime import date
+from decimal import Decimal
+from typing import Iterable, Optional
+
+from sqlalchemy import case, func, or_, select, union_all, update
+from sqlalchemy.orm import Session
+
+from app.models.abastecimento import Abastecimento
+from app.models.equipamento import Equipamento
+from app.models.viagem import Viagem
+
+
+def _leituras():
+    return union_all(
+        select(
+            Viagem.equipamento_id, Viagem.km_final.label("km"), Viagem.data_viagem.label("data")
+        ).where(Viagem.km_final.isnot(None)),
+        select(
+            Abastecimento.equipamento_id,
+            Abastecimento.km_hodometro.label("km"),
+            Abastecimento.data_abastecimento.label("data"),
+        ).where(Abastecimento.km_hodometro.isnot(None)),
+    ).subquery("leituras")
+
+
+def registrar_leitura(db: Session, equipamento_id: int, km: Optional[Decimal], data: date) -> None:
+    """Aplica uma leitura nova ao equipamento (não faz commit)"""
+    if km is None:
+        return
+    db.execute(
+        update(Equipamento)
+        .where(
+            Equipamento.id == equipamento_id,
+            or_(
+                Equipamento.hodometro_atual.is_(None),
+                Equipamento.hodometro_atual < km,
+                Equipamento.data_ultima_leitura.is_(None),
+                Equipamento.data_ultima_leitura < data,
+            ),
+        )
+        .values(
+            hodometro_atual=case(
+                (or_(Equipamento.hodometro_atual.is_(None), Equipamento.hodometro_atual < km), km),
+                else_=Equipamento.hodometro_atual,
+            ),
+            data_ultima_leitura=case(
+                (or_(Equipamento.data_ultima_leitura.is_(None), Equipamento.data_ultima_leitura < data), data),
+                else_=Equipamento.data_ultima_leitura,
+            ),
+        )
+        .execution_options(synchronize_session=False)
+    )
+
+
+def recalcular_hodometros(
+    db: Session, equipamento_ids: Optional[Iterable[int]] = None, condicao=None
+) -> int:
+    """
+    Recalcula hodômetro e data da última leitura a partir das leituras.
+
+    Sem equipamento_ids, recalcula todos os equipamentos com leituras (os
+    demais mantêm o valor informado). Sem leituras, o hodômetro volta ao
+    hodometro_inicial. Não faz commit; retorna os equipamentos alterados.
+    """
+    leituras = _leituras()
+    do_equipamento = leituras.c.equipamento_id == Equipamento.id
+    filtro = [] if condicao is None else [condicao]
+    if equipamento_ids is None:
+        filtro.append(Equipamento.id.in_(select(leituras.c.equipamento_id)))
+    else:
+        filtro.append(Equipamento.id.in_(list(equipamento_ids)))
+    resultado = db.execute(
+        update(Equipamento)
+        .where(*filtro)
+        .values(
+            hodometro_atual=func.coalesce(
+                select(func.max(leituras.c.km)).where(do_equipamento).scalar_subquery(),
+                Equipamento.hodometro_inicial,
+            ),
+            data_ultima_leitura=select(func.max(leituras.c.data)).where(do_equipamento).scalar_subquery(),
+        )
+        .execution_options(synchronize_session=False)
+    )
+    return resultado.rowcount
+
+
+def remover_leitura(db: Session, equipamento_id: int, km: Optional[Decimal], data: date) -> None:
+    """
+    Retira uma leitura alterada ou excluída (chamar depois do flush).
+
+    Só recalcula se a leitura podia ser a que define o hodômetro ou a data.
+    """
+    if km is None:
+        return
+    recalcular_hodometros(
+        db,
+        [equipamento_id],
+        condicao=or_(
+            Equipamento.hodometro_atual.is_(None),
+            Equipamento.hodometro_atual <= km,
+            Equipamento.data_ultima_leitura.is_(None),
+            Equipamento.data_ultima_leitura <= data,
+        ),
+    )
@@ -0,0 +1,292 @@
+"""
+Importação dos lançamentos contábeis do XTDC (razão) em massa
+
+Os registros do XTDC019.DAT (partidas) são lidos em sequência com
+app.parsers.xtdc_dat e montados em lançamentos:
+
+- registro com conta a débito e a crédito: um lançamento de duas partidas;
+- registros de um lado só (lançamentos múltiplos): agrupados em chaves
+  consecutivas da mesma data até débitos = créditos. O que não fecha volta
+  no relatório como partida sem contrapartida e não é gravado.
+
+As contas vêm do código reduzido -> classificação do XTDC035.DAT e da
+classificação -> PlanoContas já importado. Todos os lançamentos usam o
+histórico padrão de importação (criado se não existir).
+
+Gravação set-based, numa transação:
+1. carga em tabelas temporárias (COPY no PostgreSQL, INSERT em lote nos demais);
+2. remoção da carga dos lançamentos já importados (chave_origem);
+3. um INSERT ... SELECT para os lançamentos e outro para as partidas;
+4. saldos mensais com os deltas agregados no banco.
+"""
+import csv
+import io
+import time
+from decimal import Decimal
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import (
+    Column, Date, Integer, MetaData, Numeric, String, Table,
+    case, cast, delete, func, literal, select,
+)
+from sqlalchemy.orm import Session
+
+from app.models.historico import Historico
+from app.models.lancamento import Lancamento
+from app.models.partida import Partida, TipoPartida
+from app.models.plano_contas import PlanoContas
+from app.parsers.xtdc_dat import PartidaXTDC, iter_partidas, iter_plano_contas
+from app.services.saldos_mensais import aplicar_deltas, expr_ano_mes
+
+TAMANHO_BLOCO = 1000
+PREFIXO_CHAVE = "XTDC019"
+HISTORICO_XTDC = "XTDC"
+DESCRICAO_HISTORICO_XTDC = "Lançamento importado do XTDC"
+
+_staging = MetaData()
+
+STG_LANCAMENTOS = Table(
+    "stg_lancamentos_xtdc", _staging,
+    Column("chave_origem", String(30), primary_key=True),
+    Column("data_lancamento", Date, nullable=False),
+    Column("numero_lote", String(20)),
+    Column("complemento", String(500)),
+    prefixes=["TEMPORARY"],
+)
+
+STG_PARTIDAS = Table(
+    "stg_partidas_xtdc", _staging,
+    Column("chave_origem", String(30), nullable=False),
+    Column("conta_id", Integer, nullable=False),
+    Column("tipo", String(7), nullable=False),
+    Column("valor", Numeric(15, 2), nullable=False),
+    prefixes=["TEMPORARY"],
+)
+
+
+def _ms(inicio: float) -> float:
+    return round((time.perf_counter() - inicio) * 1000, 1)
+
+
+def agrupar_lancamentos(
+    partidas: Iterable[PartidaXTDC],
+) -> Tuple[List[List[PartidaXTDC]], List[PartidaXTDC]]:
+    """Monta os lançamentos a partir dos registros; retorna (lançamentos, sem contrapartida)"""
+    lancamentos, sem_contrapartida = [], []
+    aberto: List[PartidaXTDC] = []
+    saldo = Decimal(0)
+
+    for partida in partidas:
+        if partida.conta_debito and partida.conta_credito:
+            lancamentos.append([partida])
+            continue
+        if aberto and (partida.chave != aberto[-1].chave + 1 or partida.data != aberto[-1].data):
+            sem_contrapartida.extend(aberto)
+            aberto, saldo = [], Decimal(0)
+        aberto.append(partida)
+        saldo += partida.valor if partida.conta_debito else -partida.valor
+        if saldo == 0:
+            lancamentos.append(aberto)
+            aberto = []
+
+    sem_contrapartida.extend(aberto)
+    return lancamentos, sem_contrapartida
+
+
+class ImportadorLancamentosXTDC:
+    """Importa o razão do XTDC (XTDC019 + XTDC035) para lancamentos/partidas"""
+
+    def __init__(self, db: Session, historico_codigo: str = HISTORICO_XTDC, usuario_id: Optional[int] = None):
+        self.db = db
+        self.historico_codigo = historico_codigo
+        self.usuario_id = usuario_id
+
+    def importar(self, caminho_partidas: str, caminho_plano: str) -> Dict:
+        """Lê os arquivos e grava os lançamentos novos; retorna o relatório"""
+        inicio_total = time.perf_counter()
+
+        inicio = time.perf_counter()
+        contas = self._mapear_contas(caminho_plano)
+        lancamentos, sem_contrapartida = agrupar_lancamentos(iter_partidas(caminho_partidas))
+        linhas_lancamentos, linhas_partidas, contas_faltando = self._montar_linhas(lancamentos, contas)
+        leitura_ms = _ms(inicio)
+
+        try:
+            inicio = time.perf_counter()
+            self._criar_staging()
+            self._carregar(STG_LANCAMENTOS, linhas_lancamentos)
+            self._carregar(STG_PARTIDAS, linhas_partidas)
+            carga_ms = _ms(inicio)
+
+            inicio = time.perf_counter()
+            existentes = self._descartar_existentes()
+            criados = self._gravar()
+            self._remover_staging()
+            self.db.commit()
+            gravacao_ms = _ms(inicio)
+        except Exception:
+            self.db.rollback()
+            raise
+
+        return {
+            "registros_sem_contrapartida": len(sem_contrapartida),
+            "lancamentos_lidos": len(lancamentos),
+            "lancamentos_sem_conta": len(lancamentos) - len(linhas_lancamentos),
+            "contas_nao_encontradas": sorted(contas_faltando),
+            "lancamentos_criados": criados,
+            "lancamentos_existentes": existentes,
+            "tempos_ms": {
+                "leitura": leitura_ms,
+                "carga": carga_ms,
+                "gravacao": gravacao_ms,
+                "total": _ms(inicio_total),
+            },
+        }
+
+    def _mapear_contas(self, caminho_plano: str) -> Dict[int, Tuple[str, Optional[int]]]:
+        """Código reduzido -> (classificação, id no plano de contas ou None)"""
+        ids = dict(self.db.execute(select(PlanoContas.codigo, PlanoContas.id)).all())
+        return {
+            conta.reduzido: (conta.codigo, ids.get(conta.codigo))
+            for conta in iter_plano_contas(caminho_plano)
+        }
+
+    def _montar_linhas(self, lancamentos: List[List[PartidaXTDC]], contas: Dict) -> Tuple[List, List, set]:
+        """Linhas das tabelas de carga; lançamentos com conta não cadastrada ficam de fora"""
+        linhas_lancamentos, linhas_partidas = [], []
+        faltando = set()
+
+        for registros in lancamentos:
+            partidas = []
+            for registro in registros:
+                for reduzido, tipo in (
+                    (registro.conta_debito, TipoPartida.DEBITO),
+                    (registro.conta_credito, TipoPartida.CREDITO),
+                ):
+                    if reduzido:
+                        codigo, conta_id = contas.get(reduzido, (f"reduzido {reduzido}", None))
+                        if conta_id is None:
+                            faltando.add(codigo)
+                        partidas.append((conta_id, tipo.value, registro.valor))
+
+            if any(conta_id is None for conta_id, _, _ in partidas):
+                continue
+
+            primeiro = registros[0]
+            chave = f"{PREFIXO_CHAVE}:{primeiro.chave}"
+            linhas_lancamentos.append((
+                chave, primeiro.data, str(primeiro.lote),
+                f"Importado do XTDC (chave {primeiro.chave})",
+            ))
+            linhas_partidas.extend((chave, conta_id, tipo, valor) for conta_id, tipo, valor in partidas)
+
+        return linhas_lancamentos, linhas_partidas, faltando
+
+    def _criar_staging(self) -> None:
+        conexao = self.db.connection()
+        for tabela in (STG_PARTIDAS, STG_LANCAMENTOS):
+            tabela.drop(conexao, checkfirst=True)
+            tabela.create(conexao)
+
+    def _remover_staging(self) -> None:
+        conexao = self.db.connection()
+        for tabela in (STG_PARTIDAS, STG_LANCAMENTOS):
+            tabela.drop(conexao)
+
+    def _carregar(self, tabela: Table, linhas: List[tuple]) -> None:
+        """COPY ... FROM STDIN no PostgreSQL; INSERT em blocos nos demais bancos"""
+        if not linhas:
+            return
+        conexao = self.db.connection()
+        colunas = [coluna.name for coluna in tabela.columns]
+
+        if conexao.dialect.name == "postgresql":
+            buffer = io.StringIO()
+            csv.writer(buffer).writerows(linhas)
+            buffer.seek(0)
+            with conexao.connection.cursor() as cursor:
+                cursor.copy_expert(
+                    f"COPY {tabela.name} ({', '.join(colunas)}) FROM STDIN WITH (FORMAT csv)", buffer
+                )
+            return
+
+        for inicio in range(0, len(linhas), TAMANHO_BLOCO):
+            conexao.execute(
+                tabela.insert(),
+                [dict(zip(colunas, linha)) for linha in linhas[inicio:inicio + TAMANHO_BLOCO]]
+            )
+
+    def _descartar_existentes(self) -> int:
+        """Tira da carga os lançamentos já importados; retorna quantos eram"""
+        ja_importados = select(Lancamento.chave_origem).where(Lancamento.chave_origem.isnot(None))
+        self.db.execute(delete(STG_PARTIDAS).where(STG_PARTIDAS.c.chave_origem.in_(ja_importados)))
+        return self.db.execute(
+            delete(STG_LANCAMENTOS).where(STG_LANCAMENTOS.c.chave_origem.in_(ja_importados))
+        ).rowcount
+
+    def _gravar(self) -> int:
+        """INSERT ... SELECT de lançamentos e partidas e deltas dos saldos mensais"""
+        stg_l, stg_p = STG_LANCAMENTOS, STG_PARTIDAS
+        historico_id = self._historico_id()
+
+        criados = self.db.execute(
+            Lancamento.__table__.insert().from_select(
+                ["data_lancamento", "numero_lote", "historico_id", "complemento", "usuario_id", "chave_origem"],
+                select(
+                    stg_l.c.data_lancamento,
+                    stg_l.c.numero_lote,
+                    literal(historico_id),
+                    stg_l.c.complemento,
+                    literal(self.usuario_id, Integer),
+                    stg_l.c.chave_origem,
+                ).order_by(stg_l.c.chave_origem)
+            )
+        ).rowcount
+
+        self.db.execute(
+            Partida.__table__.insert().from_select(
+                ["lancamento_id", "conta_id", "tipo", "valor"],
+                select(
+                    Lancamento.id,
+                    stg_p.c.conta_id,
+                    cast(stg_p.c.tipo, Partida.__table__.c.tipo.type),
+                    stg_p.c.valor,
+                ).join_from(
+                    stg_p, stg_l, stg_l.c.chave_origem == stg_p.c.chave_origem
+                ).join(
+                    Lancamento, Lancamento.chave_origem == stg_p.c.chave_origem
+                )
+            )
+        )
+
+        ano_mes = expr_ano_mes(stg_l.c.data_lancamento)
+        deltas = {
+            (conta_id, None, int(mes)): [Decimal(debitos), Decimal(creditos)]
+            for conta_id, mes, debitos, creditos in self.db.execute(
+                select(
+                    stg_p.c.conta_id,
+                    ano_mes,
+                    func.sum(case((stg_p.c.tipo == TipoPartida.DEBITO.value, stg_p.c.valor), else_=0)),
+                    func.sum(case((stg_p.c.tipo == TipoPartida.CREDITO.value, stg_p.c.valor), else_=0)),
+                ).join_from(
+                    stg_p, stg_l, stg_l.c.chave_origem == stg_p.c.chave_origem
+                ).group_by(stg_p.c.conta_id, ano_mes)
+            )
+        }
+
+        itens = list(deltas.items())
+        for inicio in range(0, len(itens), TAMANHO_BLOCO):
+            aplicar_deltas(self.db, dict(itens[inicio:inicio + TAMANHO_BLOCO]))
+        return criados
+
+    def _historico_id(self) -> int:
+        """Histórico padrão das importações (criado na primeira vez)"""
+        historico_id = self.db.execute(
+            select(Historico.id).where(Historico.codigo == self.historico_codigo)
+        ).scalar_one_or_none()
+        if historico_id is None:
+            historico = Historico(codigo=self.historico_codigo, descricao=DESCRICAO_HISTORICO_XTDC)
+            self.db.add(historico)
+            self.db.flush()
+            historico_id = historico.id
+        return historico_id
@@ -1,26 +1,40 @@
 """
 Serviço de importação de dados do XTDC para o banco de dados
+
+No modo em lote (em_lote=True) os códigos já cadastrados são carregados uma
+vez em um dicionário codigo -> id, os pais são resolvidos em memória e cada
+nível do plano de contas é gravado com um único
+INSERT ... ON CONFLICT (codigo) DO NOTHING RETURNING id, codigo, em vez de
+duas consultas por conta.
 """
+from itertools import groupby
+from sqlalchemy import select
 from sqlalchemy.orm import Session
-from app.parsers.xtdc_balancete_parser import BalanceteXTDCParser
+from app.parsers.xtdc_balancete_parser import BalanceteXTDCParser, ContaXTDC
 from app.models.plano_contas import PlanoContas
-from typing import Dict, List
+from app.services.arvore_contas import invalidar_indice_contas
+from app.services.sql_dialeto import insert_dialeto
+from typing import Dict, Iterable, List, Optional
+
+TAMANHO_BLOCO = 1000
 
 
 class ImportadorXTDC:
     """Importa dados do XTDC para o banco de dados"""
 
-    def __init__(self, db: Session):
+    def __init__(self, db: Session, verbose: bool = True):
         self.db = db
+        self.verbose = verbose
         self.logs = []
         self.erros = []
 
-    def importar_plano_contas_de_balancete(self, arquivo_balancete: str) -> Dict:
+    def importar_plano_contas_de_balancete(self, arquivo_balancete: str, em_lote: bool = False) -> Dict:
         """
         Importa plano de contas a partir de um arquivo de balancete LST
 
         Args:
             arquivo_balancete: Caminho para o arquivo .LST do balancete
+            em_lote: Grava com poucas instruções em lote (ver importar_contas_em_lote)
 
         Returns:
             Dict com estatísticas da importação
@@ -31,6 +45,11 @@ class ImportadorXTDC:
         parser = BalanceteXTDCParser(arquivo_balancete)
         contas = parser.parse()
 
+        if em_lote:
+            stats = parser.get_estatisticas()
+            stats['importacao'] = self.importar_contas_em_lote(contas)
+            return stats
+
         self.log(f"Arquivo parseado: {len(contas)} contas encontradas")
 
         # 2. Ordenar contas por nível (sintéticas antes de analíticas)
@@ -82,6 +101,7 @@ class ImportadorXTDC:
         # 4. Commit final
         try:
             self.db.commit()
+            invalidar_indice_contas()
             self.log("Importação concluída com sucesso!")
         except Exception as e:
             self.db.rollback()
@@ -98,21 +118,103 @@ class ImportadorXTDC:
 
         return stats
 
+    def importar_contas_em_lote(self, contas: Iterable[ContaXTDC]) -> Dict:
+        """
+        Importa as contas com um INSERT por nível (em blocos de TAMANHO_BLOCO)
+
+        Contas com código já cadastrado (ou repetido na entrada) são contadas
+        como existentes e mantêm o cadastro atual. Faz commit no final.
+        """
+        # 1. Códigos já cadastrados, uma única consulta
+        ids_por_codigo: Dict[str, int] = dict(
+            self.db.execute(select(PlanoContas.codigo, PlanoContas.id)).all()
+        )
+
+        # 2. Primeira ocorrência de cada código ainda não cadastrado
+        novas: Dict[str, ContaXTDC] = {}
+        contas_existentes = 0
+        for conta in contas:
+            if conta.codigo in ids_por_codigo or conta.codigo in novas:
+                contas_existentes += 1
+            else:
+                novas[conta.codigo] = conta
+
+        # 3. Um nível por vez: os pais (nível anterior) já têm id no dicionário
+        contas_criadas = 0
+        try:
+            ordenadas = sorted(novas.values(), key=lambda c: (c.nivel, c.codigo))
+            for nivel, grupo in groupby(ordenadas, key=lambda c: c.nivel):
+                linhas = [
+                    {
+                        "codigo": conta.codigo,
+                        "descricao": conta.nome[:255],
+                        "tipo": conta.tipo_conta,
+                        "natureza": conta.natureza,
+                        "nivel": conta.nivel,
+                        "conta_pai_id": ids_por_codigo.get(self._codigo_pai(conta.codigo)),
+                        "aceita_lancamento": conta.aceita_lancamento,
+                        "ativo": True,
+                    }
+                    for conta in grupo
+                ]
+                criadas = self._inserir_nivel(linhas, ids_por_codigo)
+                contas_criadas += criadas
+                contas_existentes += len(linhas) - criadas
+                self.log(f"Nível {nivel}: {criadas} contas criadas")
+
+            self.db.commit()
+        except Exception as e:
+            self.db.rollback()
+            self.erro(f"Erro ao importar contas em lote: {str(e)}")
+            raise
+        invalidar_indice_contas()
+        self.log("Importação concluída com sucesso!")
+
+        return {
+            'contas_criadas': contas_criadas,
+            'contas_existentes': contas_existentes,
+            'contas_erro': 0,
+        }
+
+    def _inserir_nivel(self, linhas: List[Dict], ids_por_codigo: Dict[str, int]) -> int:
+        """Insere as linhas ignorando códigos já existentes; atualiza ids_por_codigo"""
+        criadas = 0
+        for inicio in range(0, len(linhas), TAMANHO_BLOCO):
+            bloco = linhas[inicio:inicio + TAMANHO_BLOCO]
+            stmt = insert_dialeto(self.db, PlanoContas).values(bloco).on_conflict_do_nothing(
+                index_elements=[PlanoContas.codigo]
+            ).returning(PlanoContas.id, PlanoContas.codigo)
+            inseridas = self.db.execute(stmt).all()
+            criadas += len(inseridas)
+            ids_por_codigo.update((codigo, id_) for id_, codigo in inseridas)
+
+        # Códigos gravados por outra importação concorrente não voltam no RETURNING
+        faltantes = [linha["codigo"] for linha in linhas if linha["codigo"] not in ids_por_codigo]
+        if faltantes:
+            ids_por_codigo.update(self.db.execute(
+                select(PlanoContas.codigo, PlanoContas.id).where(PlanoContas.codigo.in_(faltantes))
+            ).all())
+        return criadas
+
+    @staticmethod
+    def _codigo_pai(codigo: str) -> Optional[str]:
+        """1.1.01.01 -> 1.1.01; None para contas de primeiro nível"""
+        partes = codigo.split('.')
+        if len(partes) <= 1:
+            return None
+        return '.'.join(partes[:-1])
+
     def _encontrar_conta_pai(self, codigo: str) -> int:
         """
         Encontra o ID da conta pai baseado no código
 
         Exemplo: 1.1.01.01 tem pai 1.1.01
         """
-        partes = codigo.split('.')
-
         # Se tem só um nível, não tem pai
-        if len(partes) <= 1:
+        codigo_pai = self._codigo_pai(codigo)
+        if codigo_pai is None:
             return None
 
-        # Remove o último nível para obter o código do pai
-        codigo_pai = '.'.join(partes[:-1])
-
         conta_pai = self.db.query(PlanoContas).filter(
             PlanoContas.codigo == codigo_pai
         ).first()
@@ -122,12 +224,14 @@ class ImportadorXTDC:
     def log(self, mensagem: str):
         """Adiciona mensagem ao log"""
         self.logs.append(mensagem)
-        print(f"[INFO] {mensagem}")
+        if self.verbose:
+            print(f"[INFO] {mensagem}")
 
     def erro(self, mensagem: str):
         """Adiciona mensagem de erro"""
         self.erros.append(mensagem)
-        print(f"[ERRO] {mensagem}")
+        if self.verbose:
+            print(f"[ERRO] {mensagem}")
 
     def get_relatorio(self) -> str:
         """Retorna relatório da importação"""
@@ -0,0 +1,145 @@
+"""
+Importação de lançamentos em lote
+
+Valida cada item individualmente (schema, partidas dobradas e referências)
+e grava os válidos em blocos: um INSERT multi-linha com RETURNING para os
+lançamentos, outro para as partidas e um upsert dos saldos mensais, com um
+commit por bloco. Erros são reportados por item sem abortar o lote.
+
+importar_bloco permite gravar um corpo lido em partes (NDJSON em stream)
+sem ter a lista inteira de itens em memória.
+"""
+from collections import defaultdict
+from decimal import Decimal
+from typing import Dict, List, Tuple
+
+from pydantic import ValidationError
+from sqlalchemy import select, insert
+from sqlalchemy.orm import Session
+
+from app.models.lancamento import Lancamento
+from app.models.partida import Partida, TipoPartida
+from app.models.plano_contas import PlanoContas
+from app.models.historico import Historico
+from app.models.centro_custo import CentroCusto
+from app.schemas.lancamento import LancamentoCreate
+from app.services.saldos_mensais import ano_mes_de, aplicar_deltas
+
+TAMANHO_BLOCO = 500
+
+
+def _validar_itens(itens: List) -> Tuple[List[Tuple[int, LancamentoCreate]], List[Dict]]:
+    """Valida o schema de cada item; retorna (válidos com índice, erros)"""
+    validos, erros = [], []
+    for indice, item in enumerate(itens):
+        if isinstance(item, Exception):
+            erros.append({"indice": indice, "erro": f"JSON inválido: {item}"})
+            continue
+        try:
+            validos.append((indice, LancamentoCreate.model_validate(item)))
+        except ValidationError as e:
+            mensagens = "; ".join(err["msg"] for err in e.errors())
+            erros.append({"indice": indice, "erro": mensagens})
+    return validos, erros
+
+
+def _ids_existentes(db: Session, modelo, ids: set) -> set:
+    if not ids:
+        return set()
+    return set(db.execute(select(modelo.id).where(modelo.id.in_(ids))).scalars())
+
+
+def _validar_referencias(
+    db: Session, validos: List[Tuple[int, LancamentoCreate]]
+) -> Tuple[List[Tuple[int, LancamentoCreate]], List[Dict]]:
+    """Confere contas, históricos e centros de custo com uma query por tabela"""
+    contas = _ids_existentes(db, PlanoContas, {p.conta_id for _, l in validos for p in l.partidas})
+    historicos = _ids_existentes(db, Historico, {l.historico_id for _, l in validos})
+    centros = _ids_existentes(db, CentroCusto, {
+        p.centro_custo_id for _, l in validos for p in l.partidas if p.centro_custo_id
+    })
+
+    ok, erros = [], []
+    for indice, lancamento in validos:
+        if lancamento.historico_id not in historicos:
+            erros.append({"indice": indice, "erro": f"Histórico {lancamento.historico_id} não encontrado"})
+        elif any(p.conta_id not in contas for p in lancamento.partidas):
+            faltando = sorted({p.conta_id for p in lancamento.partidas} - contas)
+            erros.append({"indice": indice, "erro": f"Conta(s) não encontrada(s): {faltando}"})
+        elif any(p.centro_custo_id and p.centro_custo_id not in centros for p in lancamento.partidas):
+            erros.append({"indice": indice, "erro": "Centro de custo não encontrado"})
+        else:
+            ok.append((indice, lancamento))
+    return ok, erros
+
+
+def _gravar_bloco(db: Session, bloco: List[Tuple[int, LancamentoCreate]]) -> List[int]:
+    """Insere um bloco de lançamentos com suas partidas e saldos; retorna os ids"""
+    ids = db.execute(
+        insert(Lancamento).returning(Lancamento.id, sort_by_parameter_order=True),
+        [lancamento.model_dump(exclude={"partidas"}) for _, lancamento in bloco]
+    ).scalars().all()
+
+    partidas = []
+    deltas = defaultdict(lambda: [Decimal(0), Decimal(0)])
+    for lancamento_id, (_, lancamento) in zip(ids, bloco):
+        ano_mes = ano_mes_de(lancamento.data_lancamento)
+        for partida in lancamento.partidas:
+            partidas.append({"lancamento_id": lancamento_id, **partida.model_dump()})
+            indice = 0 if partida.tipo == TipoPartida.DEBITO else 1
+            deltas[(partida.conta_id, partida.centro_custo_id, ano_mes)][indice] += partida.valor
+
+    db.execute(insert(Partida), partidas)
+    aplicar_deltas(db, deltas)
+    return list(ids)
+
+
+def novo_resultado() -> Dict:
+    """Resultado vazio de importação, acumulado bloco a bloco por importar_bloco"""
+    return {"total": 0, "criados": 0, "com_erro": 0, "lancamentos": [], "erros": []}
+
+
+def importar_bloco(db: Session, itens: List, resultado: Dict) -> None:
+    """
+    Valida e grava um bloco de payloads, acumulando em resultado.
+
+    Os índices continuam a partir de resultado["total"], para que um corpo lido
+    em partes reporte a posição de cada item no lote inteiro. O bloco é uma
+    transação: se o banco o rejeitar, só os itens dele são marcados com erro.
+    """
+    inicio = resultado["total"]
+    validos, erros = _validar_itens(itens)
+    validos, erros_referencia = _validar_referencias(db, validos)
+    erros.extend(erros_referencia)
+
+    criados = []
+    if validos:
+        try:
+            ids = _gravar_bloco(db, validos)
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            erros.extend({"indice": indice, "erro": f"Erro ao gravar bloco: {e}"} for indice, _ in validos)
+        else:
+            criados = [{"indice": indice, "id": lancamento_id} for (indice, _), lancamento_id in zip(validos, ids)]
+
+    resultado["total"] += len(itens)
+    resultado["criados"] += len(criados)
+    resultado["com_erro"] += len(erros)
+    resultado["lancamentos"].extend({**criado, "indice": inicio + criado["indice"]} for criado in criados)
+    resultado["erros"].extend(
+        {**erro, "indice": inicio + erro["indice"]} for erro in sorted(erros, key=lambda erro: erro["indice"])
+    )
+
+
+def importar_lancamentos(db: Session, itens: List, tamanho_bloco: int = TAMANHO_BLOCO) -> Dict:
+    """
+    Grava uma lista de payloads LancamentoCreate (dicts), em blocos.
+
+    Itens que falharam no parse do corpo chegam como Exception e viram erro
+    daquele índice.
+    """
+    resultado = novo_resultado()
+    for inicio in range(0, len(itens), tamanho_bloco):
+        importar_bloco(db, itens[inicio:inicio + tamanho_bloco], resultado)
+    return resultado
@@ -0,0 +1,151 @@
+"""
+Manutenção preventiva por planos (km e/ou dias)
+
+Cada PlanoManutencao vale para todos os equipamentos ativos do seu tipo. A
+próxima manutenção de um (equipamento, plano) é contada da última manutenção
+CONCLUIDA do plano (km_hodometro e data_realizada) ou, sem nenhuma, do
+hodometro_inicial e do cadastro do equipamento:
+
+- próximo km = base + intervalo_km, comparado com Equipamento.hodometro_atual;
+- próxima data = base + intervalo_dias, comparada com hoje.
+
+VENCIDA: passou do km ou da data. A_VENCER: dentro da antecedência do plano.
+
+A avaliação é uma única query (equipamentos x planos, com as últimas
+manutenções agregadas por equipamento e plano). O job insere as manutenções
+AGENDADA devidas num INSERT ... SELECT; o índice único parcial
+uq_manutencao_plano_aberta (uma em aberto por equipamento e plano) e o ON
+CONFLICT DO NOTHING o tornam idempotente, mesmo com vários workers.
+Cancelar a agendada não adia o plano: ela é agendada de novo na próxima
+execução (para pular uma, conclua-a).
+"""
+import time
+from datetime import date
+from typing import Dict, List, Optional
+
+from sqlalchemy import Date, and_, case, cast, func, literal, or_, select
+from sqlalchemy.orm import Session
+
+from app.models.equipamento import Equipamento
+from app.models.manutencao import Manutencao, StatusManutencao, TipoManutencao
+from app.models.plano_manutencao import PlanoManutencao
+from app.services.datas_sql import somar_dias
+from app.services.sql_dialeto import insert_dialeto
+
+VENCIDA = "VENCIDA"
+A_VENCER = "A_VENCER"
+
+STATUS_ABERTOS = (StatusManutencao.AGENDADA, StatusManutencao.EM_ANDAMENTO)
+
+
+def _situacao_planos(hoje: date, equipamento_id: Optional[int] = None):
+    """Subquery com a situação de cada (equipamento ativo, plano ativo do tipo dele)"""
+    m, e, p = Manutencao, Equipamento, PlanoManutencao
+
+    ultimas = select(
+        m.equipamento_id,
+        m.plano_manutencao_id,
+        func.max(m.km_hodometro).label("km"),
+        func.max(func.coalesce(m.data_realizada, m.data_agendada)).label("data"),
+    ).where(
+        m.plano_manutencao_id.isnot(None),
+        m.status == StatusManutencao.CONCLUIDA,
+    ).group_by(m.equipamento_id, m.plano_manutencao_id).subquery("ultimas")
+
+    abertas = select(
+        m.id, m.equipamento_id, m.plano_manutencao_id
+    ).where(
+        m.plano_manutencao_id.isnot(None),
+        m.status.in_(STATUS_ABERTOS),
+    ).subquery("abertas")
+
+    km_base = func.coalesce(ultimas.c.km, e.hodometro_inicial, 0)
+    proximo_km = km_base + p.intervalo_km
+    km_restante = proximo_km - func.coalesce(e.hodometro_atual, km_base)
+    proxima_data = somar_dias(func.coalesce(ultimas.c.data, func.date(e.created_at)), p.intervalo_dias)
+    hoje = literal(hoje, Date)
+
+    situacao = case(
+        (or_(km_restante < 0, proxima_data < hoje), VENCIDA),
+        (
+            or_(km_restante <= p.antecedencia_km, somar_dias(proxima_data, -p.antecedencia_dias) <= hoje),
+            A_VENCER,
+        ),
+        else_=None,
+    )
+    consulta = select(
+        e.id.label("equipamento_id"),
+        e.identificador,
+        e.tipo.label("tipo_equipamento"),
+        e.hodometro_atual,
+        p.id.label("plano_manutencao_id"),
+        p.descricao,
+        proximo_km.label("proximo_km"),
+        km_restante.label("km_restante"),
+        proxima_data.label("proxima_data"),
+        situacao.label("situacao"),
+        abertas.c.id.label("manutencao_id"),
+    ).join(
+        p, and_(p.tipo_equipamento == e.tipo, p.ativo.is_(True))
+    ).outerjoin(
+        ultimas, and_(ultimas.c.equipamento_id == e.id, ultimas.c.plano_manutencao_id == p.id)
+    ).outerjoin(
+        abertas, and_(abertas.c.equipamento_id == e.id, abertas.c.plano_manutencao_id == p.id)
+    ).where(e.ativo.is_(True))
+    if equipamento_id is not None:
+        consulta = consulta.where(e.id == equipamento_id)
+    return consulta.subquery("situacao_planos")
+
+
+def listar_pendentes(db: Session, hoje: Optional[date] = None, equipamento_id: Optional[int] = None) -> Dict:
+    """Preventivas vencidas e a vencer (com a manutenção em aberto, se já agendada)"""
+    s = _situacao_planos(hoje or date.today(), equipamento_id)
+    linhas = db.execute(
+        select(s).where(s.c.situacao.isnot(None)).order_by(
+            s.c.proxima_data.asc().nulls_last(), s.c.km_restante.asc().nulls_last(),
+            s.c.equipamento_id, s.c.plano_manutencao_id,
+        )
+    ).mappings().all()
+    pendentes: Dict[str, List[Dict]] = {"vencidas": [], "a_vencer": []}
+    for linha in linhas:
+        chave = "vencidas" if linha["situacao"] == VENCIDA else "a_vencer"
+        pendentes[chave].append(dict(linha))
+    return pendentes
+
+
+def agendar_preventivas(db: Session, hoje: Optional[date] = None) -> Dict:
+    """
+    Cria as manutenções AGENDADA das preventivas devidas ainda sem uma em aberto.
+
+    Data agendada: a próxima data do plano ou hoje, se já passou (ou se o
+    plano é só por km); km_hodometro: o próximo km. Não faz commit.
+    """
+    inicio = time.perf_counter()
+    hoje = hoje or date.today()
+    s = _situacao_planos(hoje)
+    hoje_sql = literal(hoje, Date)
+    devidas = select(
+        s.c.equipamento_id,
+        s.c.plano_manutencao_id,
+        cast(literal(TipoManutencao.PREVENTIVA.value), Manutencao.__table__.c.tipo.type),
+        cast(literal(StatusManutencao.AGENDADA.value), Manutencao.__table__.c.status.type),
+        case((s.c.proxima_data > hoje_sql, s.c.proxima_data), else_=hoje_sql),
+        s.c.proximo_km,
+        s.c.descricao,
+    ).where(
+        s.c.situacao.isnot(None),
+        s.c.manutencao_id.is_(None),
+    )
+    agendadas = db.execute(
+        insert_dialeto(db, Manutencao).from_select(
+            [
+                "equipamento_id", "plano_manutencao_id", "tipo", "status", "data_agendada",
+                "km_hodometro", "descricao",
+            ],
+            devidas,
+        ).on_conflict_do_nothing().returning(Manutencao.id)
+    ).all()
+    return {
+        "agendadas": len(agendadas),
+        "tempo_ms": round((time.perf_counter() - inicio) * 1000, 1),
+    }
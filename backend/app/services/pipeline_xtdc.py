@@ -0,0 +1,124 @@
+"""
+Importação de vários balancetes XTDC (.LST) de uma vez
+
+1. Os arquivos são lidos em paralelo em um ProcessPoolExecutor
+   (BalanceteXTDCParser, um arquivo por tarefa), com um processo para cada
+   BYTES_POR_PROCESSO de dados, limitado ao número de CPUs; lotes pequenos
+   são lidos no próprio processo, onde iniciar o pool custaria mais que ler.
+2. As contas são mescladas em memória: vale a união dos códigos de todos os
+   arquivos e, para um mesmo código, os dados do último arquivo da lista
+   (a conta aceita lançamento se aceitar em qualquer um deles).
+3. O resultado é gravado uma única vez com ImportadorXTDC.importar_contas_em_lote.
+
+O relatório traz contas e tempo de leitura por arquivo e o tempo de cada
+etapa, pronto para ser serializado em JSON.
+"""
+import math
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Sequence
+
+from sqlalchemy.orm import Session
+
+from app.parsers.xtdc_balancete_parser import ContaXTDC, ler_arquivo
+from app.services.import_xtdc import ImportadorXTDC
+
+BYTES_POR_PROCESSO = 4 * 1024 * 1024
+
+
+def _ms(inicio: float) -> float:
+    return round((time.perf_counter() - inicio) * 1000, 1)
+
+
+def _tamanho(caminho: str) -> int:
+    try:
+        return os.path.getsize(caminho)
+    except OSError:
+        return 0
+
+
+def calcular_processos(caminhos: Sequence[str], workers: Optional[int] = None) -> int:
+    """Processos de leitura para o lote: até `workers` e as CPUs, um por BYTES_POR_PROCESSO"""
+    limite = os.cpu_count() or 1
+    if workers is not None:
+        limite = min(limite, workers)
+    total_bytes = sum(_tamanho(caminho) for caminho in caminhos)
+    return max(0, min(limite, len(caminhos), math.ceil(total_bytes / BYTES_POR_PROCESSO)))
+
+
+def ler_arquivos(caminhos: Sequence[str], workers: Optional[int] = None) -> List[Dict]:
+    """Lê os arquivos, em paralelo quando compensa, mantendo a ordem recebida"""
+    processos = calcular_processos(caminhos, workers)
+    if processos <= 1:
+        return [ler_arquivo(caminho) for caminho in caminhos]
+
+    with ProcessPoolExecutor(
+        max_workers=processos,
+        mp_context=multiprocessing.get_context("spawn"),
+    ) as executor:
+        return list(executor.map(ler_arquivo, caminhos))
+
+
+def mesclar_contas(resultados: List[Dict]) -> Dict[str, ContaXTDC]:
+    """União dos códigos; o último arquivo (e a última linha) que traz o código prevalece"""
+    mescladas: Dict[str, ContaXTDC] = {}
+    for resultado in resultados:
+        for conta in resultado["contas"]:
+            anterior = mescladas.get(conta.codigo)
+            if anterior is not None and anterior.aceita_lancamento:
+                conta.aceita_lancamento = True
+            mescladas[conta.codigo] = conta
+    return mescladas
+
+
+def importar_balancetes(db: Session, caminhos: Sequence[str], workers: Optional[int] = None) -> Dict:
+    """Lê, mescla e grava o plano de contas de vários balancetes; retorna o relatório"""
+    inicio_total = time.perf_counter()
+    caminhos = [str(caminho) for caminho in caminhos]
+
+    processos = calcular_processos(caminhos, workers)
+    inicio = time.perf_counter()
+    resultados = ler_arquivos(caminhos, processos)
+    parse_ms = _ms(inicio)
+
+    inicio = time.perf_counter()
+    mescladas = mesclar_contas(resultados)
+    merge_ms = _ms(inicio)
+
+    importador = ImportadorXTDC(db, verbose=False)
+    inicio = time.perf_counter()
+    importacao = importador.importar_contas_em_lote(mescladas.values())
+    gravacao_ms = _ms(inicio)
+
+    arquivos = []
+    for resultado in resultados:
+        item = {
+            "arquivo": os.path.basename(resultado["arquivo"]),
+            "contas": len(resultado["contas"]),
+            "parse_ms": resultado["parse_ms"],
+        }
+        if "erro" in resultado:
+            item["erro"] = resultado["erro"]
+        else:
+            item["estatisticas"] = resultado["estatisticas"]
+        arquivos.append(item)
+
+    return {
+        "arquivos": arquivos,
+        "total_arquivos": len(arquivos),
+        "arquivos_com_erro": sum(1 for item in arquivos if "erro" in item),
+        "total_contas_lidas": sum(item["contas"] for item in arquivos),
+        "contas_unicas": len(mescladas),
+        "processos_leitura": processos,
+        "importacao": importacao,
+        "tempos_ms": {
+            "leitura": parse_ms,
+            "mesclagem": merge_ms,
+            "gravacao": gravacao_ms,
+            "total": _ms(inicio_total),
+        },
+        "logs": importador.logs,
+        "erros": importador.erros,
+    }
@@ -0,0 +1,80 @@
+"""
+Resumo de contas a pagar / a receber
+
+Todas as faixas do resumo (hoje, semana, mês e vencidas/atrasadas) saem de
+uma única query com agregação condicional (SUM/COUNT com CASE), sem carregar
+as contas. Os totais são Decimal exatos; opcionalmente a mesma query é
+agrupada por categoria, fornecedor ou cliente.
+"""
+from datetime import date, timedelta
+from decimal import Decimal
+from typing import Dict, List, Optional
+
+from sqlalchemy import select, func, case, and_
+from sqlalchemy.orm import Session
+
+DIAS_SEMANA = 7
+DIAS_MES = 30
+
+
+def _faixas(vencimento, hoje: date, chave_atrasadas: str) -> Dict:
+    return {
+        "hoje": vencimento == hoje,
+        "semana": and_(vencimento >= hoje, vencimento <= hoje + timedelta(days=DIAS_SEMANA)),
+        "mes": and_(vencimento >= hoje, vencimento <= hoje + timedelta(days=DIAS_MES)),
+        chave_atrasadas: vencimento < hoje,
+    }
+
+
+def _vazio(faixas) -> Dict:
+    return {nome: {"total": Decimal(0), "quantidade": 0} for nome in faixas}
+
+
+def calcular_resumo(
+    db: Session,
+    modelo,
+    status_quitado,
+    chave_atrasadas: str,
+    agrupar_por: Optional[List] = None,
+    hoje: Optional[date] = None,
+) -> Dict:
+    """
+    Resumo das contas em aberto (status diferente de status_quitado).
+
+    agrupar_por é a lista de colunas do agrupamento; a primeira não nula de
+    cada grupo vira a chave exibida (ex: [fornecedor_nome, fornecedor_id]).
+    """
+    hoje = hoje or date.today()
+    faixas = _faixas(modelo.data_vencimento, hoje, chave_atrasadas)
+    agrupar_por = agrupar_por or []
+
+    colunas = []
+    for nome, condicao in faixas.items():
+        colunas.append(func.coalesce(func.sum(case((condicao, modelo.valor))), 0).label(f"{nome}_total"))
+        colunas.append(func.count(case((condicao, 1))).label(f"{nome}_quantidade"))
+
+    query = select(*agrupar_por, *colunas).where(
+        modelo.status != status_quitado,
+        # Todas as faixas estão até o fim do mês (vencidas são anteriores a hoje)
+        modelo.data_vencimento <= hoje + timedelta(days=DIAS_MES),
+    )
+    if agrupar_por:
+        query = query.group_by(*agrupar_por)
+
+    resumo = _vazio(faixas)
+    grupos = []
+    for linha in db.execute(query).all():
+        grupo = {}
+        for nome in faixas:
+            total = Decimal(getattr(linha, f"{nome}_total"))
+            quantidade = getattr(linha, f"{nome}_quantidade")
+            resumo[nome]["total"] += total
+            resumo[nome]["quantidade"] += quantidade
+            grupo[nome] = {"total": total, "quantidade": quantidade}
+        if agrupar_por:
+            chave = next((linha[i] for i in range(len(agrupar_por)) if linha[i] is not None), None)
+            grupos.append({"chave": None if chave is None else str(chave), **grupo})
+
+    if agrupar_por:
+        resumo["grupos"] = sorted(grupos, key=lambda g: (g["chave"] is None, g["chave"] or ""))
+    return resumo
@@ -0,0 +1,106 @@
+"""
+Manutenção da tabela materializada saldos_mensais
+
+Cada gravação de lançamento aplica (ou estorna) suas partidas nos totais
+mensais de débito/crédito por conta e centro de custo, na mesma transação.
+"""
+from collections import defaultdict
+from datetime import date
+from decimal import Decimal
+from typing import Dict, Iterable, Tuple
+
+from sqlalchemy import select, delete, func, case, extract, literal_column
+from sqlalchemy.orm import Session
+
+from app.models.lancamento import Lancamento
+from app.models.partida import Partida, TipoPartida
+from app.models.saldo_mensal import SaldoMensal
+from app.services.sql_dialeto import insert_dialeto
+
+
+def ano_mes_de(data: date) -> int:
+    """Converte uma data para a chave ano_mes (ex: 2025-01-15 -> 202501)"""
+    return data.year * 100 + data.month
+
+
+def expr_ano_mes(coluna):
+    """Expressão SQL equivalente a ano_mes_de() para uma coluna de data"""
+    return extract("year", coluna) * 100 + extract("month", coluna)
+
+
+def aplicar_partidas(db: Session, data_lancamento: date, partidas: Iterable, sinal: int = 1) -> None:
+    """
+    Soma (sinal=1) ou estorna (sinal=-1) partidas nos saldos mensais.
+
+    Aceita tanto objetos Partida quanto PartidaCreate. Todas as chaves afetadas
+    são gravadas com um único INSERT ... ON CONFLICT DO UPDATE.
+    """
+    ano_mes = ano_mes_de(data_lancamento)
+    deltas: Dict[Tuple[int, int], list] = defaultdict(lambda: [Decimal(0), Decimal(0)])
+    for partida in partidas:
+        chave = (partida.conta_id, partida.centro_custo_id)
+        indice = 0 if partida.tipo == TipoPartida.DEBITO else 1
+        deltas[chave][indice] += Decimal(partida.valor) * sinal
+
+    aplicar_deltas(db, {
+        (conta_id, centro_custo_id, ano_mes): valores
+        for (conta_id, centro_custo_id), valores in deltas.items()
+    })
+
+
+def aplicar_deltas(db: Session, deltas: Dict[Tuple[int, int, int], list]) -> None:
+    """Aplica deltas {(conta_id, centro_custo_id, ano_mes): [debitos, creditos]}"""
+    if not deltas:
+        return
+
+    stmt = insert_dialeto(db, SaldoMensal).values([
+        {
+            "conta_id": conta_id,
+            "centro_custo_id": centro_custo_id,
+            "ano_mes": ano_mes,
+            "debitos": debitos,
+            "creditos": creditos,
+        }
+        for (conta_id, centro_custo_id, ano_mes), (debitos, creditos) in deltas.items()
+    ])
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[
+            SaldoMensal.conta_id,
+            func.coalesce(SaldoMensal.centro_custo_id, literal_column("0")),
+            SaldoMensal.ano_mes,
+        ],
+        set_={
+            "debitos": SaldoMensal.debitos + stmt.excluded.debitos,
+            "creditos": SaldoMensal.creditos + stmt.excluded.creditos,
+        }
+    )
+    db.execute(stmt)
+
+
+def reconstruir_saldos_mensais(db: Session) -> int:
+    """
+    Recalcula toda a tabela a partir das partidas (backfill).
+
+    Retorna o número de linhas geradas. Não faz commit.
+    """
+    ano_mes = expr_ano_mes(Lancamento.data_lancamento)
+    agregado = select(
+        Partida.conta_id,
+        Partida.centro_custo_id,
+        ano_mes.label("ano_mes"),
+        func.coalesce(func.sum(case((Partida.tipo == "DEBITO", Partida.valor), else_=0)), 0),
+        func.coalesce(func.sum(case((Partida.tipo == "CREDITO", Partida.valor), else_=0)), 0),
+    ).join(
+        Lancamento, Partida.lancamento_id == Lancamento.id
+    ).group_by(
+        Partida.conta_id, Partida.centro_custo_id, ano_mes
+    )
+
+    db.execute(delete(SaldoMensal))
+    resultado = db.execute(
+        SaldoMensal.__table__.insert().from_select(
+            ["conta_id", "centro_custo_id", "ano_mes", "debitos", "creditos"],
+            agregado
+        )
+    )
+    return resultado.rowcount
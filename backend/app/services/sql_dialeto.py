@@ -0,0 +1,15 @@
+"""
+INSERT com ON CONFLICT no dialeto da sessão (PostgreSQL; SQLite nos testes)
+"""
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+
+def insert_dialeto(db: Session, modelo):
+    """insert() do dialeto da sessão, com on_conflict_do_nothing/do_update"""
+    dialeto = db.get_bind().dialect.name
+    if dialeto == "postgresql":
+        return postgresql.insert(modelo)
+    if dialeto == "sqlite":
+        return sqlite.insert(modelo)
+    raise NotImplementedError(f"INSERT ... ON CONFLICT não suportado para {dialeto}")
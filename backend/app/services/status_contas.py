@@ -0,0 +1,67 @@
+"""
+Status de vencimento das contas a pagar / a receber
+
+As contas pendentes com vencimento passado passam a VENCIDO (pagar) ou
+ATRASADO (receber) por um UPDATE em lote, executado uma vez por dia pelo
+agendador (app.agendador) ou pelo script atualizar_status_contas.py.
+
+Entre uma execução e outra as leituras mostram o status efetivo, calculado
+sem gravar nada: pendente + vencimento < hoje é exibido como atrasado.
+"""
+from datetime import date
+from typing import Dict, Optional
+
+from sqlalchemy import update, and_, or_
+from sqlalchemy.orm import Session
+
+from app.models.conta_pagar import ContaPagar, StatusContaPagar
+from app.models.conta_receber import ContaReceber, StatusContaReceber
+
+# Modelo -> (status pendente, status de atraso)
+TRANSICOES_VENCIMENTO = {
+    ContaPagar: (StatusContaPagar.A_VENCER, StatusContaPagar.VENCIDO),
+    ContaReceber: (StatusContaReceber.A_RECEBER, StatusContaReceber.ATRASADO),
+}
+
+
+def atualizar_status_vencidos(db: Session, hoje: Optional[date] = None) -> Dict[str, int]:
+    """
+    Marca como atrasadas as contas pendentes vencidas (um UPDATE por tabela).
+
+    Retorna o número de contas alteradas por tabela. Não faz commit.
+    """
+    hoje = hoje or date.today()
+    alteradas = {}
+    for modelo, (pendente, atrasado) in TRANSICOES_VENCIMENTO.items():
+        resultado = db.execute(
+            update(modelo)
+            .where(modelo.status == pendente, modelo.data_vencimento < hoje)
+            .values(status=atrasado)
+            .execution_options(synchronize_session=False)
+        )
+        alteradas[modelo.__tablename__] = resultado.rowcount
+    return alteradas
+
+
+def filtro_status_efetivo(modelo, status, hoje: Optional[date] = None):
+    """Condição SQL para filtrar pelo status efetivo (o que a API exibe)"""
+    hoje = hoje or date.today()
+    pendente, atrasado = TRANSICOES_VENCIMENTO[modelo]
+    if status == pendente:
+        return and_(modelo.status == pendente, modelo.data_vencimento >= hoje)
+    if status == atrasado:
+        return or_(
+            modelo.status == atrasado,
+            and_(modelo.status == pendente, modelo.data_vencimento < hoje)
+        )
+    return modelo.status == status
+
+
+def com_status_efetivo(conta, schema, hoje: Optional[date] = None):
+    """Serializa a conta com o status efetivo, sem alterar o objeto do ORM"""
+    hoje = hoje or date.today()
+    pendente, atrasado = TRANSICOES_VENCIMENTO[type(conta)]
+    resposta = schema.model_validate(conta)
+    if conta.status == pendente and conta.data_vencimento < hoje:
+        resposta = resposta.model_copy(update={"status": atrasado})
+    return resposta
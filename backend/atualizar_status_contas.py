@@ -0,0 +1,35 @@
+"""
+Script para marcar contas pendentes vencidas como VENCIDO / ATRASADO e
+gerar as próximas contas recorrentes.
+
+São os jobs de contas executados diariamente pelo agendador da API (os de
+consumo de combustível e manutenções preventivas ficam só no agendador); use
+via cron quando a API rodar com AGENDADOR_ATIVO=false.
+Execute: python atualizar_status_contas.py
+"""
+import sys
+from pathlib import Path
+
+# Adiciona o diretório raiz ao path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from app.agendador import JOBS_CONTAS, executar_jobs_diarios
+
+
+def main():
+    try:
+        print("[INFO] Atualizando status de contas vencidas e recorrências...")
+        resultado = executar_jobs_diarios(JOBS_CONTAS)
+        falhas = resultado.pop("falhas", [])
+        for job, quantidade in resultado.items():
+            print(f"[OK] {job}: {quantidade} conta(s).")
+        if falhas:
+            print(f"[ERRO] Jobs com falha: {', '.join(falhas)}")
+            sys.exit(1)
+    except Exception as e:
+        print(f"[ERRO] {str(e)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""
+Benchmark de logins por segundo por worker
+
+Mede a vazão do caminho de login (verificação bcrypt no pool de processos
+de app.hash_senhas) com N logins concorrentes. Com --url, dispara os logins
+contra uma API em execução (POST /api/auth/login) em vez de chamar o pool
+diretamente.
+
+Uso:
+    python benchmark_login.py --logins 200 --concorrencia 20
+    python benchmark_login.py --url http://localhost:8000 --email admin@ajr.com --senha admin123
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+# Adicionar o diretório raiz ao path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from app.config import settings
+from app.hash_senhas import criar_contexto, verificar_senha_async, encerrar_pool
+
+
+async def _medir(total: int, concorrencia: int, login) -> float:
+    semaforo = asyncio.Semaphore(concorrencia)
+    falhas = 0
+
+    async def um_login():
+        nonlocal falhas
+        async with semaforo:
+            if not await login():
+                falhas += 1
+
+    inicio = time.perf_counter()
+    await asyncio.gather(*(um_login() for _ in range(total)))
+    duracao = time.perf_counter() - inicio
+    if falhas:
+        print(f"[ERRO] {falhas} logins falharam")
+    return duracao
+
+
+async def benchmark_pool(total: int, concorrencia: int) -> float:
+    senha = "senha-benchmark"
+    senha_hash = criar_contexto(settings.BCRYPT_ROUNDS).hash(senha)
+
+    async def login():
+        valida, _ = await verificar_senha_async(senha, senha_hash)
+        return valida
+
+    await login()  # aquece o pool de processos
+    return await _medir(total, concorrencia, login)
+
+
+async def benchmark_http(url: str, email: str, senha: str, total: int, concorrencia: int) -> float:
+    import httpx
+
+    async with httpx.AsyncClient(base_url=url, timeout=60) as cliente:
+        async def login():
+            resposta = await cliente.post("/api/auth/login", json={"email": email, "senha": senha})
+            return resposta.status_code == 200
+
+        await login()
+        return await _medir(total, concorrencia, login)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de logins por segundo")
+    parser.add_argument("--logins", type=int, default=100)
+    parser.add_argument("--concorrencia", type=int, default=10)
+    parser.add_argument("--url", help="URL da API (senão mede o pool de hash diretamente)")
+    parser.add_argument("--email")
+    parser.add_argument("--senha")
+    args = parser.parse_args()
+
+    print(f"[INFO] bcrypt rounds={settings.BCRYPT_ROUNDS} workers={settings.BCRYPT_WORKERS} "
+          f"logins={args.logins} concorrencia={args.concorrencia}")
+
+    if args.url:
+        if not args.email or not args.senha:
+            parser.error("--url requer --email e --senha")
+        duracao = asyncio.run(benchmark_http(args.url, args.email, args.senha, args.logins, args.concorrencia))
+    else:
+        try:
+            duracao = asyncio.run(benchmark_pool(args.logins, args.concorrencia))
+        finally:
+            encerrar_pool()
+
+    print(f"[OK] {args.logins} logins em {duracao:.2f}s = {args.logins / duracao:.1f} logins/s "
+          f"({duracao * 1000 / args.logins:.1f} ms/login)")
+
+
+if __name__ == "__main__":
+    main()
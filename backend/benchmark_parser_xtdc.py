@@ -0,0 +1,151 @@
+"""
+Benchmark do parser de balancetes XTDC (.LST)
+
+Compara o parser antigo (readlines + regex sem compilar + propriedades
+recalculadas + estatísticas com várias passadas) com o parser atual
+(iter_contas/parse_many), sobre os mesmos arquivos, e confere que os dois
+extraem as mesmas contas e as mesmas estatísticas.
+
+Uso:
+    python benchmark_parser_xtdc.py
+    python benchmark_parser_xtdc.py --pasta ../AJRNEWS/AJRNEWS/TRABALHO --repeticoes 20
+"""
+import argparse
+import os
+import re
+import sys
+import time
+from decimal import Decimal
+from pathlib import Path
+
+# Adicionar o diretório raiz ao path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from app.parsers.xtdc_balancete_parser import BalanceteXTDCParser, parse_many
+
+PASTA_PADRAO = Path(__file__).parent.parent / "AJRNEWS" / "AJRNEWS" / "TRABALHO"
+
+
+class _ContaLegada:
+    def __init__(self, codigo, nome, saldo_anterior, debitos, creditos, saldo_atual):
+        self.codigo = codigo
+        self.nome = nome
+        self.saldo_anterior = saldo_anterior
+        self.debitos = debitos
+        self.creditos = creditos
+        self.saldo_atual = saldo_atual
+
+    @property
+    def nivel(self):
+        return len([p for p in self.codigo.split('.') if p])
+
+    @property
+    def tipo_conta(self):
+        tipos = {'1': 'ATIVO', '2': 'PASSIVO', '3': 'PATRIMONIO_LIQUIDO', '4': 'RECEITA',
+                 '5': 'DESPESA', '6': 'DESPESA', '7': 'RECEITA'}
+        return tipos.get(self.codigo[0], 'ATIVO')
+
+    @property
+    def aceita_lancamento(self):
+        return self.nivel >= 3 or self.saldo_atual != 0 or self.debitos != 0 or self.creditos != 0
+
+
+def _valor_legado(valor_str):
+    if not valor_str:
+        return Decimal('0')
+    valor_str = valor_str.strip().replace('.', '').replace(',', '.')
+    if '(' in valor_str:
+        valor_str = '-' + valor_str.replace('(', '').replace(')', '')
+    try:
+        return Decimal(valor_str)
+    except Exception:
+        return Decimal('0')
+
+
+def parse_legado(caminho):
+    """Cópia do parser anterior, para comparação"""
+    contas = []
+    with open(caminho, 'r', encoding='latin1', errors='ignore') as f:
+        linhas = f.readlines()
+    for linha in linhas:
+        linha = linha.strip()
+        if not linha or 'NOME' in linha or '---' in linha or 'BALANCETE' in linha:
+            continue
+        match = re.match(r'^(\d+(?:\.\d+)*)\s+(.+?)(?:\s+([\d.,\-\(\)]+))?(?:\s+([\d.,\-\(\)]+))?(?:\s+([\d.,\-\(\)]+))?(?:\s+([\d.,\-\(\)]+))?$', linha)
+        if not match:
+            continue
+        contas.append(_ContaLegada(
+            match.group(1).strip(), match.group(2).strip(),
+            *(_valor_legado(match.group(i)) for i in range(3, 7))
+        ))
+
+    estatisticas = {
+        'total_contas': len(contas),
+        'por_tipo': {
+            tipo: len([c for c in contas if c.tipo_conta == tipo])
+            for tipo in ('ATIVO', 'PASSIVO', 'PATRIMONIO_LIQUIDO', 'RECEITA', 'DESPESA')
+        },
+        'por_nivel': {f'Nível {i}': len([c for c in contas if c.nivel == i]) for i in range(1, 6)},
+        'analiticas': len([c for c in contas if c.aceita_lancamento]),
+        'sinteticas': len([c for c in contas if not c.aceita_lancamento]),
+    }
+    return contas, estatisticas
+
+
+def parse_atual(caminho):
+    parser = BalanceteXTDCParser(caminho)
+    contas = parser.parse()
+    return contas, parser.get_estatisticas()
+
+
+def _chave(conta):
+    return (conta.codigo, conta.nome, conta.saldo_anterior, conta.debitos,
+            conta.creditos, conta.saldo_atual, conta.nivel, conta.tipo_conta,
+            conta.aceita_lancamento)
+
+
+def medir(funcao, arquivos, repeticoes):
+    melhor = None
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        for arquivo in arquivos:
+            funcao(arquivo)
+        duracao = time.perf_counter() - inicio
+        melhor = duracao if melhor is None else min(melhor, duracao)
+    return melhor
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark do parser de balancetes XTDC")
+    parser.add_argument("--pasta", default=str(PASTA_PADRAO), help="Pasta com os arquivos .LST")
+    parser.add_argument("--repeticoes", type=int, default=10)
+    args = parser.parse_args()
+
+    arquivos = sorted(str(p) for p in Path(args.pasta).glob("*.LST"))
+    if not arquivos:
+        print(f"[ERRO] Nenhum arquivo .LST em {args.pasta}")
+        sys.exit(1)
+
+    print(f"[INFO] {len(arquivos)} arquivos, {args.repeticoes} repetições (melhor tempo)")
+
+    for arquivo in arquivos:
+        contas_legado, stats_legado = parse_legado(arquivo)
+        contas_atual, stats_atual = parse_atual(arquivo)
+        if [_chave(c) for c in contas_legado] != [_chave(c) for c in contas_atual] \
+                or stats_legado != stats_atual:
+            print(f"[ERRO] Resultado diferente em {arquivo}")
+            sys.exit(1)
+    total_contas = sum(1 for _ in parse_many(arquivos))
+    print(f"[OK] Mesmas contas e estatísticas nos dois parsers ({total_contas} contas)")
+
+    legado = medir(parse_legado, arquivos, args.repeticoes)
+    atual = medir(parse_atual, arquivos, args.repeticoes)
+    streaming = medir(lambda arquivo: sum(1 for _ in parse_many([arquivo])), arquivos, args.repeticoes)
+
+    print(f"  Parser anterior:          {legado * 1000:8.1f} ms")
+    print(f"  parse() + estatísticas:   {atual * 1000:8.1f} ms ({legado / atual:.1f}x)")
+    print(f"  parse_many (streaming):   {streaming * 1000:8.1f} ms ({legado / streaming:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,77 +1,27 @@
 """
-Script para extrair dados do XTDC035.DAT
+Script para extrair dados do XTDC035.DAT (plano de contas)
 Salva resultados em temp/
+
+Lê os registros de 52 bytes com app.parsers.xtdc_dat (mmap, sem carregar o
+arquivo inteiro): código reduzido, classificação, nome e tipo da conta.
+O XTDC035 não guarda históricos padrão; os centros de custo são os grupos
+sintéticos de despesa por máquina, veículo e obra (3.2.xx.yy).
 """
+import sys
 from pathlib import Path
-import re
-
-
-def extrair_texto_legivel(arquivo_path):
-    """Extrai texto legível do arquivo binário"""
-    with open(arquivo_path, 'rb') as f:
-        data = f.read()
-
-    # Decodificar como latin1
-    texto = data.decode('latin1', errors='ignore')
-
-    # Filtrar apenas caracteres printáveis
-    texto_limpo = ''.join(c for c in texto if c.isprintable() or c in '\n\r\t ')
-
-    return texto_limpo
-
-
-def extrair_historicos(texto):
-    """Extrai históricos do texto"""
-    historicos = []
-
-    # Procurar padrões de histórico
-    # Exemplo: "0001 Pagamento de fornecedor"
-    linhas = texto.split('\n')
 
-    for linha in linhas:
-        linha = linha.strip()
-        if not linha:
-            continue
+# Adiciona o diretório raiz ao path
+sys.path.insert(0, str(Path(__file__).parent))
 
-        # Procurar por códigos numéricos seguidos de descrição
-        match = re.match(r'^(\d{3,4})\s+(.{10,}?)(?:\s{5,}|$)', linha)
-        if match:
-            codigo = match.group(1)
-            descricao = match.group(2).strip()
+from app.parsers.xtdc_dat import iter_plano_contas
 
-            if descricao and len(descricao) > 3:
-                historicos.append({
-                    'codigo': codigo,
-                    'descricao': descricao[:100]
-                })
 
-    return historicos
-
-
-def extrair_centros_custo(texto):
-    """Extrai centros de custo do texto"""
-    centros = []
-
-    linhas = texto.split('\n')
-
-    for linha in linhas:
-        linha = linha.strip()
-
-        # Procurar por padrões de centro de custo
-        if 'CUSTO' in linha.upper() or 'CENTRO' in linha.upper():
-            # Tentar extrair código e descrição
-            match = re.match(r'^(\w+)\s+(.{10,}?)(?:\s{5,}|$)', linha)
-            if match:
-                codigo = match.group(1)
-                descricao = match.group(2).strip()
-
-                if descricao and len(descricao) > 3:
-                    centros.append({
-                        'codigo': codigo,
-                        'descricao': descricao[:100]
-                    })
-
-    return centros
+def extrair_centros_custo(contas):
+    """Grupos de despesa por máquina/veículo/obra (sintéticas de nível 4 sob 3.2)"""
+    return [
+        conta for conta in contas
+        if conta.sintetica and conta.codigo.startswith('3.2.') and conta.codigo.count('.') == 3
+    ]
 
 
 def main():
@@ -93,44 +43,43 @@ def main():
     print(f"📁 Salvando em: {temp_path}")
     print()
 
-    # Extrair texto
-    texto = extrair_texto_legivel(arquivo_path)
+    contas = list(iter_plano_contas(str(arquivo_path)))
+    analiticas = sum(1 for conta in contas if not conta.sintetica)
+    print(f"✅ {len(contas)} contas lidas ({analiticas} analíticas)")
 
-    # Salvar texto completo
+    # Texto completo (uma conta por linha), usado por extrair_dados_xtdc035.py
     with open(temp_path / "xtdc035_texto_completo.txt", 'w', encoding='utf-8') as f:
-        f.write(texto)
+        for conta in contas:
+            f.write(f"{conta.codigo}  {conta.nome}\n")
     print(f"✅ Texto completo salvo em: temp/xtdc035_texto_completo.txt")
 
-    # Extrair históricos
-    print("\n🔍 Extraindo históricos...")
-    historicos = extrair_historicos(texto)
-
-    with open(temp_path / "xtdc035_historicos.txt", 'w', encoding='utf-8') as f:
-        f.write("HISTÓRICOS EXTRAÍDOS\n")
+    # Plano de contas com código reduzido
+    with open(temp_path / "xtdc035_plano_contas.txt", 'w', encoding='utf-8') as f:
+        f.write("PLANO DE CONTAS (reduzido;classificação;tipo;nome)\n")
         f.write("=" * 80 + "\n\n")
-        for h in historicos:
-            f.write(f"{h['codigo']} - {h['descricao']}\n")
-
-    print(f"✅ {len(historicos)} históricos encontrados")
-    print(f"   Salvo em: temp/xtdc035_historicos.txt")
+        for conta in contas:
+            tipo = 'S' if conta.sintetica else 'A'
+            f.write(f"{conta.reduzido};{conta.codigo};{tipo};{conta.nome}\n")
+    print(f"✅ Plano de contas salvo em: temp/xtdc035_plano_contas.txt")
 
     # Extrair centros de custo
     print("\n🔍 Extraindo centros de custo...")
-    centros = extrair_centros_custo(texto)
+    centros = extrair_centros_custo(contas)
 
     with open(temp_path / "xtdc035_centros_custo.txt", 'w', encoding='utf-8') as f:
         f.write("CENTROS DE CUSTO EXTRAÍDOS\n")
         f.write("=" * 80 + "\n\n")
         for c in centros:
-            f.write(f"{c['codigo']} - {c['descricao']}\n")
+            f.write(f"{c.codigo} - {c.nome}\n")
 
     print(f"✅ {len(centros)} centros de custo encontrados")
     print(f"   Salvo em: temp/xtdc035_centros_custo.txt")
 
-    # Amostra do texto
-    print("\n📋 AMOSTRA DO TEXTO (primeiros 500 chars):")
+    # Amostra
+    print("\n📋 AMOSTRA (primeiras 10 contas):")
     print("-" * 80)
-    print(texto[:500])
+    for conta in contas[:10]:
+        print(f"{conta.reduzido:>5}  {conta.codigo:<15} {conta.nome}")
     print("-" * 80)
 
     print(f"\n✅ Extração concluída!")
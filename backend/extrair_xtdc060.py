@@ -1,99 +1,101 @@
 """
-Script para extrair lançamentos contábeis do XTDC060.DAT
+Script para extrair lançamentos contábeis do XTDC
 Salva amostra em temp/ para análise
+
+Os lançamentos ficam em registros fixos de 30 bytes no XTDC019.DAT (uma
+partida por registro); o XTDC060.DAT guarda os textos de complemento dos
+históricos. Os dois são lidos com app.parsers.xtdc_dat (mmap, registro a
+registro), sem carregar o arquivo inteiro em memória.
 """
+import sys
+from collections import Counter
 from pathlib import Path
 
+# Adiciona o diretório raiz ao path
+sys.path.insert(0, str(Path(__file__).parent))
 
-def extrair_texto_legivel(arquivo_path):
-    """Extrai texto legível do arquivo binário"""
-    with open(arquivo_path, 'rb') as f:
-        data = f.read()
-
-    # Decodificar como latin1
-    texto = data.decode('latin1', errors='ignore')
-
-    # Filtrar apenas caracteres printáveis
-    texto_limpo = ''.join(c for c in texto if c.isprintable() or c in '\n\r\t ')
+from app.parsers.xtdc_dat import iter_partidas, iter_textos
 
-    return texto_limpo
+AMOSTRA = 50
 
 
 def main():
     print("=" * 80)
-    print("EXTRACAO DE LANCAMENTOS DO XTDC060.DAT")
+    print("EXTRACAO DE LANCAMENTOS DO XTDC (XTDC019.DAT / XTDC060.DAT)")
     print("=" * 80)
     print()
 
-    # Caminho do arquivo
-    arquivo_path = Path(__file__).parent.parent / "AJRNEWS" / "AJRNEWS" / "DADOS" / "XTDC060.DAT"
+    dados_path = Path(__file__).parent.parent / "AJRNEWS" / "AJRNEWS" / "DADOS"
+    partidas_path = dados_path / "XTDC019.DAT"
+    textos_path = dados_path / "XTDC060.DAT"
     temp_path = Path(__file__).parent / "temp"
     temp_path.mkdir(exist_ok=True)
 
-    if not arquivo_path.exists():
-        print(f"ERRO - Arquivo nao encontrado: {arquivo_path}")
-        return
-
-    print(f"Lendo: {arquivo_path}")
-    tamanho = arquivo_path.stat().st_size
-    print(f"Tamanho: {tamanho:,} bytes ({tamanho / 1024 / 1024:.2f} MB)")
+    for arquivo_path in (partidas_path, textos_path):
+        if not arquivo_path.exists():
+            print(f"ERRO - Arquivo nao encontrado: {arquivo_path}")
+            return
+        tamanho = arquivo_path.stat().st_size
+        print(f"Lendo: {arquivo_path} ({tamanho:,} bytes)")
     print(f"Salvando em: {temp_path}")
     print()
 
-    # Extrair texto
-    print("Extraindo texto legivel...")
-    texto = extrair_texto_legivel(arquivo_path)
-    print(f"OK - {len(texto):,} caracteres extraidos")
-
-    # Salvar texto completo
+    # Partidas: estatísticas em uma passada, amostra das primeiras
+    total_partidas = 0
+    lancamentos = set()
+    total_debito = total_credito = 0
+    primeira_data = ultima_data = None
+    por_ano = Counter()
+    amostra = []
+
+    for partida in iter_partidas(str(partidas_path)):
+        total_partidas += 1
+        lancamentos.add(partida.numero)
+        if partida.conta_debito:
+            total_debito += partida.valor
+        if partida.conta_credito:
+            total_credito += partida.valor
+        if partida.data:
+            primeira_data = min(primeira_data or partida.data, partida.data)
+            ultima_data = max(ultima_data or partida.data, partida.data)
+            por_ano[partida.data.year] += 1
+        if len(amostra) < AMOSTRA:
+            amostra.append(partida)
+
+    # Textos de complemento
     arquivo_saida = temp_path / "xtdc060_texto_completo.txt"
+    total_textos = 0
     with open(arquivo_saida, 'w', encoding='utf-8') as f:
-        f.write(texto)
-    print(f"OK - Texto completo salvo em: temp/xtdc060_texto_completo.txt")
+        for texto in iter_textos(str(textos_path)):
+            f.write(texto.texto + "\n")
+            total_textos += 1
+    print(f"OK - {total_textos:,} textos salvos em: temp/xtdc060_texto_completo.txt")
 
-    # Salvar amostra para análise
     arquivo_amostra = temp_path / "xtdc060_amostra.txt"
     with open(arquivo_amostra, 'w', encoding='utf-8') as f:
-        f.write("AMOSTRA DO XTDC060.DAT (primeiros 5000 caracteres)\n")
-        f.write("=" * 80 + "\n\n")
-        f.write(texto[:5000])
-        f.write("\n\n" + "=" * 80 + "\n")
-        f.write("AMOSTRA DO MEIO (caracteres 50000-55000)\n")
-        f.write("=" * 80 + "\n\n")
-        f.write(texto[50000:55000])
-        f.write("\n\n" + "=" * 80 + "\n")
-        f.write("AMOSTRA DO FINAL (ultimos 5000 caracteres)\n")
-        f.write("=" * 80 + "\n\n")
-        f.write(texto[-5000:])
+        f.write(f"AMOSTRA DO XTDC019.DAT (primeiras {AMOSTRA} partidas)\n")
+        f.write("=" * 80 + "\n")
+        f.write("chave;lancamento;data;debito;credito;valor;lote\n")
+        for p in amostra:
+            data = p.data.strftime('%d/%m/%Y') if p.data else ''
+            f.write(f"{p.chave};{p.numero};{data};{p.conta_debito};{p.conta_credito};{p.valor};{p.lote}\n")
     print(f"OK - Amostra salva em: temp/xtdc060_amostra.txt")
 
     # Estatísticas básicas
     print("\n" + "=" * 80)
     print("ESTATISTICAS")
     print("=" * 80)
-    print(f"  Total de linhas: {texto.count(chr(10)):,}")
-    print(f"  Total de caracteres: {len(texto):,}")
-
-    # Procurar por padrões conhecidos
-    padroes = {
-        'data (DD/MM/YY)': r'\d{2}/\d{2}/\d{2}',
-        'valor monetario': r'\d+,\d{2}',
-        'codigo conta': r'^\d+\.',
-    }
-
-    import re
-    print("\n  Padroes encontrados:")
-    for nome, padrao in padroes.items():
-        matches = re.findall(padrao, texto, re.MULTILINE)
-        if matches:
-            print(f"    {nome}: {len(matches):,} ocorrencias")
-            if len(matches) <= 5:
-                print(f"      Exemplos: {matches}")
-            else:
-                print(f"      Exemplos: {matches[:5]}")
+    print(f"  Partidas: {total_partidas:,}")
+    print(f"  Lancamentos: {len(lancamentos):,}")
+    if primeira_data:
+        print(f"  Periodo: {primeira_data:%d/%m/%Y} a {ultima_data:%d/%m/%Y}")
+    print(f"  Total a debito: {total_debito:,.2f}")
+    print(f"  Total a credito: {total_credito:,.2f}")
+    print("  Partidas por ano:")
+    for ano, quantidade in sorted(por_ano.items()):
+        print(f"    {ano}: {quantidade:,}")
 
     print("\nOK - Extracao concluida!")
-    print("\nProximo passo: Analisar amostra e criar parser de lancamentos")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,69 @@
+"""
+Script para importar os lançamentos contábeis do XTDC para o banco de dados
+
+Uso:
+    python import_lancamentos_xtdc.py
+    python import_lancamentos_xtdc.py --pasta ../AJRNEWS/AJRNEWS/DADOS --saida relatorio.json
+
+Lê as partidas (XTDC019.DAT) e o plano de contas (XTDC035.DAT) da pasta
+DADOS. O plano de contas deve ter sido importado antes (import_xtdc.py).
+Pode ser executado de novo: lançamentos já importados são ignorados.
+"""
+import argparse
+import json
+import sys
+from pathlib import Path
+
+# Adiciona o diretório raiz ao path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from app.database import SessionLocal
+from app.services.import_lancamentos_xtdc import HISTORICO_XTDC, ImportadorLancamentosXTDC
+
+# __file__ = backend/import_lancamentos_xtdc.py -> AJR-System/AJRNEWS/AJRNEWS/DADOS
+PASTA_PADRAO = Path(__file__).parent.parent / "AJRNEWS" / "AJRNEWS" / "DADOS"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Importa os lançamentos do razão XTDC (XTDC019/XTDC035)")
+    parser.add_argument("--pasta", default=str(PASTA_PADRAO), help="Pasta DADOS do XTDC")
+    parser.add_argument("--historico", default=HISTORICO_XTDC, help="Código do histórico dos lançamentos")
+    parser.add_argument("--saida", help="Grava o relatório JSON neste arquivo em vez de imprimir")
+    args = parser.parse_args()
+
+    pasta = Path(args.pasta)
+    partidas, plano = pasta / "XTDC019.DAT", pasta / "XTDC035.DAT"
+    for arquivo in (partidas, plano):
+        if not arquivo.exists():
+            print(f"[ERRO] Arquivo não encontrado: {arquivo}", file=sys.stderr)
+            sys.exit(1)
+
+    print(f"[INFO] Importando lançamentos de {pasta}", file=sys.stderr)
+
+    db = SessionLocal()
+    try:
+        relatorio = ImportadorLancamentosXTDC(db, historico_codigo=args.historico).importar(str(partidas), str(plano))
+    except Exception as e:
+        print(f"[ERRO] Erro na importação: {str(e)}", file=sys.stderr)
+        sys.exit(1)
+    finally:
+        db.close()
+
+    saida = json.dumps(relatorio, indent=2, ensure_ascii=False, default=str)
+    if args.saida:
+        Path(args.saida).write_text(saida, encoding="utf-8")
+        print(f"[OK] Relatório gravado em {args.saida}", file=sys.stderr)
+    else:
+        print(saida)
+
+    print(
+        f"[OK] {relatorio['lancamentos_criados']} lançamentos criados, "
+        f"{relatorio['lancamentos_existentes']} já existentes em {relatorio['tempos_ms']['total']} ms",
+        file=sys.stderr
+    )
+    if relatorio["contas_nao_encontradas"]:
+        print(f"[INFO] Contas não cadastradas: {', '.join(relatorio['contas_nao_encontradas'])}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
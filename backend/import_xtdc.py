@@ -3,140 +3,77 @@ Script para importar dados do XTDC para o banco de dados
 
 Uso:
     python import_xtdc.py
+    python import_xtdc.py --workers 4 --saida relatorio.json
+    python import_xtdc.py ../AJRNEWS/AJRNEWS/TRABALHO/XTDC77UR.LST ../AJRNEWS/AJRNEWS/TRABALHO/XTDCW2UA.LST
 
-O script procura automaticamente pelos arquivos .LST na pasta AJRNEWS
+Sem arquivos na linha de comando, importa todos os .LST da pasta AJRNEWS
+(TRABALHO), do mais antigo para o mais recente (o mais recente prevalece
+em códigos repetidos). Não pede confirmação; o relatório sai em JSON.
 """
-import os
+import argparse
+import json
 import sys
 from pathlib import Path
 
 # Adiciona o diretório raiz ao path
 sys.path.insert(0, str(Path(__file__).parent))
 
-from app.database import SessionLocal
-from app.services.import_xtdc import ImportadorXTDC
+# __file__ = backend/import_xtdc.py -> AJR-System/AJRNEWS/AJRNEWS/TRABALHO
+PASTA_PADRAO = Path(__file__).parent.parent / "AJRNEWS" / "AJRNEWS" / "TRABALHO"
 
 
 def main():
-    print("=" * 70)
-    print("IMPORTADOR DE DADOS DO XTDC")
-    print("=" * 70)
-    print()
+    parser = argparse.ArgumentParser(description="Importa o plano de contas dos balancetes XTDC (.LST)")
+    parser.add_argument("arquivos", nargs="*", help="Arquivos .LST (padrão: todos os da pasta)")
+    parser.add_argument("--pasta", default=str(PASTA_PADRAO), help="Pasta com os arquivos .LST")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="Processos de leitura (padrão: número de CPUs; 0 = sem pool)")
+    parser.add_argument("--saida", help="Grava o relatório JSON neste arquivo em vez de imprimir")
+    args = parser.parse_args()
+
+    if args.arquivos:
+        arquivos = [Path(arquivo) for arquivo in args.arquivos]
+    else:
+        pasta = Path(args.pasta)
+        if not pasta.exists():
+            print(f"[ERRO] Pasta não encontrada: {pasta}", file=sys.stderr)
+            sys.exit(1)
+        arquivos = sorted(pasta.glob("*.LST"), key=lambda p: (p.stat().st_mtime, p.name))
+
+    if not arquivos:
+        print("[ERRO] Nenhum arquivo .LST encontrado!", file=sys.stderr)
+        sys.exit(1)
+
+    print(f"[INFO] Importando {len(arquivos)} arquivos .LST", file=sys.stderr)
+
+    # Importados aqui: os processos de leitura (spawn) reimportam este
+    # script e só precisam do parser
+    from app.database import SessionLocal
+    from app.services.pipeline_xtdc import importar_balancetes
 
-    # Caminho para os arquivos do XTDC
-    # __file__ = backend/import_xtdc.py
-    # parent = backend/
-    # parent.parent = AJR-System/
-    base_path = Path(__file__).parent.parent / "AJRNEWS" / "AJRNEWS"
-    trabalho_path = base_path / "TRABALHO"
-
-    print(f"Procurando arquivos em: {trabalho_path}")
-    print()
-
-    if not trabalho_path.exists():
-        print(f"❌ ERRO: Pasta não encontrada: {trabalho_path}")
-        return
-
-    # Procurar arquivos .LST
-    arquivos_lst = list(trabalho_path.glob("*.LST"))
-
-    if not arquivos_lst:
-        print("❌ Nenhum arquivo .LST encontrado!")
-        return
-
-    print(f"✅ Encontrados {len(arquivos_lst)} arquivos .LST")
-    print()
-
-    # Confirmar importação de todos
-    print(f"Deseja importar TODOS os {len(arquivos_lst)} arquivos? (s/n)")
-    confirmacao = input("> ").strip().lower()
-
-    if confirmacao != 's':
-        print("❌ Importação cancelada!")
-        return
-
-    print()
-    print("=" * 70)
-    print("INICIANDO IMPORTAÇÃO...")
-    print("=" * 70)
-    print()
-
-    # Criar sessão do banco
     db = SessionLocal()
-
     try:
-        # Importar TODOS os arquivos
-        importador = ImportadorXTDC(db)
-
-        total_contas_criadas = 0
-        total_contas_existentes = 0
-        total_contas_erro = 0
-
-        for i, arquivo in enumerate(arquivos_lst, 1):
-            print(f"\n[{i}/{len(arquivos_lst)}] Processando: {arquivo.name}")
-            print("-" * 70)
-
-            try:
-                stats = importador.importar_plano_contas_de_balancete(str(arquivo))
-
-                total_contas_criadas += stats['importacao']['contas_criadas']
-                total_contas_existentes += stats['importacao']['contas_existentes']
-                total_contas_erro += stats['importacao']['contas_erro']
-
-                print(f"  ✅ {stats['importacao']['contas_criadas']} contas criadas, "
-                      f"{stats['importacao']['contas_existentes']} já existentes")
-
-            except Exception as e:
-                print(f"  ❌ Erro: {str(e)}")
-                total_contas_erro += 1
-
-        # Estatísticas finais consolidadas
-        stats = {
-            'importacao': {
-                'contas_criadas': total_contas_criadas,
-                'contas_existentes': total_contas_existentes,
-                'contas_erro': total_contas_erro,
-            }
-        }
-
-        print()
-        print("=" * 70)
-        print("IMPORTAÇÃO CONCLUÍDA!")
-        print("=" * 70)
-        print()
-
-        # Mostrar estatísticas finais
-        print("📊 ESTATÍSTICAS FINAIS:")
-        print()
-        print(f"  Arquivos processados: {len(arquivos_lst)}")
-        print(f"  Contas criadas: {stats['importacao']['contas_criadas']}")
-        print(f"  Contas já existentes: {stats['importacao']['contas_existentes']}")
-        print(f"  Erros: {stats['importacao']['contas_erro']}")
-        print()
-
-        if importador.erros:
-            print("⚠️  AVISOS/ERROS:")
-            for erro in importador.erros:
-                print(f"  - {erro}")
-            print()
-
-        print("✅ Dados importados com sucesso no PostgreSQL!")
-        print()
-        print("💡 Verifique no DBeaver ou acesse http://localhost:8000/docs")
-
+        relatorio = importar_balancetes(db, arquivos, workers=args.workers)
     except Exception as e:
-        print()
-        print("=" * 70)
-        print("❌ ERRO NA IMPORTAÇÃO!")
-        print("=" * 70)
-        print()
-        print(f"Erro: {str(e)}")
-        import traceback
-        traceback.print_exc()
-
+        print(f"[ERRO] Erro na importação: {str(e)}", file=sys.stderr)
+        sys.exit(1)
     finally:
         db.close()
 
+    saida = json.dumps(relatorio, indent=2, ensure_ascii=False, default=str)
+    if args.saida:
+        Path(args.saida).write_text(saida, encoding="utf-8")
+        print(f"[OK] Relatório gravado em {args.saida}", file=sys.stderr)
+    else:
+        print(saida)
+
+    importacao = relatorio["importacao"]
+    print(
+        f"[OK] {importacao['contas_criadas']} contas criadas, "
+        f"{importacao['contas_existentes']} já existentes em {relatorio['tempos_ms']['total']} ms",
+        file=sys.stderr
+    )
+
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,34 @@
+"""
+Script para recalcular o hodômetro atual dos equipamentos a partir das
+viagens (km_final) e abastecimentos (km_hodometro).
+
+Use após importações diretas no banco ou para o backfill inicial.
+Execute: python recalcular_hodometros.py
+"""
+import sys
+from pathlib import Path
+
+# Adiciona o diretório raiz ao path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from app.database import SessionLocal
+from app.services.hodometro import recalcular_hodometros
+
+
+def main():
+    db = SessionLocal()
+    try:
+        print("[INFO] Recalculando hodômetros...")
+        equipamentos = recalcular_hodometros(db)
+        db.commit()
+        print(f"[OK] {equipamentos} equipamentos atualizados.")
+    except Exception as e:
+        db.rollback()
+        print(f"[ERRO] {str(e)}")
+        sys.exit(1)
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
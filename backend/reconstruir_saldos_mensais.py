@@ -0,0 +1,33 @@
+"""
+Script para reconstruir a tabela saldos_mensais a partir das partidas.
+
+Use após importações diretas no banco ou para o backfill inicial.
+Execute: python reconstruir_saldos_mensais.py
+"""
+import sys
+from pathlib import Path
+
+# Adiciona o diretório raiz ao path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from app.database import SessionLocal
+from app.services.saldos_mensais import reconstruir_saldos_mensais
+
+
+def main():
+    db = SessionLocal()
+    try:
+        print("[INFO] Reconstruindo saldos mensais...")
+        linhas = reconstruir_saldos_mensais(db)
+        db.commit()
+        print(f"[OK] {linhas} saldos mensais gerados.")
+    except Exception as e:
+        db.rollback()
+        print(f"[ERRO] {str(e)}")
+        sys.exit(1)
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,8 +1,20 @@
+import os
+
+# Sem jobs em segundo plano contra o banco real durante os testes
+os.environ["AGENDADOR_ATIVO"] = "false"
+
 import pytest
 from fastapi.testclient import TestClient
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
 from sqlalchemy.orm import sessionmaker
-from app.database import Base, get_db
+from sqlalchemy.pool import NullPool
+from app.auth import get_password_hash
+from app.database import Base, get_db, get_async_db
+from app.models.usuario import Usuario
+from app.cache_usuarios import limpar_cache_usuarios
+from app.services.custos_equipamentos import invalidar_custos_equipamentos
+from app.services.fluxo_caixa import invalidar_projecao_fluxo_caixa
 from app.main import app
 
 # Banco de dados de teste em memória
@@ -13,6 +25,15 @@ engine = create_engine(
 )
 TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Mesmo arquivo via aiosqlite para as rotas assíncronas (NullPool: cada
+# TestClient roda em um event loop próprio)
+async_engine = create_async_engine(
+    "sqlite+aiosqlite:///./test.db", poolclass=NullPool
+)
+TestingAsyncSessionLocal = async_sessionmaker(
+    async_engine, autoflush=False, expire_on_commit=False
+)
+
 
 @pytest.fixture(scope="function")
 def db():
@@ -35,10 +56,50 @@ def client(db):
         finally:
             pass
 
+    async def override_get_async_db():
+        async with TestingAsyncSessionLocal() as async_db:
+            yield async_db
+
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_async_db] = override_get_async_db
     with TestClient(app) as test_client:
         yield test_client
     app.dependency_overrides.clear()
+    limpar_cache_usuarios()
+    invalidar_projecao_fluxo_caixa()
+    invalidar_custos_equipamentos()
+
+
+@pytest.fixture
+def contador_queries():
+    """Lista os SQLs executados no banco de teste enquanto ativa (detecta N+1)"""
+    statements = []
+
+    def registrar(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    engines = [engine, async_engine.sync_engine]
+    for e in engines:
+        event.listen(e, "before_cursor_execute", registrar)
+    try:
+        yield statements
+    finally:
+        for e in engines:
+            event.remove(e, "before_cursor_execute", registrar)
+
+
+@pytest.fixture
+def admin_token(client, db):
+    """Cria um admin direto no banco e retorna seu token"""
+    db.add(Usuario(
+        nome="Administrador",
+        email="admin@ajr.com",
+        senha_hash=get_password_hash("admin123"),
+        is_admin=True
+    ))
+    db.commit()
+    response = client.post("/api/auth/login", json={"email": "admin@ajr.com", "senha": "admin123"})
+    return response.json()["access_token"]
 
 
 # Fixtures de dados de teste
@@ -0,0 +1,24 @@
+from datetime import date, timedelta
+from decimal import Decimal
+
+from app.agendador import JOBS_CONTAS, executar_jobs_diarios
+from app.models.conta_pagar import ContaPagar, StatusContaPagar
+from tests.conftest import TestingSessionLocal
+
+
+def test_falha_de_um_job_nao_desfaz_os_outros(db):
+    """Testa que cada job diário roda na sua transação"""
+    db.add(ContaPagar(descricao="Aluguel", valor=Decimal("100"), data_vencimento=date.today() - timedelta(days=3)))
+    db.commit()
+
+    def job_com_erro(sessao):
+        sessao.add(ContaPagar(descricao="Não gravada", valor=Decimal("1"), data_vencimento=date.today()))
+        sessao.flush()
+        raise RuntimeError("falha simulada")
+
+    resultado = executar_jobs_diarios(JOBS_CONTAS + [("com_erro", job_com_erro)], TestingSessionLocal)
+
+    assert resultado["falhas"] == ["com_erro"]
+    assert resultado["vencidas_contas_pagar"] == 1
+    db.expire_all()
+    assert [(c.descricao, c.status) for c in db.query(ContaPagar)] == [("Aluguel", StatusContaPagar.VENCIDO)]
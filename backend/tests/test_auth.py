@@ -0,0 +1,116 @@
+import pytest
+
+from app.models.usuario import Usuario
+
+
+def _token(client, email, senha="senha123"):
+    client.post("/api/auth/register", json={"nome": "Usuário Teste", "email": email, "senha": senha})
+    return client.post("/api/auth/login", json={"email": email, "senha": senha}).json()["access_token"]
+
+
+def test_usuario_autenticado_em_cache(client, contador_queries):
+    """Testa que requisições autenticadas seguintes não consultam usuarios"""
+    token = _token(client, "usuario@ajr.com")
+    headers = {"Authorization": f"Bearer {token}"}
+
+    response = client.get("/api/auth/me", headers=headers)
+    assert response.status_code == 200
+    assert response.json()["email"] == "usuario@ajr.com"
+
+    contador_queries.clear()
+    client.get("/api/auth/me", headers=headers)
+    consultas_usuarios = [s for s in contador_queries if "FROM usuarios" in s]
+    # Só a consulta do próprio /me (dados completos); a autenticação veio do cache
+    assert len(consultas_usuarios) == 1
+
+
+def test_desativar_usuario_invalida_cache(client, admin_token):
+    """Testa que desativar um usuário vale já na próxima requisição"""
+    token = _token(client, "usuario@ajr.com")
+    headers = {"Authorization": f"Bearer {token}"}
+    user_id = client.get("/api/auth/me", headers=headers).json()["id"]
+
+    response = client.delete(f"/api/auth/users/{user_id}", headers={"Authorization": f"Bearer {admin_token}"})
+    assert response.status_code == 204
+
+    assert client.get("/api/auth/me", headers=headers).status_code == 403
+
+
+def test_alterar_email_invalida_cache(client, admin_token):
+    """Testa que o token do email antigo deixa de autenticar após a troca"""
+    token = _token(client, "antigo@ajr.com")
+    headers = {"Authorization": f"Bearer {token}"}
+    user_id = client.get("/api/auth/me", headers=headers).json()["id"]
+
+    response = client.patch(
+        f"/api/auth/users/{user_id}",
+        json={"email": "novo@ajr.com"},
+        headers={"Authorization": f"Bearer {admin_token}"}
+    )
+    assert response.status_code == 200
+
+    assert client.get("/api/auth/me", headers=headers).status_code == 401
+
+
+def test_alterar_senha_valida_usuario_antes_do_hash(client, admin_token, monkeypatch):
+    """Id inexistente volta 404 sem gastar um hash; id válido troca a senha"""
+    from app.routers import auth
+
+    chamadas = []
+    gerar_hash_async = auth.gerar_hash_async
+
+    async def contar_hash(senha):
+        chamadas.append(senha)
+        return await gerar_hash_async(senha)
+
+    monkeypatch.setattr(auth, "gerar_hash_async", contar_hash)
+    admin = {"Authorization": f"Bearer {admin_token}"}
+
+    response = client.patch("/api/auth/users/9999", json={"senha": "nova12345"}, headers=admin)
+    assert response.status_code == 404
+    assert chamadas == []
+
+    _token(client, "troca@ajr.com")
+    user_id = next(u["id"] for u in client.get("/api/auth/users", headers=admin).json()
+                   if u["email"] == "troca@ajr.com")
+    chamadas.clear()
+    response = client.patch(f"/api/auth/users/{user_id}", json={"senha": "nova12345", "nome": "Novo"}, headers=admin)
+    assert response.status_code == 200 and response.json()["nome"] == "Novo"
+    assert chamadas == ["nova12345"]
+    assert client.post("/api/auth/login", json={"email": "troca@ajr.com", "senha": "nova12345"}).status_code == 200
+
+
+def test_login_regrava_hash_com_custo_atual(client, db):
+    """Testa rehash transparente no login quando o custo do bcrypt mudou"""
+    from app.config import settings
+    from app.hash_senhas import criar_contexto
+
+    custo_antigo = 4 if settings.BCRYPT_ROUNDS != 4 else 5
+    db.add(Usuario(
+        nome="Usuário Antigo",
+        email="antigo@ajr.com",
+        senha_hash=criar_contexto(custo_antigo).hash("senha123")
+    ))
+    db.commit()
+
+    response = client.post("/api/auth/login", json={"email": "antigo@ajr.com", "senha": "senha123"})
+    assert response.status_code == 200
+
+    db.expire_all()
+    usuario = db.query(Usuario).filter(Usuario.email == "antigo@ajr.com").one()
+    assert usuario.senha_hash.split("$")[2] == f"{settings.BCRYPT_ROUNDS:02d}"
+
+    response = client.post("/api/auth/login", json={"email": "antigo@ajr.com", "senha": "errada"})
+    assert response.status_code == 401
+
+
+def test_pool_de_hash_encerrado_no_shutdown(client):
+    """O pool de processos do bcrypt é encerrado junto com a aplicação"""
+    from fastapi.testclient import TestClient
+    from app import hash_senhas
+    from app.main import app
+
+    with TestClient(app) as test_client:
+        _token(test_client, "pool@ajr.com")
+        assert hash_senhas._executor is not None
+    assert hash_senhas._executor is None
@@ -0,0 +1,61 @@
+from datetime import date, timedelta
+from decimal import Decimal
+
+from app.models.abastecimento import Abastecimento
+from app.models.consumo_abastecimento import ConsumoAbastecimento
+from app.models.equipamento import Equipamento
+
+
+def _abastecer(db, equipamento_id, dia, km, litros):
+    abastecimento = Abastecimento(
+        equipamento_id=equipamento_id, data_abastecimento=date(2025, 1, 1) + timedelta(days=dia),
+        tipo_combustivel="DIESEL", litros=Decimal(litros), valor_litro=Decimal("6"),
+        valor_total=Decimal(litros) * 6, km_hodometro=Decimal(km) if km is not None else None,
+    )
+    db.add(abastecimento)
+    return abastecimento
+
+
+def test_consumo_incremental_e_anomalias(client, db):
+    """Testa km/l por intervalo, anomalias e atualização só dos abastecimentos novos"""
+    equipamento = Equipamento(tipo="CAMINHAO", identificador="CAM-001", modelo="Cargo", marca="Ford")
+    db.add(equipamento)
+    db.flush()
+    # Intervalos de 500 km com 100 l (5 km/l) e um de 500 km com 250 l (2 km/l)
+    km = 10000
+    _abastecer(db, equipamento.id, 0, km, "100")
+    for dia, litros in enumerate(["100"] * 12 + ["250"], start=1):
+        km += 500
+        _abastecer(db, equipamento.id, dia, km, litros)
+    _abastecer(db, equipamento.id, 14, None, "50")  # sem hodômetro: ignorado
+    db.commit()
+
+    assert client.get("/abastecimentos/consumo").json()["intervalos"] == []  # GET não processa
+    assert client.post("/abastecimentos/consumo/atualizar").json()["processados"] == 14
+    dados = client.get("/abastecimentos/consumo").json()
+
+    intervalos = dados["intervalos"]
+    assert intervalos[-1]["km_rodados"] is None  # primeiro abastecimento
+    assert Decimal(str(intervalos[1]["km_por_litro"])) == Decimal("5")
+    assert intervalos[0]["anomalia"] == "CONSUMO_ALTO"
+    assert [i["anomalia"] for i in intervalos[1:]] == [None] * 13
+    resumo = dados["equipamentos"][0]
+    assert resumo["anomalias"] == 1 and Decimal(str(resumo["km_por_litro"])) == Decimal("5")
+
+    # Novo abastecimento: só ele é processado, com o anterior como âncora
+    _abastecer(db, equipamento.id, 15, km - 100, "40")
+    db.commit()
+    assert client.post("/abastecimentos/consumo/atualizar").json()["processados"] == 1
+    dados = client.get("/abastecimentos/consumo", params={"apenas_anomalias": True}).json()
+    assert [(i["anomalia"], Decimal(str(i["km_rodados"]))) for i in dados["intervalos"]] == [
+        ("HODOMETRO_REGREDIU", Decimal("-100")), ("CONSUMO_ALTO", Decimal("500")),
+    ]
+
+    # Alterar um abastecimento antigo recalcula a partir da data dele
+    primeiro = db.query(Abastecimento).order_by(Abastecimento.id).first()
+    response = client.put(f"/abastecimentos/{primeiro.id}", json={"km_hodometro": "9900"})
+    assert response.status_code == 200
+    assert db.query(ConsumoAbastecimento).count() == 0
+    assert client.post("/abastecimentos/consumo/atualizar").json()["processados"] == 15
+    dados = client.get("/abastecimentos/consumo").json()
+    assert Decimal(str(dados["intervalos"][-2]["km_rodados"])) == Decimal("600")
@@ -0,0 +1,156 @@
+from datetime import date, timedelta
+
+import pytest
+
+
+@pytest.fixture
+def contas_pagar_setup(client):
+    """Contas em aberto em cada faixa do resumo, mais uma já paga"""
+    hoje = date.today()
+    contas = [
+        ("Aluguel", "0.10", hoje, "ALUGUEL", "Imobiliária"),
+        ("Diesel", "0.20", hoje + timedelta(days=3), "COMBUSTIVEL", "Posto"),
+        ("Pneus", "1000.05", hoje + timedelta(days=20), "MANUTENCAO", "Posto"),
+        ("Seguro", "300.00", hoje - timedelta(days=5), "SEGURO", None),
+        ("Longe", "999.00", hoje + timedelta(days=60), "OUTROS", None),
+    ]
+    ids = []
+    for descricao, valor, vencimento, categoria, fornecedor in contas:
+        ids.append(client.post("/contas-pagar/", json={
+            "descricao": descricao,
+            "valor": valor,
+            "data_vencimento": vencimento.isoformat(),
+            "categoria": categoria,
+            "fornecedor_nome": fornecedor,
+        }).json()["id"])
+
+    pago = client.post("/contas-pagar/", json={
+        "descricao": "Pago", "valor": "50.00", "data_vencimento": hoje.isoformat()
+    }).json()["id"]
+    client.put(f"/contas-pagar/{pago}", json={"status": "PAGO"})
+    return ids
+
+
+def test_resumo_contas_pagar(client, contas_pagar_setup, contador_queries):
+    """Testa as faixas do resumo calculadas em uma única query (totais decimais exatos)"""
+    contador_queries.clear()
+    response = client.get("/contas-pagar/resumo")
+    assert response.status_code == 200
+    assert len(contador_queries) == 1
+
+    data = response.json()
+    assert data["hoje"] == {"total": "0.10", "quantidade": 1}
+    assert data["semana"] == {"total": "0.30", "quantidade": 2}
+    assert data["mes"] == {"total": "1000.35", "quantidade": 3}
+    assert data["vencidas"] == {"total": "300.00", "quantidade": 1}
+    assert "grupos" not in data
+
+
+def test_resumo_contas_pagar_por_fornecedor(client, contas_pagar_setup):
+    """Testa o resumo agrupado por fornecedor"""
+    response = client.get("/contas-pagar/resumo?agrupar_por=fornecedor")
+    assert response.status_code == 200
+    data = response.json()
+    grupos = {g["chave"]: g for g in data["grupos"]}
+
+    assert grupos["Posto"]["mes"] == {"total": "1000.25", "quantidade": 2}
+    assert grupos["Imobiliária"]["hoje"]["quantidade"] == 1
+    assert grupos[None]["vencidas"]["total"] == "300.00"
+    assert data["mes"]["quantidade"] == 3
+
+    assert client.get("/contas-pagar/resumo?agrupar_por=cliente").status_code == 422
+
+
+def test_listagem_nao_altera_status(client, db, contas_pagar_setup):
+    """Testa que a listagem mostra o status efetivo sem gravar"""
+    from app.models.conta_pagar import ContaPagar, StatusContaPagar
+    from app.services.status_contas import atualizar_status_vencidos
+
+    seguro_id = contas_pagar_setup[3]
+    vencidas = client.get("/contas-pagar/?status_filter=VENCIDO").json()
+    assert [c["id"] for c in vencidas] == [seguro_id]
+    assert client.get(f"/contas-pagar/{seguro_id}").json()["status"] == "VENCIDO"
+    a_vencer = client.get("/contas-pagar/?status_filter=A_VENCER").json()
+    assert seguro_id not in [c["id"] for c in a_vencer]
+
+    db.expire_all()
+    assert db.get(ContaPagar, seguro_id).status == StatusContaPagar.A_VENCER
+
+    # Job diário grava a transição em lote
+    assert atualizar_status_vencidos(db)["contas_pagar"] == 1
+    db.commit()
+    db.expire_all()
+    assert db.get(ContaPagar, seguro_id).status == StatusContaPagar.VENCIDO
+    assert atualizar_status_vencidos(db)["contas_pagar"] == 0
+
+
+def test_criar_conta_pagar_parcelado(client):
+    """Testa o parcelamento em N contas com divisão exata dos centavos"""
+    response = client.post("/contas-pagar/parcelado", json={
+        "descricao": "Financiamento caminhão",
+        "valor": "1000.00",
+        "data_vencimento": "2025-01-31",
+        "parcelas": 3,
+        "categoria": "FINANCIAMENTO",
+    })
+    assert response.status_code == 201
+    parcelas = response.json()
+    assert [p["valor"] for p in parcelas] == ["333.34", "333.33", "333.33"]
+    assert [p["data_vencimento"] for p in parcelas] == ["2025-01-31", "2025-02-28", "2025-03-31"]
+    assert [p["parcela_numero"] for p in parcelas] == [1, 2, 3]
+    assert parcelas[0]["descricao"] == "Financiamento caminhão (1/3)"
+    assert len({p["grupo_parcelamento"] for p in parcelas}) == 1
+    assert all(p["parcela_total"] == 3 for p in parcelas)
+
+
+def test_recorrencia_materializada_idempotente(client, db):
+    """Testa a geração das recorrências até o horizonte, sem duplicar"""
+    from app.models.conta_pagar import ContaPagar
+    from app.services.geracao_contas import materializar_recorrentes, HORIZONTE_MESES
+
+    hoje = date.today()
+    dia = min(hoje.day, 28)
+    response = client.post("/contas-pagar/", json={
+        "descricao": "Aluguel galpão",
+        "valor": "5000.00",
+        "data_vencimento": hoje.replace(day=dia).isoformat(),
+        "recorrente": True,
+        "dia_vencimento_recorrente": dia,
+    })
+    assert response.status_code == 201
+    grupo = response.json()["grupo_parcelamento"]
+    assert grupo
+
+    serie = db.query(ContaPagar).filter(ContaPagar.grupo_parcelamento == grupo).all()
+    assert len(serie) == HORIZONTE_MESES + 1
+    assert all(c.data_vencimento.day == dia for c in serie)
+
+    assert materializar_recorrentes(db, ContaPagar) == 0
+    # Horizonte avançou um mês: só a conta nova é gerada
+    assert materializar_recorrentes(db, ContaPagar, hoje=hoje + timedelta(days=31)) == 1
+
+
+def test_recorrencia_legada_sem_grupo(db):
+    """Conta recorrente antiga, sem grupo, vira a parcela 1 da série e é materializada"""
+    from decimal import Decimal
+    from app.models.conta_pagar import ContaPagar, StatusContaPagar
+    from app.services.geracao_contas import materializar_recorrentes
+
+    legada = ContaPagar(
+        descricao="Internet", valor=Decimal("200.00"), data_vencimento=date(2025, 1, 15),
+        status=StatusContaPagar.A_VENCER, recorrente=True, dia_vencimento_recorrente=15,
+    )
+    db.add(legada)
+    db.commit()
+
+    assert materializar_recorrentes(db, ContaPagar, hoje=date(2025, 1, 20), horizonte_meses=3) == 3
+    db.commit()
+    db.refresh(legada)
+    assert legada.grupo_parcelamento == f"legado-{legada.id}" and legada.parcela_numero == 1
+    serie = db.query(ContaPagar).filter(
+        ContaPagar.grupo_parcelamento == legada.grupo_parcelamento
+    ).order_by(ContaPagar.parcela_numero).all()
+    assert [c.data_vencimento for c in serie] == [
+        date(2025, 1, 15), date(2025, 2, 15), date(2025, 3, 15), date(2025, 4, 15),
+    ]
+    assert materializar_recorrentes(db, ContaPagar, hoje=date(2025, 1, 20), horizonte_meses=3) == 0
@@ -0,0 +1,85 @@
+from datetime import date
+from decimal import Decimal
+
+from app.models.abastecimento import Abastecimento
+from app.models.cliente import Cliente
+from app.models.contrato_locacao import ContratoLocacao
+from app.models.equipamento import Equipamento
+from app.models.manutencao import Manutencao
+from app.models.motorista import Motorista
+from app.models.viagem import Viagem
+
+
+def test_custos_equipamentos(client, db, contador_queries):
+    """Testa custos, indicadores e receita por equipamento, com e sem agrupamento por mês"""
+    caminhao = Equipamento(tipo="CAMINHAO", identificador="CAM-001", modelo="Cargo", marca="Ford")
+    trator = Equipamento(tipo="TRATOR", identificador="TRA-001", modelo="7815", marca="Valtra")
+    cliente = Cliente(nome="Cliente", tipo_pessoa="J", cpf_cnpj="12.345.678/0001-90")
+    motorista = Motorista(nome="João", cpf="123.456.789-00", cnh="123", categoria_cnh="D",
+                          validade_cnh=date(2030, 1, 1))
+    db.add_all([caminhao, trator, cliente, motorista])
+    db.flush()
+
+    db.add_all([
+        Abastecimento(equipamento_id=caminhao.id, data_abastecimento=date(2025, 3, 5), tipo_combustivel="DIESEL",
+                      litros=Decimal("100"), valor_litro=Decimal("6"), valor_total=Decimal("600")),
+        Abastecimento(equipamento_id=caminhao.id, data_abastecimento=date(2025, 4, 5), tipo_combustivel="DIESEL",
+                      litros=Decimal("50"), valor_litro=Decimal("6"), valor_total=Decimal("300")),
+        Manutencao(equipamento_id=caminhao.id, tipo="CORRETIVA", status="CONCLUIDA", descricao="Freios",
+                   data_realizada=date(2025, 3, 10), valor_mao_obra=Decimal("150"), valor_pecas=Decimal("250")),
+        Manutencao(equipamento_id=caminhao.id, tipo="CORRETIVA", status="CANCELADA", descricao="Cancelada",
+                   data_agendada=date(2025, 3, 11), valor_total=Decimal("999")),
+        Viagem(equipamento_id=caminhao.id, motorista_id=motorista.id, data_viagem=date(2025, 3, 20),
+               origem="A", destino="B", km_inicial=Decimal("1000"), km_final=Decimal("2000")),
+        # Diária de 100 de 25/03 a 05/04: 7 dias em março, 5 em abril
+        ContratoLocacao(numero_contrato="C-1", cliente_id=cliente.id, equipamento_id=trator.id,
+                        data_inicio=date(2025, 3, 25), data_fim_prevista=date(2025, 4, 5),
+                        tipo_cobranca="DIARIA", valor_cobranca=Decimal("100")),
+    ])
+    db.commit()
+
+    contador_queries.clear()
+    response = client.get("/equipamentos/custos", params={"periodo": "2025-03"})
+
+    assert response.status_code == 200
+    assert len([s for s in contador_queries if s.lstrip().upper().startswith("WITH")]) == 1
+    relatorio = response.json()
+    linhas = {linha["identificador"]: linha for linha in relatorio["equipamentos"]}
+    assert set(linhas) == {"CAM-001", "TRA-001"}
+    cam = linhas["CAM-001"]
+    assert Decimal(cam["combustivel"]) == Decimal("600")
+    assert Decimal(cam["manutencao"]) == Decimal("400")
+    assert Decimal(cam["km"]) == Decimal("1000")
+    assert Decimal(cam["custo_km"]) == Decimal("1.00")
+    assert Decimal(cam["litros_100km"]) == Decimal("10.00")
+    assert Decimal(linhas["TRA-001"]["receita"]) == Decimal("700")
+    assert linhas["TRA-001"]["custo_km"] is None
+
+    # Ano agrupado por mês: abril traz o 2º abastecimento e o resto da diária
+    relatorio = client.get("/equipamentos/custos", params={"periodo": "2025", "por_mes": True}).json()
+    por_mes = {(l["identificador"], l["periodo"]): l for l in relatorio["equipamentos"]}
+    assert Decimal(por_mes[("CAM-001", "2025-04")]["combustivel"]) == Decimal("300")
+    assert Decimal(por_mes[("TRA-001", "2025-04")]["receita"]) == Decimal("500")
+    assert Decimal(relatorio["totais"]["receita"]) == Decimal("1200")
+
+    assert client.get("/equipamentos/custos", params={"periodo": "2025-13"}).status_code == 400
+
+
+def test_custos_contrato_fechado_sem_fim(client, db):
+    """FECHADO sem data de fim entra uma vez, com o valor cheio, no período do início"""
+    escavadeira = Equipamento(tipo="ESCAVADEIRA", identificador="ESC-001", modelo="320", marca="CAT")
+    cliente = Cliente(nome="Cliente", tipo_pessoa="J", cpf_cnpj="12.345.678/0001-90")
+    db.add_all([escavadeira, cliente])
+    db.flush()
+    db.add(ContratoLocacao(numero_contrato="C-2", cliente_id=cliente.id, equipamento_id=escavadeira.id,
+                           data_inicio=date(2025, 1, 1), tipo_cobranca="FECHADO",
+                           valor_cobranca=Decimal("10000")))
+    db.commit()
+
+    relatorio = client.get("/equipamentos/custos", params={"periodo": "2025"}).json()
+    assert Decimal(relatorio["totais"]["receita"]) == Decimal("10000")
+
+    relatorio = client.get("/equipamentos/custos", params={"periodo": "2025", "por_mes": True}).json()
+    receitas = {l["periodo"]: Decimal(l["receita"]) for l in relatorio["equipamentos"]}
+    assert receitas["2025-01"] == Decimal("10000")
+    assert sum(receitas.values()) == Decimal("10000")
@@ -0,0 +1,83 @@
+from datetime import date, timedelta
+
+import pytest
+
+
+@pytest.fixture
+def ledger_setup(client):
+    """Cria contas e lançamentos no mês corrente para o dashboard"""
+    contas = [
+        {"codigo": "1.1.1.01", "descricao": "Caixa", "tipo": "ATIVO", "natureza": "DEVEDORA", "nivel": 4},
+        {"codigo": "2.1.1.01", "descricao": "Fornecedores", "tipo": "PASSIVO", "natureza": "CREDORA", "nivel": 4},
+        {"codigo": "4.1.01", "descricao": "Receita de Fretes", "tipo": "RECEITA", "natureza": "CREDORA", "nivel": 3},
+        {"codigo": "5.1.1", "descricao": "Combustíveis", "tipo": "DESPESA", "natureza": "DEVEDORA", "nivel": 3,
+         "aceita_lancamento": False},
+        {"codigo": "5.1.1.01", "descricao": "Diesel", "tipo": "DESPESA", "natureza": "DEVEDORA", "nivel": 4},
+    ]
+    ids = {c["codigo"]: client.post("/plano-contas/", json=c).json()["id"] for c in contas}
+    historico_id = client.post(
+        "/historicos/", json={"codigo": "001", "descricao": "Teste"}
+    ).json()["id"]
+
+    hoje = date.today().isoformat()
+
+    def lancar(debito, credito, valor, data=hoje):
+        response = client.post("/lancamentos/", json={
+            "data_lancamento": data,
+            "historico_id": historico_id,
+            "partidas": [
+                {"conta_id": ids[debito], "tipo": "DEBITO", "valor": valor},
+                {"conta_id": ids[credito], "tipo": "CREDITO", "valor": valor},
+            ]
+        })
+        assert response.status_code == 201
+
+    lancar("1.1.1.01", "4.1.01", 1000.00)
+    lancar("5.1.1.01", "1.1.1.01", 300.00)
+    lancar("5.1.1.01", "2.1.1.01", 200.00)
+    ids["lancar"] = lancar
+    return ids
+
+
+def test_dashboard_valores(client, ledger_setup):
+    """Testa saldos, totais do mês e gráficos do dashboard"""
+    response = client.get("/dashboard/")
+    assert response.status_code == 200
+    data = response.json()
+
+    assert data["totais"]["lancamentos"] == 3
+    assert data["financeiro"]["saldo_disponivel"] == 700.00
+    assert data["financeiro"]["total_pagar"] == 200.00
+    assert data["financeiro"]["receitas_mes"] == 1000.00
+    assert data["financeiro"]["despesas_mes"] == 500.00
+    assert data["financeiro"]["resultado_mes"] == 500.00
+
+    assert data["graficos"]["receitas_por_tipo"] == [{"nome": "Receita de Fretes", "valor": 1000.00}]
+    assert data["graficos"]["despesas_por_categoria"] == [{"nome": "Combustíveis", "valor": 500.00}]
+
+    evolucao = data["graficos"]["evolucao_mensal"]
+    assert len(evolucao) == 6
+    assert evolucao[-1]["receitas"] == 1000.00
+    assert evolucao[-1]["despesas"] == 500.00
+
+
+def test_dashboard_ignora_lancamentos_futuros(client, ledger_setup):
+    """Lançamentos com data futura (no mês ou depois) não entram nos saldos nem no mês"""
+    lancar = ledger_setup["lancar"]
+    lancar("1.1.1.01", "4.1.01", 50.00, (date.today() + timedelta(days=1)).isoformat())
+    lancar("1.1.1.01", "4.1.01", 70.00, (date.today() + timedelta(days=40)).isoformat())
+
+    data = client.get("/dashboard/").json()
+    assert data["financeiro"]["saldo_disponivel"] == 700.00
+    assert data["financeiro"]["receitas_mes"] == 1000.00
+    assert data["graficos"]["receitas_por_tipo"] == [{"nome": "Receita de Fretes", "valor": 1000.00}]
+
+
+def test_dashboard_numero_queries(client, ledger_setup, contador_queries):
+    """O número de queries do dashboard não cresce com lançamentos/meses/contas"""
+    contador_queries.clear()
+    response = client.get("/dashboard/")
+    assert response.status_code == 200
+    assert len(response.json()["ultimos_lancamentos"]) == 3
+    # totais, saldos/evolução, categorias, últimos lançamentos, partidas
+    assert len(contador_queries) == 5
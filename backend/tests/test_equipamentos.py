@@ -71,3 +71,18 @@ def test_criar_equipamento_duplicado(client, equipamento_data):
     # Tentar criar novamente
     response = client.post("/equipamentos/", json=equipamento_data)
     assert response.status_code == 400
+
+
+def test_listar_equipamentos_cursor(client, equipamento_data):
+    """Testa paginação por cursor de equipamentos (ordenados por id)"""
+    for i in range(3):
+        dados = {**equipamento_data, "identificador": f"CAM-00{i}", "placa": f"ABC123{i}"}
+        client.post("/equipamentos/", json=dados)
+
+    primeira = client.get("/equipamentos/?limit=2")
+    assert len(primeira.json()) == 2
+    cursor = primeira.headers["X-Next-Cursor"]
+
+    segunda = client.get(f"/equipamentos/?limit=2&cursor={cursor}")
+    assert [e["identificador"] for e in segunda.json()] == ["CAM-002"]
+    assert "X-Next-Cursor" not in segunda.headers
@@ -0,0 +1,77 @@
+from decimal import Decimal
+
+from app.models.conta_receber import ContaReceber
+from app.models.saldo_mensal import SaldoMensal
+
+
+def _faturar(client, admin_token, competencia, **params):
+    return client.post(
+        "/contratos/faturamento",
+        params={"competencia": competencia, **params},
+        headers={"Authorization": f"Bearer {admin_token}"},
+    )
+
+
+def test_faturamento_por_tipo_de_cobranca(client, db, admin_token, cliente_data, equipamento_data):
+    """Testa os valores por tipo de cobrança, a idempotência e os lançamentos gerados"""
+    cliente_id = client.post("/clientes/", json=cliente_data).json()["id"]
+    equipamento_id = client.post("/equipamentos/", json=equipamento_data).json()["id"]
+    contratos = [
+        ("C-MENSAL", "MENSAL", 3100, "2025-01-01", None, "ATIVO"),          # mês cheio: 3100
+        ("C-MEIO-MES", "MENSAL", 3100, "2025-01-17", None, "ATIVO"),        # 15/31 dias: 1500
+        ("C-DIARIA", "DIARIA", 100, "2024-12-20", "2025-01-10", "ATIVO"),   # 10 dias: 1000
+        ("C-FECHADO", "FECHADO", 5000, "2025-01-05", "2025-03-31", "ATIVO"),  # no mês do início
+        ("C-HORA", "HORA", 200, "2025-01-01", None, "ATIVO"),
+        ("C-CANCELADO", "MENSAL", 9999, "2025-01-01", None, "CANCELADO"),
+    ]
+    ids = {}
+    for numero, tipo, valor, inicio, fim, status in contratos:
+        ids[numero] = client.post("/contratos/", json={
+            "numero_contrato": numero, "cliente_id": cliente_id, "equipamento_id": equipamento_id,
+            "data_inicio": inicio, "data_fim_prevista": fim, "tipo_cobranca": tipo,
+            "valor_cobranca": valor, "status": status,
+        }).json()["id"]
+
+    assert _faturar(client, admin_token, "2025-13").status_code == 400
+    assert client.post("/contratos/faturamento", params={"competencia": "2025-01"}).status_code == 401
+
+    resultado = _faturar(client, admin_token, "2025-01").json()
+    assert resultado["contas_criadas"] == 4
+    assert Decimal(str(resultado["valor_total"])) == Decimal("10600")
+    assert set(resultado["tempo_ms"]) == {"contas", "lancamentos", "total"}
+    valores = {
+        conta.contrato_id: (conta.valor, conta.data_vencimento.isoformat(), conta.competencia)
+        for conta in db.query(ContaReceber).all()
+    }
+    assert valores == {
+        ids["C-MENSAL"]: (Decimal("3100.00"), "2025-02-10", 202501),
+        ids["C-MEIO-MES"]: (Decimal("1500.00"), "2025-02-10", 202501),
+        ids["C-DIARIA"]: (Decimal("1000.00"), "2025-02-10", 202501),
+        ids["C-FECHADO"]: (Decimal("5000.00"), "2025-02-10", 202501),
+    }
+    assert _faturar(client, admin_token, "2025-01").json()["contas_criadas"] == 0
+
+    # Fevereiro com lançamentos: só os dois mensais (a diária terminou, o fechado já foi faturado)
+    debito = client.post("/plano-contas/", json={
+        "codigo": "1.1.02", "descricao": "Clientes", "tipo": "ATIVO", "natureza": "DEVEDORA", "nivel": 3,
+    }).json()["id"]
+    credito = client.post("/plano-contas/", json={
+        "codigo": "4.1.01", "descricao": "Receita de Locação", "tipo": "RECEITA", "natureza": "CREDORA",
+        "nivel": 3,
+    }).json()["id"]
+    historico = client.post("/historicos/", json={"codigo": "010", "descricao": "Faturamento"}).json()["id"]
+    assert _faturar(client, admin_token, "2025-02", historico_id=historico).status_code == 400
+
+    resultado = _faturar(
+        client, admin_token, "2025-02", historico_id=historico, conta_debito_id=debito,
+        conta_credito_id=credito, dia_vencimento=31,
+    ).json()
+    assert (resultado["contas_criadas"], resultado["lancamentos_criados"]) == (2, 2)
+    assert Decimal(str(resultado["valor_total"])) == Decimal("6200")
+    fevereiro = db.query(ContaReceber).filter(ContaReceber.competencia == 202502).all()
+    assert {conta.data_vencimento.isoformat() for conta in fevereiro} == {"2025-03-31"}
+    assert all(conta.lancamento_id for conta in fevereiro)
+    lancamento = client.get(f"/lancamentos/{fevereiro[0].lancamento_id}").json()
+    assert lancamento["data_lancamento"] == "2025-02-28"
+    saldos = {s.conta_id: (s.debitos, s.creditos) for s in db.query(SaldoMensal).filter(SaldoMensal.ano_mes == 202502)}
+    assert saldos == {debito: (Decimal("6200"), Decimal("0")), credito: (Decimal("0"), Decimal("6200"))}
@@ -0,0 +1,81 @@
+from datetime import date, timedelta
+
+import pytest
+
+
+@pytest.fixture
+def caixa_setup(client):
+    """Saldo contábil de 1000.00 em Caixa (1.1.1.01)"""
+    caixa_id = client.post("/plano-contas/", json={
+        "codigo": "1.1.1.01", "descricao": "Caixa", "tipo": "ATIVO", "natureza": "DEVEDORA", "nivel": 4
+    }).json()["id"]
+    capital_id = client.post("/plano-contas/", json={
+        "codigo": "2.4.1.01", "descricao": "Capital Social", "tipo": "PATRIMONIO_LIQUIDO",
+        "natureza": "CREDORA", "nivel": 4
+    }).json()["id"]
+    historico_id = client.post("/historicos/", json={"codigo": "001", "descricao": "Aporte"}).json()["id"]
+
+    def aportar(data, valor):
+        client.post("/lancamentos/", json={
+            "data_lancamento": data,
+            "historico_id": historico_id,
+            "partidas": [
+                {"conta_id": caixa_id, "tipo": "DEBITO", "valor": valor},
+                {"conta_id": capital_id, "tipo": "CREDITO", "valor": valor}
+            ]
+        })
+
+    aportar("2024-01-10", 1000.00)
+    return aportar
+
+
+def test_projecao_fluxo_caixa(client, caixa_setup):
+    """Testa saldo inicial, vencidas entrando hoje e saldo acumulado por período"""
+    hoje = date.today()
+    client.post("/contas-receber/", json={
+        "descricao": "Frete", "valor": "500.00", "data_vencimento": (hoje + timedelta(days=3)).isoformat()
+    })
+    client.post("/contas-pagar/", json={
+        "descricao": "Diesel", "valor": "200.00", "data_vencimento": (hoje - timedelta(days=2)).isoformat()
+    })
+    client.post("/contas-pagar/", json={
+        "descricao": "Fora do horizonte", "valor": "100.00",
+        "data_vencimento": (hoje + timedelta(days=40)).isoformat()
+    })
+
+    response = client.get("/fluxo-caixa/projecao?horizonte_dias=30")
+    assert response.status_code == 200
+    data = response.json()
+    assert data["saldo_inicial"] == "1000.00"
+    assert data["saldo_final"] == "1300.00"
+    periodos = data["periodos"]
+    assert len(periodos) == 31
+    assert periodos[0]["saidas"] == "200.00"
+    assert periodos[0]["saldo"] == "800.00"
+    assert periodos[2]["saldo"] == "800.00"
+    assert periodos[3]["entradas"] == "500.00"
+    assert periodos[3]["saldo"] == "1300.00"
+
+    mensal = client.get("/fluxo-caixa/projecao?horizonte_dias=30&granularidade=mes").json()
+    assert mensal["periodos"][0]["inicio"] == hoje.isoformat()
+    assert mensal["periodos"][-1]["saldo"] == "1300.00"
+
+    # Gravação de conta invalida a projeção em cache
+    client.post("/contas-pagar/", json={
+        "descricao": "Pneus", "valor": "50.00", "data_vencimento": (hoje + timedelta(days=10)).isoformat()
+    })
+    data = client.get("/fluxo-caixa/projecao?horizonte_dias=30").json()
+    assert data["saldo_final"] == "1250.00"
+
+    assert client.get("/fluxo-caixa/projecao?granularidade=ano").status_code == 422
+
+
+def test_projecao_ignora_lancamentos_futuros(client, caixa_setup):
+    """Lançamentos com data futura não entram no saldo inicial de hoje"""
+    hoje = date.today()
+    caixa_setup((hoje + timedelta(days=1)).isoformat(), 300.00)
+    caixa_setup((hoje + timedelta(days=45)).isoformat(), 400.00)
+    caixa_setup(hoje.isoformat(), 25.00)
+
+    data = client.get("/fluxo-caixa/projecao?horizonte_dias=10").json()
+    assert data["saldo_inicial"] == "1025.00"
@@ -0,0 +1,74 @@
+from decimal import Decimal
+
+from app.models.equipamento import Equipamento
+from app.services.hodometro import recalcular_hodometros
+
+
+def _hodometro(client, equipamento_id):
+    dados = client.get(f"/equipamentos/{equipamento_id}").json()
+    atual = dados["hodometro_atual"]
+    return (Decimal(str(atual)) if atual is not None else None), dados["data_ultima_leitura"]
+
+
+def test_hodometro_mantido_por_viagens_e_abastecimentos(client, db, equipamento_data, motorista_data):
+    """Testa a atualização incremental do hodômetro em inclusões, alterações e exclusões"""
+    equipamento_id = client.post("/equipamentos/", json={**equipamento_data, "hodometro_inicial": 1000}).json()["id"]
+    motorista_id = client.post("/motoristas/", json=motorista_data).json()["id"]
+    viagem = {
+        "equipamento_id": equipamento_id, "motorista_id": motorista_id, "data_viagem": "2025-03-10",
+        "origem": "Pátio", "destino": "Obra", "km_inicial": 1000, "km_final": 1200,
+    }
+    viagem_id = client.post("/viagens/", json=viagem).json()["id"]
+    assert _hodometro(client, equipamento_id) == (Decimal("1200"), "2025-03-10")
+
+    abastecimento = {
+        "equipamento_id": equipamento_id, "data_abastecimento": "2025-03-05", "tipo_combustivel": "DIESEL",
+        "litros": 50, "valor_litro": 6, "valor_total": 300, "km_hodometro": 1100,
+    }
+    abastecimento_id = client.post("/abastecimentos/", json=abastecimento).json()["id"]
+    assert _hodometro(client, equipamento_id) == (Decimal("1200"), "2025-03-10")
+
+    # Corrigir a leitura maior recalcula a partir das demais
+    client.put(f"/viagens/{viagem_id}", json={"km_final": 1150, "data_viagem": "2025-03-01"})
+    assert _hodometro(client, equipamento_id) == (Decimal("1150"), "2025-03-05")
+
+    client.delete(f"/viagens/{viagem_id}")
+    assert _hodometro(client, equipamento_id) == (Decimal("1100"), "2025-03-05")
+
+    client.delete(f"/abastecimentos/{abastecimento_id}")
+    assert _hodometro(client, equipamento_id) == (Decimal("1000"), None)
+
+
+def test_recalcular_hodometros_em_lote(client, db, equipamento_data, motorista_data):
+    """Testa o recálculo em lote, preservando equipamentos sem leituras"""
+    com_leitura = client.post("/equipamentos/", json=equipamento_data).json()["id"]
+    sem_leitura = client.post("/equipamentos/", json={
+        **equipamento_data, "placa": "XYZ9876", "identificador": "CAM-002", "hodometro_inicial": 5000,
+    }).json()["id"]
+    client.post("/abastecimentos/", json={
+        "equipamento_id": com_leitura, "data_abastecimento": "2025-03-05", "tipo_combustivel": "DIESEL",
+        "litros": 50, "valor_litro": 6, "valor_total": 300, "km_hodometro": 800,
+    })
+    db.query(Equipamento).filter(Equipamento.id == com_leitura).update(
+        {Equipamento.hodometro_atual: 0, Equipamento.data_ultima_leitura: None}
+    )
+    db.commit()
+
+    assert recalcular_hodometros(db) == 1
+    db.commit()
+
+    assert _hodometro(client, com_leitura) == (Decimal("800"), "2025-03-05")
+    assert _hodometro(client, sem_leitura) == (Decimal("5000"), None)
+
+
+def test_hodometro_atual_nao_editavel(client, equipamento_data):
+    """O cadastro semeia o hodômetro com o inicial; PUT não altera o valor mantido"""
+    equipamento_id = client.post("/equipamentos/", json={
+        **equipamento_data, "hodometro_inicial": 1000, "hodometro_atual": 9000,
+    }).json()["id"]
+    assert _hodometro(client, equipamento_id) == (Decimal("1000"), None)
+
+    response = client.put(f"/equipamentos/{equipamento_id}", json={"hodometro_atual": 10, "modelo": "Atego"})
+    assert response.status_code == 200
+    assert response.json()["modelo"] == "Atego"
+    assert _hodometro(client, equipamento_id) == (Decimal("1000"), None)
@@ -0,0 +1,80 @@
+import struct
+from decimal import Decimal
+
+from app.models.lancamento import Lancamento
+from app.models.plano_contas import PlanoContas
+from app.models.saldo_mensal import SaldoMensal
+
+DATA_24_02_2023 = 30371
+DATA_01_03_2023 = 30376
+
+
+def _conta(nome, classificacao, indicador=b'a'):
+    nibbles = bytes.fromhex(classificacao.replace('.', 'e') + 'a' * (20 - len(classificacao)))
+    return struct.pack('<40s10sBc', nome.encode('cp860'), nibbles, 1, indicador)
+
+
+def _partida(debito, credito, serial, centavos):
+    return struct.pack('<5H8sBH9x', 1, 0x161, debito, credito, serial, bytes.fromhex(f"{centavos:016d}"), 1, 7)
+
+
+PLANO = b' ' * 40 + b'\xaa' * 10 + b'\x01 ' + _conta("CAIXA", "1.1.01.01") + _conta("Manutenção", "3.2.01.01")
+
+PARTIDAS = (
+    bytes(30)
+    # chave 1: débito e crédito no mesmo registro
+    + _partida(2, 1, DATA_24_02_2023, 155000)
+    # chaves 2-4: lançamento múltiplo (1 crédito, 2 débitos)
+    + _partida(0, 1, DATA_01_03_2023, 30000)
+    + _partida(2, 0, DATA_01_03_2023, 10000)
+    + _partida(2, 0, DATA_01_03_2023, 20000)
+    # chave 5: sem contrapartida
+    + _partida(2, 0, DATA_01_03_2023, 5000)
+)
+
+
+def _enviar(client, admin_token):
+    return client.post(
+        "/importacao/xtdc/lancamentos",
+        files={
+            "partidas": ("XTDC019.DAT", PARTIDAS),
+            "plano": ("XTDC035.DAT", PLANO),
+        },
+        headers={"Authorization": f"Bearer {admin_token}"}
+    )
+
+
+def test_importar_lancamentos_xtdc(client, db, admin_token):
+    """Testa importação do razão: agrupamento, partidas, saldos e reimportação"""
+    for codigo, descricao, tipo, natureza in (
+        ("1.1.01.01", "Caixa", "ATIVO", "DEVEDORA"),
+        ("3.2.01.01", "Manutenção", "DESPESA", "DEVEDORA"),
+    ):
+        db.add(PlanoContas(codigo=codigo, descricao=descricao, tipo=tipo, natureza=natureza, nivel=4))
+    db.commit()
+
+    response = _enviar(client, admin_token)
+
+    assert response.status_code == 200
+    relatorio = response.json()
+    assert relatorio["lancamentos_criados"] == 2
+    assert relatorio["registros_sem_contrapartida"] == 1
+    assert relatorio["contas_nao_encontradas"] == []
+
+    lancamentos = {l.chave_origem: l for l in db.query(Lancamento).all()}
+    assert set(lancamentos) == {"XTDC019:1", "XTDC019:2"}
+    multiplo = lancamentos["XTDC019:2"]
+    assert sorted((p.tipo.value, p.valor) for p in multiplo.partidas) == [
+        ("CREDITO", Decimal("300.00")), ("DEBITO", Decimal("100.00")), ("DEBITO", Decimal("200.00")),
+    ]
+    assert multiplo.historico.codigo == "XTDC"
+
+    caixa = db.query(PlanoContas).filter_by(codigo="1.1.01.01").one()
+    saldos = {s.ano_mes: (s.debitos, s.creditos) for s in db.query(SaldoMensal).filter_by(conta_id=caixa.id)}
+    assert saldos == {202302: (0, Decimal("1550.00")), 202303: (0, Decimal("300.00"))}
+
+    # Reenviar os mesmos arquivos não duplica nada
+    relatorio = _enviar(client, admin_token).json()
+    assert relatorio["lancamentos_criados"] == 0
+    assert relatorio["lancamentos_existentes"] == 2
+    assert db.query(Lancamento).count() == 2
@@ -0,0 +1,81 @@
+from app.config import settings
+from app.models.plano_contas import PlanoContas
+from app.services.import_xtdc import ImportadorXTDC
+
+BALANCETE = """\
+        NOME                                  SALDO ANTERIOR          DÉBITOS         CRÉDITOS       SALDO ATUAL
+1                 A T I V O
+1.1               ATIVO CIRCULANTE
+1.1.01            DISPONIVEL
+1.1.01.01         Caixa                           3.450,00     1.230.737,43       130.498,74      1.103.688,69
+1.1.01.02         Bancos                              0,00           100,00             0,00            100,00
+1.1.01.01         Caixa                           3.450,00     1.230.737,43       130.498,74      1.103.688,69
+2                 P A S S I V O
+"""
+
+
+def test_importar_em_lote(db, tmp_path, contador_queries):
+    """Testa importação em lote: pais resolvidos em memória, um INSERT por nível"""
+    db.add(PlanoContas(
+        codigo="1.1", descricao="Circulante (existente)", tipo="ATIVO",
+        natureza="DEVEDORA", nivel=2, aceita_lancamento=False
+    ))
+    db.commit()
+    arquivo = tmp_path / "XTDCTEST.LST"
+    arquivo.write_text(BALANCETE, encoding="latin1")
+
+    contador_queries.clear()
+    stats = ImportadorXTDC(db).importar_plano_contas_de_balancete(str(arquivo), em_lote=True)
+
+    assert stats["total_contas"] == 7
+    # 1.1 já cadastrada e 1.1.01.01 repetida no arquivo
+    assert stats["importacao"] == {"contas_criadas": 5, "contas_existentes": 2, "contas_erro": 0}
+    inserts = [s for s in contador_queries if s.lstrip().upper().startswith("INSERT")]
+    assert len(inserts) == 3  # níveis 1, 3 e 4
+
+    contas = {c.codigo: c for c in db.query(PlanoContas).all()}
+    assert contas["1.1"].descricao == "Circulante (existente)"
+    assert contas["1.1.01"].conta_pai_id == contas["1.1"].id
+    assert contas["1.1.01.02"].conta_pai_id == contas["1.1.01"].id
+    assert contas["2"].conta_pai_id is None
+    assert contas["2"].natureza.value == "CREDORA"
+
+    # Reimportar não cria nada
+    stats = ImportadorXTDC(db).importar_plano_contas_de_balancete(str(arquivo), em_lote=True)
+    assert stats["importacao"]["contas_criadas"] == 0
+
+
+def test_importar_balancetes_api(client, admin_token, monkeypatch):
+    """Testa upload de vários balancetes: mescla com o último arquivo prevalecendo"""
+    monkeypatch.setattr(settings, "IMPORTACAO_XTDC_WORKERS", 0)
+    segundo = "1.1.01.01         Caixa Geral                         0,00             0,00             0,00              0,00\n"
+
+    response = client.post(
+        "/importacao/xtdc/balancetes",
+        files=[
+            ("arquivos", ("XTDC0001.LST", BALANCETE.encode("latin1"))),
+            ("arquivos", ("XTDC0002.LST", segundo.encode("latin1"))),
+        ],
+        headers={"Authorization": f"Bearer {admin_token}"}
+    )
+
+    assert response.status_code == 200
+    relatorio = response.json()
+    assert [a["arquivo"] for a in relatorio["arquivos"]] == ["XTDC0001.LST", "XTDC0002.LST"]
+    assert [a["contas"] for a in relatorio["arquivos"]] == [7, 1]
+    assert relatorio["contas_unicas"] == 6
+    assert relatorio["importacao"]["contas_criadas"] == 6
+    assert set(relatorio["tempos_ms"]) == {"leitura", "mesclagem", "gravacao", "total"}
+
+    contas = client.get("/plano-contas/", params={"limit": 100}).json()
+    caixa = next(c for c in contas if c["codigo"] == "1.1.01.01")
+    assert caixa["descricao"] == "Caixa Geral"
+    assert caixa["aceita_lancamento"] is True
+
+
+def test_importar_balancetes_exige_admin(client):
+    response = client.post(
+        "/importacao/xtdc/balancetes",
+        files=[("arquivos", ("XTDC0001.LST", BALANCETE.encode("latin1")))]
+    )
+    assert response.status_code == 401
@@ -120,3 +120,227 @@ def test_listar_lancamentos(client, contas_setup, historico_setup):
     assert response.status_code == 200
     data = response.json()
     assert len(data) == 1
+
+
+def test_saldos_mensais_acompanham_lancamento(client, contas_setup, historico_setup):
+    """Testa que criar, alterar e excluir lançamento mantém o saldo da conta"""
+    def lancamento(valor):
+        return {
+            "data_lancamento": "2024-01-15",
+            "historico_id": historico_setup,
+            "partidas": [
+                {"conta_id": contas_setup["conta_debito_id"], "tipo": "DEBITO", "valor": valor},
+                {"conta_id": contas_setup["conta_credito_id"], "tipo": "CREDITO", "valor": valor}
+            ]
+        }
+
+    def saldo(conta_id):
+        return client.get(f"/plano-contas/{conta_id}/saldo").json()["saldo"]
+
+    lancamento_id = client.post("/lancamentos/", json=lancamento(1000.00)).json()["id"]
+    client.post("/lancamentos/", json=lancamento(250.00))
+    assert saldo(contas_setup["conta_debito_id"]) == 1250.00
+    assert saldo(contas_setup["conta_credito_id"]) == 1250.00
+
+    response = client.put(f"/lancamentos/{lancamento_id}", json=lancamento(400.00))
+    assert response.status_code == 200
+    assert len(response.json()["partidas"]) == 2
+    assert saldo(contas_setup["conta_debito_id"]) == 650.00
+
+    client.delete(f"/lancamentos/{lancamento_id}")
+    assert saldo(contas_setup["conta_debito_id"]) == 250.00
+
+
+def test_reconstruir_saldos_mensais(client, db, contas_setup, historico_setup):
+    """Testa que a reconstrução gera os mesmos totais mantidos incrementalmente"""
+    from app.models.saldo_mensal import SaldoMensal
+    from app.services.saldos_mensais import reconstruir_saldos_mensais
+
+    for data, valor in (("2024-01-15", 100.00), ("2024-01-20", 50.00), ("2024-02-01", 30.00)):
+        client.post("/lancamentos/", json={
+            "data_lancamento": data,
+            "historico_id": historico_setup,
+            "partidas": [
+                {"conta_id": contas_setup["conta_debito_id"], "tipo": "DEBITO", "valor": valor},
+                {"conta_id": contas_setup["conta_credito_id"], "tipo": "CREDITO", "valor": valor}
+            ]
+        })
+
+    def snapshot():
+        return sorted(
+            (s.conta_id, s.ano_mes, float(s.debitos), float(s.creditos))
+            for s in db.query(SaldoMensal).all()
+        )
+
+    incremental = snapshot()
+    assert reconstruir_saldos_mensais(db) == 4
+    db.commit()
+    db.expire_all()
+    assert snapshot() == incremental
+    assert (contas_setup["conta_debito_id"], 202401, 150.0, 0.0) in incremental
+
+
+def test_listar_lancamentos_cursor(client, contas_setup, historico_setup):
+    """Testa paginação por cursor: páginas sem repetição e na ordem (data, id) desc"""
+    for dia in ("2024-01-10", "2024-01-12", "2024-01-12", "2024-01-15", "2024-01-20"):
+        client.post("/lancamentos/", json={
+            "data_lancamento": dia,
+            "historico_id": historico_setup,
+            "partidas": [
+                {"conta_id": contas_setup["conta_debito_id"], "tipo": "DEBITO", "valor": 10.00},
+                {"conta_id": contas_setup["conta_credito_id"], "tipo": "CREDITO", "valor": 10.00}
+            ]
+        })
+
+    vistos = []
+    response = client.get("/lancamentos/?limit=2")
+    while True:
+        assert response.status_code == 200
+        vistos.extend((l["data_lancamento"], l["id"]) for l in response.json())
+        cursor = response.headers.get("X-Next-Cursor")
+        if not cursor:
+            break
+        response = client.get(f"/lancamentos/?limit=2&cursor={cursor}")
+
+    assert len(vistos) == 5
+    assert vistos == sorted(vistos, reverse=True)
+
+    response = client.get("/lancamentos/?cursor=invalido")
+    assert response.status_code == 400
+
+
+def test_listar_lancamentos_sem_n_mais_1(client, contas_setup, historico_setup, contador_queries):
+    """A listagem carrega as partidas de todos os lançamentos em uma única query"""
+    for _ in range(5):
+        client.post("/lancamentos/", json={
+            "data_lancamento": "2024-01-15",
+            "historico_id": historico_setup,
+            "partidas": [
+                {"conta_id": contas_setup["conta_debito_id"], "tipo": "DEBITO", "valor": 10.00},
+                {"conta_id": contas_setup["conta_credito_id"], "tipo": "CREDITO", "valor": 10.00}
+            ]
+        })
+
+    contador_queries.clear()
+    response = client.get("/lancamentos/")
+    assert response.status_code == 200
+    assert all(len(l["partidas"]) == 2 for l in response.json())
+
+    selects = [s for s in contador_queries if s.lstrip().upper().startswith("SELECT")]
+    assert len(selects) == 2  # lançamentos + partidas (selectinload)
+
+
+def test_criar_lancamentos_lote(client, contas_setup, historico_setup):
+    """Testa lote com itens válidos e inválidos: erros por item sem abortar o lote"""
+    def item(valor_debito, valor_credito, conta_debito=None):
+        return {
+            "data_lancamento": "2024-03-10",
+            "historico_id": historico_setup,
+            "partidas": [
+                {"conta_id": conta_debito or contas_setup["conta_debito_id"], "tipo": "DEBITO",
+                 "valor": valor_debito},
+                {"conta_id": contas_setup["conta_credito_id"], "tipo": "CREDITO", "valor": valor_credito}
+            ]
+        }
+
+    lote = [item(100.00, 100.00), item(50.00, 40.00), item(30.00, 30.00, conta_debito=9999), item(25.00, 25.00)]
+    response = client.post("/lancamentos/bulk", json=lote)
+    assert response.status_code == 200
+    data = response.json()
+    assert data["total"] == 4
+    assert data["criados"] == 2
+    assert [e["indice"] for e in data["erros"]] == [1, 2]
+    assert [l["indice"] for l in data["lancamentos"]] == [0, 3]
+
+    criado = client.get(f"/lancamentos/{data['lancamentos'][0]['id']}").json()
+    assert len(criado["partidas"]) == 2
+    saldo = client.get(f"/plano-contas/{contas_setup['conta_debito_id']}/saldo").json()
+    assert saldo["saldo"] == 125.00
+
+
+def test_criar_lancamentos_lote_ndjson(client, contas_setup, historico_setup):
+    """Testa lote enviado como NDJSON, com uma linha inválida"""
+    import json
+
+    item = {
+        "data_lancamento": "2024-03-10",
+        "historico_id": historico_setup,
+        "partidas": [
+            {"conta_id": contas_setup["conta_debito_id"], "tipo": "DEBITO", "valor": 10.00},
+            {"conta_id": contas_setup["conta_credito_id"], "tipo": "CREDITO", "valor": 10.00}
+        ]
+    }
+    corpo = "\n".join([json.dumps(item), "{nao e json", json.dumps(item)])
+    response = client.post(
+        "/lancamentos/bulk", content=corpo, headers={"Content-Type": "application/x-ndjson"}
+    )
+    assert response.status_code == 200
+    data = response.json()
+    assert data["criados"] == 2
+    assert data["erros"][0]["indice"] == 1
+
+
+def test_criar_lancamentos_lote_ndjson_stream(client, contas_setup, historico_setup, monkeypatch):
+    """NDJSON em pedaços que cortam linhas é gravado bloco a bloco com os índices do lote inteiro"""
+    import json
+    from app.routers import lancamentos
+
+    monkeypatch.setattr(lancamentos, "TAMANHO_BLOCO", 2)
+    item = {
+        "data_lancamento": "2024-03-10",
+        "historico_id": historico_setup,
+        "partidas": [
+            {"conta_id": contas_setup["conta_debito_id"], "tipo": "DEBITO", "valor": 10.00},
+            {"conta_id": contas_setup["conta_credito_id"], "tipo": "CREDITO", "valor": 10.00}
+        ]
+    }
+    corpo = "\n".join([json.dumps(item)] * 3 + ["{nao e json", "", json.dumps(item)]).encode()
+
+    def pedacos():
+        for inicio in range(0, len(corpo), 37):
+            yield corpo[inicio:inicio + 37]
+
+    response = client.post(
+        "/lancamentos/bulk", content=pedacos(), headers={"Content-Type": "application/x-ndjson"}
+    )
+    assert response.status_code == 200
+    data = response.json()
+    assert data["total"] == 5
+    assert [l["indice"] for l in data["lancamentos"]] == [0, 1, 2, 4]
+    assert [e["indice"] for e in data["erros"]] == [3]
+    saldo = client.get(f"/plano-contas/{contas_setup['conta_debito_id']}/saldo").json()
+    assert saldo["saldo"] == 40.00
+
+
+def test_exportar_lancamentos(client, contas_setup, historico_setup):
+    """Testa exportação do razão em CSV e NDJSON com filtro de período"""
+    import csv
+    import io
+    import json
+
+    for data in ("2024-01-15", "2024-02-15"):
+        client.post("/lancamentos/", json={
+            "data_lancamento": data,
+            "historico_id": historico_setup,
+            "partidas": [
+                {"conta_id": contas_setup["conta_debito_id"], "tipo": "DEBITO", "valor": 1000.00},
+                {"conta_id": contas_setup["conta_credito_id"], "tipo": "CREDITO", "valor": 1000.00}
+            ]
+        })
+
+    response = client.get("/lancamentos/export?format=csv")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/csv")
+    linhas = list(csv.DictReader(io.StringIO(response.text)))
+    assert len(linhas) == 4
+    assert linhas[0]["conta_codigo"] == "1.1.01"
+    assert linhas[0]["valor"] == "1000.00"
+
+    response = client.get("/lancamentos/export?format=ndjson&data_inicio=2024-02-01")
+    assert response.status_code == 200
+    registros = [json.loads(l) for l in response.text.splitlines()]
+    assert len(registros) == 2
+    assert {r["tipo"] for r in registros} == {"DEBITO", "CREDITO"}
+    assert registros[0]["data_lancamento"] == "2024-02-15"
+
+    assert client.get("/lancamentos/export?format=xml").status_code == 422
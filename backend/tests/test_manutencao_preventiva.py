@@ -0,0 +1,71 @@
+from datetime import date, timedelta
+from decimal import Decimal
+
+from app.models.equipamento import Equipamento
+from app.models.manutencao import Manutencao
+from app.services.manutencao_preventiva import agendar_preventivas
+
+
+def test_preventivas_por_km_e_dias(client, db, equipamento_data):
+    """Testa pendentes por km/dias, agendamento idempotente e o ciclo após concluir"""
+    hoje = date.today()
+    plano = client.post("/manutencoes/planos", json={
+        "tipo_equipamento": "CAMINHAO", "descricao": "Troca de óleo",
+        "intervalo_km": 10000, "antecedencia_km": 500,
+    }).json()
+    client.post("/manutencoes/planos", json={
+        "tipo_equipamento": "CAMINHAO", "descricao": "Revisão anual", "intervalo_dias": 365,
+    })
+    client.post("/manutencoes/planos", json={
+        "tipo_equipamento": "TRATOR", "descricao": "Graxa", "intervalo_km": 100,
+    })
+    assert client.post("/manutencoes/planos", json={
+        "tipo_equipamento": "TRATOR", "descricao": "Sem intervalo",
+    }).status_code == 422
+
+    dados = [("CAM-001", "ABC1234", 0, 10200), ("CAM-002", "DEF5678", 0, 9600), ("CAM-003", "GHI9012", 0, 1000)]
+    ids = []
+    for identificador, placa, inicial, atual in dados:
+        ids.append(client.post("/equipamentos/", json={
+            **equipamento_data, "identificador": identificador, "placa": placa,
+            "hodometro_inicial": inicial,
+        }).json()["id"])
+        db.query(Equipamento).filter(Equipamento.id == ids[-1]).update({Equipamento.hodometro_atual: atual})
+    # CAM-003 cadastrado há mais de um ano: revisão anual vencida
+    db.query(Equipamento).filter(Equipamento.id == ids[2]).update(
+        {Equipamento.created_at: hoje - timedelta(days=400)}
+    )
+    db.commit()
+
+    pendentes = client.get("/manutencoes/pendentes").json()
+    assert [(p["equipamento_id"], p["descricao"]) for p in pendentes["vencidas"]] == [
+        (ids[2], "Revisão anual"), (ids[0], "Troca de óleo"),
+    ]
+    assert [(p["equipamento_id"], Decimal(str(p["km_restante"]))) for p in pendentes["a_vencer"]] == [
+        (ids[1], Decimal("400")),
+    ]
+
+    assert agendar_preventivas(db)["agendadas"] == 3
+    db.commit()
+    assert agendar_preventivas(db)["agendadas"] == 0
+    agendada = db.query(Manutencao).filter(
+        Manutencao.equipamento_id == ids[0], Manutencao.plano_manutencao_id == plano["id"]
+    ).one()
+    assert (agendada.status.value, agendada.tipo.value, agendada.data_agendada) == ("AGENDADA", "PREVENTIVA", hoje)
+    assert agendada.km_hodometro == Decimal("10000")
+    vencida = client.get("/manutencoes/pendentes", params={"equipamento_id": ids[0]}).json()["vencidas"]
+    assert vencida[0]["manutencao_id"] == agendada.id
+
+    # Concluída a 10.200 km, a próxima troca é aos 20.200 km
+    client.put(f"/manutencoes/{agendada.id}", json={
+        "status": "CONCLUIDA", "data_realizada": hoje.isoformat(), "km_hodometro": 10200,
+    })
+    assert client.get("/manutencoes/pendentes", params={"equipamento_id": ids[0]}).json() == {
+        "vencidas": [], "a_vencer": [],
+    }
+    futuro = (hoje + timedelta(days=500)).isoformat()
+    pendentes = client.get(
+        "/manutencoes/pendentes", params={"equipamento_id": ids[0], "data_referencia": futuro}
+    ).json()
+    assert [p["descricao"] for p in pendentes["vencidas"]] == ["Revisão anual"]
+    assert client.post("/manutencoes/preventivas/agendar").json()["agendadas"] == 0
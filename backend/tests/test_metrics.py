@@ -0,0 +1,31 @@
+from sqlalchemy import create_engine, text
+
+from app.pool_metrics import QueuePoolCronometrado, iniciar_medicao_requisicao, resumo_pool
+
+
+def test_metricas_pool(client):
+    """Testa o endpoint de métricas dos pools de conexão"""
+    response = client.get("/metrics/db-pool")
+    assert response.status_code == 200
+    data = response.json()
+    for chave in ("sync", "async"):
+        assert {"tamanho", "em_uso", "overflow", "checkouts", "espera_media_ms"} <= set(data[chave])
+
+
+def test_pool_cronometrado_acumula_espera():
+    """Testa a contagem de checkouts e espera por pool e por requisição"""
+    engine = create_engine("sqlite://", poolclass=QueuePoolCronometrado, pool_size=1, max_overflow=0)
+    acumulador = iniciar_medicao_requisicao()
+
+    with engine.connect() as conn:
+        conn.execute(text("SELECT 1"))
+        assert resumo_pool(engine.pool)["em_uso"] == 1
+    with engine.connect() as conn:
+        conn.execute(text("SELECT 1"))
+
+    resumo = resumo_pool(engine.pool)
+    assert resumo["checkouts"] == 2
+    assert resumo["em_uso"] == 0
+    assert acumulador[0] == 2
+    assert acumulador[1] >= 0
+    engine.dispose()
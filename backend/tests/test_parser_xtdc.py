@@ -0,0 +1,71 @@
+from decimal import Decimal
+
+import pytest
+
+from app.parsers.xtdc_balancete_parser import BalanceteXTDCParser, parse_many
+
+BALANCETE = """\
+WK Sistemas - Demonstração                    BALANCETE     PERÍODO DE 01/05/24 ATÉ 31/05/24   FOLHA    1
+        NOME                                  SALDO ANTERIOR          DÉBITOS         CRÉDITOS       SALDO ATUAL
+------------------------------------------------------------------------------------------------------------
+1                 A T I V O
+1.1               ATIVO CIRCULANTE
+1.1.01.01         Caixa                           3.450,00     1.230.737,43       130.498,74      1.103.688,69
+2.1               FORNECEDORES                    (2.414,42)            0,00             0,00        (2.414,42)
+5.1.01            Diesel
+    ** Total de FORNECEDORES                     27.559,37             0,00         3.486,00         31.045,37
+"""
+
+
+@pytest.fixture
+def arquivo_balancete(tmp_path):
+    caminho = tmp_path / "XTDCTEST.LST"
+    caminho.write_text(BALANCETE, encoding="latin1")
+    return str(caminho)
+
+
+def test_iter_contas(arquivo_balancete):
+    """Testa extração linha a linha com campos pré-calculados"""
+    contas = list(BalanceteXTDCParser(arquivo_balancete).iter_contas())
+
+    assert [c.codigo for c in contas] == ["1", "1.1", "1.1.01.01", "2.1", "5.1.01"]
+    caixa = contas[2]
+    assert caixa.nome == "Caixa"
+    assert caixa.saldo_anterior == Decimal("3450.00")
+    assert caixa.debitos == Decimal("1230737.43")
+    assert caixa.saldo_atual == Decimal("1103688.69")
+    assert (caixa.nivel, caixa.tipo_conta, caixa.natureza) == (4, "ATIVO", "DEVEDORA")
+
+    fornecedores = contas[3]
+    assert fornecedores.saldo_anterior == Decimal("-2414.42")
+    assert fornecedores.natureza == "CREDORA"
+    # Nível 2, mas com saldo: analítica
+    assert fornecedores.aceita_lancamento
+    assert not contas[1].aceita_lancamento
+
+
+def test_estatisticas_em_uma_passada(arquivo_balancete):
+    """Testa estatísticas acumuladas durante a leitura"""
+    parser = BalanceteXTDCParser(arquivo_balancete)
+    parser.parse()
+
+    stats = parser.get_estatisticas()
+    assert stats["total_contas"] == 5
+    assert stats["por_tipo"] == {
+        "ATIVO": 3, "PASSIVO": 1, "PATRIMONIO_LIQUIDO": 0, "RECEITA": 0, "DESPESA": 1
+    }
+    assert stats["por_nivel"]["Nível 1"] == 1
+    assert stats["por_nivel"]["Nível 4"] == 1
+    assert (stats["analiticas"], stats["sinteticas"]) == (3, 2)
+
+
+def test_parse_many(arquivo_balancete, tmp_path):
+    """Testa leitura de vários arquivos em sequência"""
+    outro = tmp_path / "XTDCOUTRO.LST"
+    outro.write_text("3.1   CAPITAL SOCIAL   0,00   0,00   0,00   100,00\n", encoding="latin1")
+
+    resultado = list(parse_many([arquivo_balancete, outro]))
+
+    assert len(resultado) == 6
+    assert resultado[-1][0] == str(outro)
+    assert resultado[-1][1].tipo_conta == "PATRIMONIO_LIQUIDO"
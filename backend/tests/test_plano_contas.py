@@ -34,3 +34,67 @@ def test_criar_conta_codigo_duplicado(client, plano_contas_data):
 
     response = client.post("/plano-contas/", json=plano_contas_data)
     assert response.status_code == 400
+
+
+def test_saldos_hierarquicos(client):
+    """Testa saldos de todas as contas com contas sintéticas somando as filhas"""
+    contas = [
+        {"codigo": "1", "descricao": "Ativo", "tipo": "ATIVO", "natureza": "DEVEDORA", "nivel": 1,
+         "aceita_lancamento": False},
+        {"codigo": "1.1", "descricao": "Circulante", "tipo": "ATIVO", "natureza": "DEVEDORA", "nivel": 2,
+         "aceita_lancamento": False},
+        {"codigo": "1.1.01", "descricao": "Caixa", "tipo": "ATIVO", "natureza": "DEVEDORA", "nivel": 3},
+        {"codigo": "1.1.02", "descricao": "Bancos", "tipo": "ATIVO", "natureza": "DEVEDORA", "nivel": 3},
+        {"codigo": "4.1.01", "descricao": "Receitas", "tipo": "RECEITA", "natureza": "CREDORA", "nivel": 3},
+    ]
+    ids = {c["codigo"]: client.post("/plano-contas/", json=c).json()["id"] for c in contas}
+    historico_id = client.post("/historicos/", json={"codigo": "001", "descricao": "Teste"}).json()["id"]
+
+    for data, conta, valor in (("2024-01-10", "1.1.01", 100.00), ("2024-02-10", "1.1.02", 50.00)):
+        client.post("/lancamentos/", json={
+            "data_lancamento": data,
+            "historico_id": historico_id,
+            "partidas": [
+                {"conta_id": ids[conta], "tipo": "DEBITO", "valor": valor},
+                {"conta_id": ids["4.1.01"], "tipo": "CREDITO", "valor": valor}
+            ]
+        })
+
+    response = client.get("/plano-contas/saldos")
+    assert response.status_code == 200
+    saldos = {s["codigo"]: s["saldo"] for s in response.json()}
+    assert saldos == {"1": 150.00, "1.1": 150.00, "1.1.01": 100.00, "1.1.02": 50.00, "4.1.01": 150.00}
+
+    # Período de meses inteiros (saldos mensais) e período parcial (partidas)
+    for params in ("data_inicio=2024-02-01&data_fim=2024-02-29", "data_inicio=2024-02-05&data_fim=2024-02-20"):
+        saldos = {s["codigo"]: s["saldo"] for s in client.get(f"/plano-contas/saldos?{params}").json()}
+        assert saldos["1"] == 50.00
+        assert saldos["1.1.01"] == 0
+
+
+def test_movimentacoes_conta(client, plano_contas_data):
+    """Testa últimas movimentações da conta (rota assíncrona)"""
+    caixa_id = client.post("/plano-contas/", json=plano_contas_data).json()["id"]
+    receita_id = client.post("/plano-contas/", json={
+        "codigo": "4.1.01", "descricao": "Receitas", "tipo": "RECEITA", "natureza": "CREDORA", "nivel": 3
+    }).json()["id"]
+    historico_id = client.post("/historicos/", json={"codigo": "001", "descricao": "Teste"}).json()["id"]
+    for data in ("2024-01-10", "2024-03-10"):
+        client.post("/lancamentos/", json={
+            "data_lancamento": data,
+            "historico_id": historico_id,
+            "partidas": [
+                {"conta_id": caixa_id, "tipo": "DEBITO", "valor": 10.00},
+                {"conta_id": receita_id, "tipo": "CREDITO", "valor": 10.00}
+            ]
+        })
+
+    response = client.get(f"/plano-contas/{caixa_id}/movimentacoes?limit=1")
+    assert response.status_code == 200
+    data = response.json()
+    assert data["total_movimentacoes"] == 1
+    assert data["movimentacoes"][0]["data"] == "2024-03-10"
+    assert data["movimentacoes"][0]["tipo"] == "DEBITO"
+
+    assert client.get("/plano-contas/9999/movimentacoes").status_code == 404
+    assert client.get("/plano-contas/9999/saldo").status_code == 404
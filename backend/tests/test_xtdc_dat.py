@@ -0,0 +1,52 @@
+import struct
+from datetime import date
+from decimal import Decimal
+
+from app.parsers.xtdc_dat import iter_partidas, iter_plano_contas, iter_textos
+
+
+def _partida(numero, debito, credito, serial, valor_bcd, lote):
+    return struct.pack('<5H8sBH9x', numero, 0x161, debito, credito, serial, valor_bcd, 1, lote)
+
+
+def test_iter_partidas(tmp_path):
+    """Testa leitura das partidas (cabeçalho pulado, data serial e valor BCD)"""
+    arquivo = tmp_path / "XTDC019.DAT"
+    arquivo.write_bytes(
+        b'\x00\x00\x05\x01' + bytes(26)
+        + _partida(521, 162, 0, 30371, bytes.fromhex('0000000000155000'), 245)
+        + _partida(521, 0, 7, 30371, bytes.fromhex('0000000123456789'), 245)
+    )
+
+    partidas = list(iter_partidas(str(arquivo)))
+
+    assert [p.chave for p in partidas] == [1, 2]
+    assert partidas[0].numero == 521
+    assert partidas[0].conta_debito == 162 and partidas[0].conta_credito == 0
+    assert partidas[0].data == date(2023, 2, 24)
+    assert partidas[0].valor == Decimal("1550.00")
+    assert partidas[1].valor == Decimal("1234567.89")
+    assert partidas[1].lote == 245
+
+
+def test_iter_plano_contas_e_textos(tmp_path):
+    """Testa leitura do plano de contas (nibbles, cp860) e da área de textos"""
+    plano = tmp_path / "XTDC035.DAT"
+    plano.write_bytes(
+        bytes(52)
+        + struct.pack('<40s10sBc', b'CAIXA', bytes.fromhex('1e1e01e01a') + b'\xaa' * 5, 1, b'T')
+        + struct.pack('<40s10sBc', 'Aplicações'.encode('cp860'), bytes.fromhex('1e1e01e03a') + b'\xaa' * 5, 1, b'a')
+    )
+    textos = tmp_path / "XTDC060.DAT"
+    textos.write_bytes(b'\x2e\xb1s  \r\r' + 'Manutenção EH 01\r\r\r\rParc 02/10'.encode('cp860'))
+
+    contas = list(iter_plano_contas(str(plano)))
+
+    assert [(c.reduzido, c.codigo, c.nome, c.sintetica) for c in contas] == [
+        (1, "1.1.01.01", "CAIXA", True),
+        (2, "1.1.01.03", "Aplicações", False),
+    ]
+    assert [t.texto for t in iter_textos(str(textos))] == ["Manutenção EH 01", "Parc 02/10"]
+    vazio = tmp_path / "VAZIO.DAT"
+    vazio.write_bytes(b'')
+    assert list(iter_partidas(str(vazio))) == []
@@ -98,10 +98,6 @@ export default function EquipamentoModal({
             newErrors.anoFabricacao = `Ano deve estar entre 1900 e ${anoAtual + 1}`;
         }
 
-        if (hodometroAtual && hodometroInicial && parseFloat(hodometroAtual) < parseFloat(hodometroInicial)) {
-            newErrors.hodometroAtual = "Hodômetro atual não pode ser menor que o inicial";
-        }
-
         setErrors(newErrors);
         return Object.keys(newErrors).length === 0;
     };
@@ -126,7 +122,6 @@ export default function EquipamentoModal({
                 numero_serie: numeroSerie.trim() || null,
                 valor_aquisicao: valorAquisicao ? parseFloat(valorAquisicao) : null,
                 hodometro_inicial: hodometroInicial ? parseFloat(hodometroInicial) : null,
-                hodometro_atual: hodometroAtual ? parseFloat(hodometroAtual) : null,
                 observacoes: observacoes.trim() || null,
                 ativo,
             };
@@ -352,16 +347,12 @@ export default function EquipamentoModal({
                                         type="number"
                                         step="0.1"
                                         value={hodometroAtual}
-                                        onChange={(e) => setHodometroAtual(e.target.value)}
+                                        readOnly
                                         placeholder="0.0"
-                                        className={`w-full pl-12 pr-4 py-3 bg-slate-800/50 border ${
-                                            errors.hodometroAtual ? "border-red-500" : "border-slate-600/50"
-                                        } rounded-xl text-white placeholder-slate-400 focus:ring-2 focus:ring-cyan-500 focus:border-transparent transition-all`}
+                                        className="w-full pl-12 pr-4 py-3 bg-slate-800/30 border border-slate-600/50 rounded-xl text-slate-300 placeholder-slate-400 cursor-not-allowed"
                                     />
                                 </div>
-                                {errors.hodometroAtual && (
-                                    <p className="mt-1 text-sm text-red-400">{errors.hodometroAtual}</p>
-                                )}
+                                <p className="mt-1 text-xs text-slate-400">Atualizado pelas viagens e abastecimentos</p>
                             </div>
                         </div>
 
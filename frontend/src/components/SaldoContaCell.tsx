@@ -1,16 +1,13 @@
-import { useSaldoConta } from "../hooks/usePlanoContasDetalhes";
+import { useSaldosContas } from "../hooks/usePlanoContasDetalhes";
 
 interface SaldoContaCellProps {
     contaId: number;
-    aceitaLancamento: boolean;
 }
 
-export default function SaldoContaCell({ contaId, aceitaLancamento }: SaldoContaCellProps) {
-    const { data: saldo, isLoading } = useSaldoConta(aceitaLancamento ? contaId : null);
-
-    if (!aceitaLancamento) {
-        return <span className="text-slate-600 text-sm">-</span>;
-    }
+export default function SaldoContaCell({ contaId }: SaldoContaCellProps) {
+    // Todas as células compartilham a mesma query de /plano-contas/saldos
+    const { data: saldos, isLoading } = useSaldosContas();
+    const saldo = saldos?.get(contaId);
 
     if (isLoading) {
         return (
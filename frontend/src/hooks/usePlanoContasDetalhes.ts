@@ -11,6 +11,12 @@ interface SaldoConta {
     saldo: number;
 }
 
+export interface SaldoContaHierarquico extends SaldoConta {
+    nivel: number;
+    aceita_lancamento: boolean;
+    conta_pai_id: number | null;
+}
+
 interface Movimentacao {
     id: number;
     data: string;
@@ -42,6 +48,18 @@ export function useSaldoConta(contaId: number | null) {
     });
 }
 
+// Saldos de todo o plano de contas em uma única chamada (sintéticas já somadas)
+export function useSaldosContas() {
+    return useQuery({
+        queryKey: ["saldo-conta", "todas"],
+        queryFn: async () => {
+            const { data } = await api.get<SaldoContaHierarquico[]>("/plano-contas/saldos");
+            return new Map(data.map((saldo) => [saldo.conta_id, saldo]));
+        },
+        staleTime: 2 * 60 * 1000, // 2 minutos
+    });
+}
+
 export function useMovimentacoesConta(contaId: number | null, limit: number = 10) {
     return useQuery({
         queryKey: ["movimentacoes-conta", contaId, limit],
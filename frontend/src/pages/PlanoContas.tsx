@@ -551,10 +551,7 @@ export default function PlanoContasPage() {
                                         )}
                                     </td>
                                     <td className="px-6 py-4 whitespace-nowrap text-right">
-                                        <SaldoContaCell
-                                            contaId={conta.id}
-                                            aceitaLancamento={conta.aceita_lancamento}
-                                        />
+                                        <SaldoContaCell contaId={conta.id} />
                                     </td>
                                     <td className="px-6 py-4 whitespace-nowrap text-center">
                                         <button